@@ -3,57 +3,143 @@
 
 import os
 import sys
+import time
+import multiprocessing
+
+# 进程启动时刻，供 --profile-startup 统计导入耗时
+_PROCESS_START = time.perf_counter()
+
+# 命令行模式：在导入任何 Qt 模块之前分流，保证 --cli 不加载 GUI 依赖
+if __name__ == "__main__" and "--cli" in sys.argv[1:]:
+    from utils.cli import main as cli_main
+    sys.exit(cli_main([arg for arg in sys.argv[1:] if arg != "--cli"]))
+
+# 分块扫描的工作进程（spawn）会以 __mp_main__ 的名义重新导入本文件，此时跳过 Qt 与 GUI 模块
+_WORKER_IMPORT = __name__ == "__mp_main__"
+
+if not _WORKER_IMPORT:
+    # -------------------------------------------------------------
+    # Dynamically select Qt binding:
+    #   • macOS   -> PySide6
+    #   • Windows -> PyQt6 (default)
+    # All other modules continue to import from `PyQt6.*` normally.
+    # -------------------------------------------------------------
+
+    if sys.platform.startswith("darwin"):
+        # On macOS prefer PySide6 but keep backward-compat aliases so that
+        # existing `from PyQt6...` imports do not have to be rewritten.
+        try:
+            import importlib, types
+            import PySide6 as _PySide6
+
+            # Expose top-level alias
+            sys.modules.setdefault("PyQt6", _PySide6)
+
+            # Map commonly used sub-modules
+            for _sub in (
+                "QtCore",
+                "QtGui",
+                "QtWidgets",
+                "QtNetwork",
+                "QtSvg",
+            ):
+                sys.modules.setdefault(f"PyQt6.{_sub}", importlib.import_module(f"PySide6.{_sub}"))
+
+            # Provide PyQt-specific helpers
+            from PySide6.QtCore import Signal as _Signal, Slot as _Slot
+            core_mod = sys.modules.get("PyQt6.QtCore")
+            if core_mod:
+                setattr(core_mod, "pyqtSignal", _Signal)
+                setattr(core_mod, "pyqtSlot", _Slot)
+
+        except ImportError as exc:
+            # Fallback: PySide6 not available, let the regular PyQt6 import fail below
+            print("[Warning] Unable to import PySide6 on macOS →", exc, file=sys.stderr)
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QIcon
+    from PyQt6.QtCore import QTimer
+    from gui.main_window import MainWindow
+    from utils.config import init_config
+    from utils.profiling import startup_timer
+    from utils.metrics import metrics
+    from utils.tracing import tracer
+
+_IMPORTS_DONE = time.perf_counter()
+
+
+def parse_args(argv):
+    """解析命令行参数，未识别的参数留给 Qt"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="LightAuth", add_help=True)
+    parser.add_argument(
+        "--cli",
+        action="store_true",
+        help="不启动图形界面，直接输出验证码（其余参数见 --cli --help）",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PSTATS_FILE",
+        help="打印启动各阶段耗时；指定文件时同时保存 cProfile 统计数据",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="从启动开始采集性能指标（Ctrl+Shift+D 查看）",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE_FILE",
+        default=None,
+        help="记录耗时区间，退出时写入 Chrome trace JSON（可在 chrome://tracing 或 Perfetto 中查看）",
+    )
+    return parser.parse_known_args(argv)
+
+
+def enable_startup_profiling(pstats_path):
+    """启用启动计时，首次绘制完成后输出报告"""
+    startup_timer.enable(origin=_PROCESS_START)
+    startup_timer.record("imports", _PROCESS_START, _IMPORTS_DONE)
+
+    profiler = None
+    if pstats_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def report():
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(pstats_path)
+        print(startup_timer.report(), file=sys.stderr)
+        if profiler is not None:
+            print(f"cProfile 统计已保存到 {pstats_path}", file=sys.stderr)
+
+    # 在首次绘制之后的下一轮事件循环中输出，避免报告本身计入绘制
+    startup_timer.set_finish_callback(lambda: QTimer.singleShot(0, report))
 
-# -------------------------------------------------------------
-# Dynamically select Qt binding:
-#   • macOS   -> PySide6
-#   • Windows -> PyQt6 (default)
-# All other modules continue to import from `PyQt6.*` normally.
-# -------------------------------------------------------------
-
-if sys.platform.startswith("darwin"):
-    # On macOS prefer PySide6 but keep backward-compat aliases so that
-    # existing `from PyQt6...` imports do not have to be rewritten.
-    try:
-        import importlib, types
-        import PySide6 as _PySide6
-
-        # Expose top-level alias
-        sys.modules.setdefault("PyQt6", _PySide6)
-
-        # Map commonly used sub-modules
-        for _sub in (
-            "QtCore",
-            "QtGui",
-            "QtWidgets",
-            "QtNetwork",
-            "QtSvg",
-        ):
-            sys.modules.setdefault(f"PyQt6.{_sub}", importlib.import_module(f"PySide6.{_sub}"))
-
-        # Provide PyQt-specific helpers
-        from PySide6.QtCore import Signal as _Signal, Slot as _Slot
-        core_mod = sys.modules.get("PyQt6.QtCore")
-        if core_mod:
-            setattr(core_mod, "pyqtSignal", _Signal)
-            setattr(core_mod, "pyqtSlot", _Slot)
-
-    except ImportError as exc:
-        # Fallback: PySide6 not available, let the regular PyQt6 import fail below
-        print("[Warning] Unable to import PySide6 on macOS →", exc, file=sys.stderr)
-
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-from gui.main_window import MainWindow
-from utils.config import init_config
 
 def main():
+    args, qt_argv = parse_args(sys.argv[1:])
+    if args.profile_startup is not None:
+        enable_startup_profiling(args.profile_startup)
+    if args.metrics:
+        metrics.enabled = True
+    if args.trace:
+        tracer.enabled = True
+
     # 初始化配置
-    init_config()
+    with startup_timer.phase("init_config"):
+        init_config()
     
     # 创建应用
-    app = QApplication(sys.argv)
-    app.setApplicationName("LightAuth")
+    with startup_timer.phase("qapplication"):
+        app = QApplication([sys.argv[0]] + qt_argv)
+        app.setApplicationName("LightAuth")
     
     # 设置应用图标
     icon_path = os.path.join(os.path.dirname(__file__), "resources", "icon.png")
@@ -61,11 +147,19 @@ def main():
         app.setWindowIcon(QIcon(icon_path))
     
     # 创建主窗口（会处理加密验证）
-    window = MainWindow()
-    window.show()
+    with startup_timer.phase("main_window"):
+        window = MainWindow()
+    with startup_timer.phase("show"):
+        window.show()
     
     # 执行应用
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if args.trace:
+        tracer.dump(args.trace)
+        print(f"追踪数据已保存到 {args.trace}", file=sys.stderr)
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # 打包后的程序中，分块扫描的工作进程（spawn）需要由此进入
+    multiprocessing.freeze_support()
+    main() 
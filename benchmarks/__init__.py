@@ -0,0 +1,3 @@
+"""
+基准测试与压力测试脚本，均可独立运行，无需显示器
+"""
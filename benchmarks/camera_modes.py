@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+相机采集模式基准
+
+依次以各预设模式（分辨率 / MJPEG 或 YUYV / 帧率）打开相机，测量实际帧率、灰度转换与识别耗时，
+给出识别延迟最低的模式。需要连接相机；相机扫描对话框中的“测试最佳模式”使用同一实现。
+
+用法: python -m benchmarks.camera_modes [--camera 0] [--frames 30] [--color] [--format json|table] [--output result.json]
+"""
+
+import sys
+import json
+import argparse
+
+from benchmarks.harness import environment
+from gui import camera_devices
+from gui.camera_modes import CAPTURE_PRESETS, benchmark_modes
+
+
+def format_results(best, results):
+    lines = [f"{'模式':<24} {'实际':<18} {'帧率':>6} {'转换ms':>8} {'识别ms':>8} {'延迟ms':>8}"]
+    for r in results:
+        label = CAPTURE_PRESETS[r["preset"]][0]
+        if "error" in r:
+            lines.append(f"{label:<24} 跳过: {r['error']}")
+            continue
+        actual = f"{r['width']}x{r['height']} {r['fourcc']}{' raw' if r['raw'] else ''}"
+        lines.append(
+            f"{label:<24} {actual:<18} {r['fps']:>6.1f} {r['convert_ms']:>8.2f} {r['decode_ms']:>8.2f} {r['latency_ms']:>8.1f}"
+        )
+    lines.append(f"最佳模式: {CAPTURE_PRESETS[best][0] if best else '无'}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="相机采集模式基准")
+    parser.add_argument("--camera", type=int, default=None, help="相机索引，默认为检测到的第一个相机")
+    parser.add_argument("--frames", type=int, default=30, help="每种模式测量的帧数")
+    parser.add_argument("--color", action="store_true", help="不使用灰度识别路径")
+    parser.add_argument("--format", choices=("json", "table"), default="table")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    devices = camera_devices.list_cameras()
+    if args.camera is None:
+        if not devices:
+            print("未检测到相机", file=sys.stderr)
+            return 2
+        args.camera = devices[0].index
+
+    best, results = benchmark_modes(
+        args.camera, camera_devices.capture_api(), frames=args.frames, grayscale=not args.color
+    )
+    if args.format == "json":
+        report = {"suite": "camera_modes", "environment": environment(), "camera": args.camera,
+                  "best": best, "modes": results}
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+    else:
+        text = format_results(best, results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if best else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
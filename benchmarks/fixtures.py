@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+确定性的基准测试数据生成
+
+相同的参数与种子总是生成完全相同的账户数据和二维码图片，保证不同机器、不同提交之间的结果可比。
+
+用法: python -m benchmarks.fixtures --out DIR   # 将二维码图片写入目录以便查看
+"""
+
+import os
+import sys
+import random
+import base64
+import argparse
+from urllib.parse import quote
+
+DEFAULT_SEED = 20240101
+ISSUERS = ("GitHub", "Google", "Microsoft", "Amazon Web Services", "Dropbox", "Cloudflare", "Steam", "")
+FRAME_SIZES = {"720p": (1280, 720), "1080p": (1920, 1080), "4k": (3840, 2160)}
+
+
+def make_secret(rng):
+    """生成 base32 密钥（160 位，与常见服务一致）"""
+    return base64.b32encode(rng.getrandbits(160).to_bytes(20, "big")).decode("ascii")
+
+
+def make_accounts(count, seed=DEFAULT_SEED):
+    """生成 count 个账户字典，格式与 OTPModel.to_list() 相同"""
+    rng = random.Random(seed)
+    accounts = []
+    for i in range(count):
+        issuer = ISSUERS[i % len(ISSUERS)]
+        # 约十分之一的发行方名称较长，覆盖换行与行高计算
+        if i % 10 == 7:
+            issuer = f"{issuer} Enterprise Single Sign-On Portal {i}".strip()
+        accounts.append({
+            "name": f"user{i:06d}@example.com",
+            "secret": make_secret(rng),
+            "issuer": issuer,
+            "icon": "",
+        })
+    return accounts
+
+
+def make_uri(account):
+    """生成账户对应的 otpauth URI"""
+    label = f"{account['issuer']}:{account['name']}" if account["issuer"] else account["name"]
+    uri = f"otpauth://totp/{quote(label)}?secret={account['secret']}"
+    if account["issuer"]:
+        uri += f"&issuer={quote(account['issuer'])}"
+    return uri
+
+
+def make_qr_image(data, box_size=10, border=4):
+    """生成二维码 PIL 灰度图像"""
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.make_image(fill_color="black", back_color="white").get_image().convert("L")
+
+
+def make_frame(size="1080p", with_qr=True, seed=DEFAULT_SEED, mode="RGB"):
+    """生成模拟屏幕/相机画面：带噪点的背景，可选在固定位置放置一个二维码"""
+    from PIL import Image
+
+    width, height = FRAME_SIZES.get(size, size)
+    rng = random.Random(seed)
+    noise = bytes(rng.getrandbits(8) // 4 + 160 for _ in range(width * height // 64))
+    # 低分辨率噪点放大，避免逐像素生成过慢
+    frame = Image.frombytes("L", (width // 8, height // 8), noise).resize((width, height))
+    if with_qr:
+        uri = make_uri(make_accounts(1, seed)[0])
+        qr = make_qr_image(uri, box_size=max(2, height // 200))
+        frame.paste(qr, (width // 3, height // 4))
+    return frame.convert(mode)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="生成基准测试用二维码图片")
+    parser.add_argument("--out", required=True, help="输出目录")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    account = make_accounts(1, args.seed)[0]
+    make_qr_image(make_uri(account)).save(os.path.join(args.out, "qr_clean.png"))
+    for size in FRAME_SIZES:
+        make_frame(size, True, args.seed).save(os.path.join(args.out, f"frame_{size}_qr.png"))
+        make_frame(size, False, args.seed).save(os.path.join(args.out, f"frame_{size}_empty.png"))
+    print(f"已写入 {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+主窗口规模基准
+
+在 offscreen 平台上用合成账户库（默认 100 ~ 20000 个账户）启动 MainWindow，测量：
+    gui.construct          MainWindow 构造耗时（含加载账户库；列表条目在之后分批创建）
+    gui.first_paint        从开始构造到账户列表首次绘制完成
+    gui.list_ready         从开始构造到事件循环中分批创建完全部列表条目
+    gui.update_accounts_list  重建账户列表全部条目的耗时（同步完成全部批次）
+    gui.tick               每秒一次的 update_otp_codes 耗时
+    gui.scroll_frame       滚动一步并同步重绘列表的单帧耗时
+    gui.rss                窗口就绪后的常驻内存
+
+每个账户规模在独立子进程中运行，数据目录为临时目录，不会读写用户数据。
+
+用法: python -m benchmarks.gui_scale [--sizes 100,1000,5000,20000] [--format json|table] [--output report.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from benchmarks.fixtures import make_accounts
+from benchmarks.harness import environment, summarize, write_report
+
+DEFAULT_SIZES = (100, 1000, 5000, 20000)
+
+
+def current_rss_mb():
+    """当前进程常驻内存（MB），仅支持 Linux /proc，其他平台退回峰值"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 单位为字节，Linux 为 KB
+        return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def timed_samples(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run_child(count, rebuilds, ticks, scroll_frames):
+    """在当前进程中测量指定账户数量，返回结果列表"""
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    data_dir = tempfile.mkdtemp(prefix="lightauth-bench-")
+    # 必须在导入 utils.config 之前设置
+    os.environ["LIGHTAUTH_DATA_DIR"] = data_dir
+
+    from PyQt6.QtCore import QObject, QEvent
+    from PyQt6.QtWidgets import QApplication
+    from utils.config import init_config, save_accounts
+
+    init_config()
+    save_accounts(make_accounts(count))
+
+    app = QApplication(sys.argv[:1])
+    from gui.main_window import MainWindow
+
+    class PaintProbe(QObject):
+        painted = False
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                self.painted = True
+            return False
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    window = MainWindow()
+    constructed = time.perf_counter()
+    # 关闭每秒刷新，避免干扰测量
+    window.timer.stop()
+
+    probe = PaintProbe()
+    window.accounts_list.viewport().installEventFilter(probe)
+    window.resize(420, 720)
+    window.show()
+    while not probe.painted:
+        app.processEvents()
+    first_paint = time.perf_counter()
+    while window.list_builder.is_pending():
+        app.processEvents()
+    list_ready = time.perf_counter()
+    rss_ready = current_rss_mb()
+
+    def rebuild():
+        window.update_accounts_list(rebuild=True)
+        window.finish_accounts_list()
+
+    rebuild_samples = timed_samples(rebuild, rebuilds)
+    app.processEvents()
+    tick_samples = timed_samples(window.update_otp_codes, ticks)
+
+    viewport = window.accounts_list.viewport()
+    scrollbar = window.accounts_list.verticalScrollBar()
+    step = max(1, scrollbar.pageStep() // 4)
+
+    def scroll_step():
+        value = scrollbar.value() + step
+        scrollbar.setValue(value if value <= scrollbar.maximum() else 0)
+        viewport.repaint()
+
+    scroll_samples = timed_samples(scroll_step, scroll_frames)
+
+    results = [
+        dict(name=f"gui.construct[{count}]", **summarize([(constructed - start) * 1000])),
+        dict(name=f"gui.first_paint[{count}]", **summarize([(first_paint - start) * 1000])),
+        dict(name=f"gui.list_ready[{count}]", **summarize([(list_ready - start) * 1000])),
+        dict(name=f"gui.update_accounts_list[{count}]", **summarize(rebuild_samples)),
+        dict(name=f"gui.tick[{count}]", **summarize(tick_samples)),
+        dict(name=f"gui.scroll_frame[{count}]", **summarize(scroll_samples)),
+        dict(name=f"gui.rss[{count}]", **summarize([rss_ready], unit="MB")),
+        dict(name=f"gui.rss_delta[{count}]", **summarize([rss_ready - rss_before], unit="MB")),
+    ]
+    window.hide()
+    shutil.rmtree(data_dir, ignore_errors=True)
+    return {"results": results}
+
+
+def run_size(count, args):
+    """在子进程中运行一个账户规模，子进程以 JSON 输出结果"""
+    cmd = [
+        sys.executable, "-m", "benchmarks.gui_scale", "--child", str(count),
+        "--rebuilds", str(args.rebuilds), "--ticks", str(args.ticks),
+        "--scroll-frames", str(args.scroll_frames),
+    ]
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(cmd, cwd=repo_dir, capture_output=True, text=True)
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["子进程失败"])[-1]
+        return {"results": [{"name": f"gui[{count}]", "error": error}]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LightAuth 主窗口规模基准（无需显示器）")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="账户数量列表，逗号分隔")
+    parser.add_argument("--rebuilds", type=int, default=3, help="列表重建次数")
+    parser.add_argument("--ticks", type=int, default=20, help="刷新次数")
+    parser.add_argument("--scroll-frames", type=int, default=60, help="滚动帧数")
+    parser.add_argument("--format", choices=("json", "table"), default="json")
+    parser.add_argument("--output", default=None, help="输出文件，默认写到标准输出")
+    parser.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        print(json.dumps(run_child(args.child, args.rebuilds, args.ticks, args.scroll_frames)))
+        return 0
+
+    env = environment()
+    results = []
+    for count in (int(size) for size in args.sizes.split(",") if size):
+        print(f"运行 {count} 个账户 ...", file=sys.stderr)
+        results.extend(run_size(count, args)["results"])
+
+    write_report({"suite": "gui_scale", "environment": env, "results": results}, args.output, args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基准测试计时与结果输出
+
+计时方式与 timeit 相同：先估算单次耗时，确定每轮调用次数使一轮不少于 target_round 秒，
+再重复多轮，按单次调用耗时（毫秒）统计最小值、中位数、平均值、标准差与最大值。
+"""
+
+import os
+import gc
+import json
+import time
+import hashlib
+import importlib
+import platform
+import statistics
+import subprocess
+
+from utils.metrics import environment_info
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_commit():
+    """当前提交与工作区是否有改动，不在 git 仓库中时返回 (None, False)"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR,
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.SubprocessError):
+        return None, False
+
+
+def library_versions():
+    """已安装的相关库版本"""
+    from importlib import metadata
+
+    versions = {}
+    for name in ("PyQt6", "PySide6", "cryptography", "pyotp", "qrcode", "pillow", "pyzbar", "numpy", "opencv-python"):
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            pass
+    return versions
+
+
+def qt_version():
+    """运行时 Qt 库版本（qVersion，而非绑定包的版本），没有可用的 Qt 绑定时返回 None"""
+    for binding in ("PyQt6", "PySide6"):
+        try:
+            qt_core = importlib.import_module(f"{binding}.QtCore")
+        except ImportError:
+            continue
+        return qt_core.qVersion()
+    return None
+
+
+def cpu_model():
+    """CPU 型号（Linux 读取 /proc/cpuinfo，其他平台使用 platform.processor）"""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def machine_fingerprint():
+    """机器指纹：由操作系统、架构、CPU 型号与核数计算，同一台机器上保持不变"""
+    parts = (platform.system(), platform.machine(), cpu_model(), str(os.cpu_count()))
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def environment():
+    """基准测试运行环境"""
+    env = environment_info()
+    env["cpu_count"] = os.cpu_count()
+    env["cpu_model"] = cpu_model()
+    env["fingerprint"] = machine_fingerprint()
+    env["commit"], env["dirty"] = git_commit()
+    env["libraries"] = library_versions()
+    env["qt"] = qt_version()
+    return env
+
+
+def summarize(samples, unit="ms"):
+    """统计一组样本"""
+    return {
+        "unit": unit,
+        "rounds": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "max": max(samples),
+        "samples": samples,
+    }
+
+
+def measure(fn, repeat=5, target_round=0.05, max_number=100000):
+    """测量 fn() 的单次调用耗时
+
+    Returns:
+        统计结果字典，时间单位为毫秒
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        fn()
+        first = time.perf_counter() - start
+        number = max(1, min(max_number, int(target_round / first) if first > 0 else max_number))
+
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number * 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    result = summarize(samples)
+    result["number"] = number
+    return result
+
+
+def format_table(results):
+    """将结果格式化为便于阅读的表格"""
+    lines = [f"{'名称':<40} {'中位数':>12} {'最小':>12} {'标准差':>10} {'单位':>6} {'轮次x次数':>12}"]
+    for result in results:
+        if "error" in result:
+            lines.append(f"{result['name']:<40} 跳过: {result['error']}")
+            continue
+        lines.append(
+            f"{result['name']:<40} {result['median']:>12.4f} {result['min']:>12.4f} "
+            f"{result['stdev']:>10.4f} {result['unit']:>6} {result['rounds']:>5}x{result.get('number', 1):<6}"
+        )
+    return "\n".join(lines)
+
+
+def write_report(report, output=None, fmt="json"):
+    """输出报告：json 为机器可读格式，table 为表格；output 为空时写到标准输出"""
+    text = json.dumps(report, ensure_ascii=False, indent=2) if fmt == "json" else format_table(report["results"])
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基准测试结果历史与回归比较
+
+将 benchmarks.micro / benchmarks.gui_scale 输出的 JSON 报告保存到本地 SQLite 数据库
+（提交、机器指纹、Python/运行时 Qt 版本与各项结果），并比较同一套件的两次运行。
+
+比较时只有同时满足以下条件才判定为变化，避免把噪声当作回归：
+    1. 中位数相对变化超过 --min-change（默认 5%）
+    2. 均值差超过两次运行合并标准误差的 --sigma 倍（默认 3 倍）
+样本数少于 MIN_ROUNDS 的结果（如构造耗时、首次绘制只有一个样本）没有方差信息，
+改为要求相对变化超过 --single-change（默认 25%）。
+默认只对关键指标（密钥派生、账户库加载、刷新耗时、二维码识别）的回归返回非零状态码，便于 git bisect run；
+两次运行没有可比较的结果时同样返回非零状态码。
+
+用法:
+    python -m benchmarks.history record micro.json [gui.json ...] [--label 说明]
+    python -m benchmarks.history list
+    python -m benchmarks.history compare [旧运行] [新运行]   # 默认比较最新套件的最近两次，可用运行 ID 或提交前缀
+"""
+
+import os
+import sys
+import json
+import math
+import sqlite3
+import argparse
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(REPO_DIR, ".benchmarks", "history.sqlite")
+
+# 关键指标名称前缀：密钥派生、账户库加载（解密+解析+建模）、刷新耗时、二维码识别
+KEY_METRICS = (
+    "crypto.get_encryption_key",
+    "crypto.decrypt_data",
+    "model.from_list",
+    "gui.construct",
+    "gui.tick",
+    "qr.decode_qr_from_image",
+)
+
+# 少于该样本数时不做显著性检验，改用 --single-change 阈值
+MIN_ROUNDS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    suite TEXT NOT NULL,
+    label TEXT,
+    commit_hash TEXT,
+    dirty INTEGER,
+    fingerprint TEXT,
+    python TEXT,
+    qt TEXT,
+    environment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    unit TEXT,
+    median REAL,
+    mean REAL,
+    stdev REAL,
+    rounds INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+
+def connect(path=DEFAULT_DB):
+    """打开（必要时创建）历史数据库"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record(conn, report, label=None):
+    """保存一份报告，返回运行 ID；跳过的项目不保存"""
+    env = report.get("environment", {})
+    # 只记录运行时 Qt 版本（harness.environment 写入），不用绑定包版本代替，避免不同套件的记录口径不一
+    qt = env.get("qt")
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (created, suite, label, commit_hash, dirty, fingerprint, python, qt, environment)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                datetime.now().timestamp(), report.get("suite", ""), label, env.get("commit"),
+                int(bool(env.get("dirty"))), env.get("fingerprint"), env.get("python"), qt,
+                json.dumps(env, ensure_ascii=False),
+            ),
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT OR REPLACE INTO results (run_id, name, unit, median, mean, stdev, rounds, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, r["name"], r.get("unit"), r["median"], r["mean"], r["stdev"], r["rounds"],
+                 json.dumps(r, ensure_ascii=False))
+                for r in report.get("results", []) if "error" not in r
+            ],
+        )
+    return run_id
+
+
+def resolve_run(conn, ref, suite=None):
+    """将运行 ID 或提交前缀解析为运行记录（同一提交取最近一次）"""
+    if ref.isdigit():
+        row = conn.execute("SELECT * FROM runs WHERE id = ?", (int(ref),)).fetchone()
+        if row is not None:
+            return row
+    query = "SELECT * FROM runs WHERE commit_hash LIKE ?"
+    params = [ref + "%"]
+    if suite:
+        query += " AND suite = ?"
+        params.append(suite)
+    return conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+
+
+def latest_runs(conn, count=2, suite=None):
+    """最近的若干次运行，按时间从旧到新"""
+    if suite:
+        rows = conn.execute("SELECT * FROM runs WHERE suite = ? ORDER BY id DESC LIMIT ?", (suite, count))
+    else:
+        rows = conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (count,))
+    return list(reversed(rows.fetchall()))
+
+
+def load_results(conn, run_id):
+    rows = conn.execute("SELECT * FROM results WHERE run_id = ?", (run_id,))
+    return {row["name"]: row for row in rows}
+
+
+def is_key_metric(name):
+    return name.startswith(KEY_METRICS)
+
+
+def compare_result(old, new, min_change=0.05, sigma=3.0, single_change=0.25):
+    """比较两次结果，返回 (相对变化, 状态)，状态为 "regression" / "improvement" / "same" """
+    if not old["median"]:
+        return 0.0, "same"
+    change = (new["median"] - old["median"]) / old["median"]
+    if min(old["rounds"] or 0, new["rounds"] or 0) < MIN_ROUNDS:
+        # 样本太少（如首次绘制只有一个样本）无法估计噪声，只看相对变化并放宽阈值
+        significant = abs(change) >= single_change
+    else:
+        # 两次运行均值之差的合并标准误差
+        stderr = math.sqrt((old["stdev"] ** 2) / old["rounds"] + (new["stdev"] ** 2) / new["rounds"])
+        significant = abs(new["mean"] - old["mean"]) > sigma * stderr
+    if abs(change) < min_change or not significant:
+        return change, "same"
+    return change, "regression" if change > 0 else "improvement"
+
+
+def compare(conn, old_run, new_run, min_change=0.05, sigma=3.0, single_change=0.25):
+    """比较两次运行，返回每项结果的比较行"""
+    old_results = load_results(conn, old_run["id"])
+    new_results = load_results(conn, new_run["id"])
+    rows = []
+    for name in sorted(set(old_results) & set(new_results)):
+        old, new = old_results[name], new_results[name]
+        change, status = compare_result(old, new, min_change, sigma, single_change)
+        rows.append({
+            "name": name, "unit": new["unit"], "old": old["median"], "new": new["median"],
+            "change": change, "status": status, "key": is_key_metric(name),
+        })
+    return rows
+
+
+def describe_run(run):
+    commit = (run["commit_hash"] or "-")[:10] + ("+" if run["dirty"] else "")
+    created = datetime.fromtimestamp(run["created"]).strftime("%Y-%m-%d %H:%M")
+    label = f" {run['label']}" if run["label"] else ""
+    return f"#{run['id']:<4} {created}  {run['suite']:<10} {commit:<12} py{run['python'] or '-'} qt{run['qt'] or '-'}{label}"
+
+
+def cmd_record(conn, args):
+    for path in args.reports:
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        run_id = record(conn, report, args.label)
+        print(f"已保存运行 #{run_id}（{path}）")
+    return 0
+
+
+def cmd_list(conn, args):
+    for run in latest_runs(conn, args.limit, args.suite):
+        print(describe_run(run))
+    return 0
+
+
+def cmd_compare(conn, args):
+    if args.old and args.new:
+        old_run, new_run = resolve_run(conn, args.old, args.suite), resolve_run(conn, args.new, args.suite)
+    else:
+        # 未指定套件时取最近一次运行的套件，只比较同一套件的最近两次
+        suite = args.suite
+        if suite is None:
+            latest = latest_runs(conn, 1)
+            suite = latest[0]["suite"] if latest else None
+        runs = latest_runs(conn, 2, suite) if suite is not None else []
+        if len(runs) < 2:
+            print(f"套件 {suite or '-'} 的历史记录不足两次运行", file=sys.stderr)
+            return 2
+        old_run, new_run = runs
+    if old_run is None or new_run is None:
+        print("找不到指定的运行", file=sys.stderr)
+        return 2
+    if old_run["suite"] != new_run["suite"]:
+        print(f"两次运行属于不同套件（{old_run['suite']} / {new_run['suite']}），无法比较", file=sys.stderr)
+        return 2
+
+    print("旧: " + describe_run(old_run))
+    print("新: " + describe_run(new_run))
+    if old_run["fingerprint"] != new_run["fingerprint"]:
+        print("警告: 两次运行来自不同机器，结果不可直接比较", file=sys.stderr)
+
+    rows = compare(conn, old_run, new_run, args.min_change, args.sigma, args.single_change)
+    if not rows:
+        print("两次运行没有同名的结果，无法比较", file=sys.stderr)
+        return 2
+    marks = {"regression": "回归", "improvement": "提升", "same": ""}
+    for row in rows:
+        key = "*" if row["key"] else " "
+        print(
+            f"{key} {row['name']:<40} {row['old']:>12.4f} -> {row['new']:>12.4f} {row['unit'] or '':<3}"
+            f" {row['change'] * 100:>+7.1f}%  {marks[row['status']]}"
+        )
+
+    regressions = [row for row in rows if row["status"] == "regression" and (row["key"] or args.all)]
+    if regressions:
+        print(f"发现 {len(regressions)} 项回归: " + ", ".join(row["name"] for row in regressions), file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="基准测试结果历史与回归比较")
+    parser.add_argument("--db", default=DEFAULT_DB, help="历史数据库路径")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("record", help="保存基准测试报告")
+    p.add_argument("reports", nargs="+", help="micro / gui_scale 输出的 JSON 报告")
+    p.add_argument("--label", default=None, help="运行说明")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("list", help="列出历史运行")
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--suite", default=None)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("compare", help="比较两次运行（* 为关键指标）")
+    p.add_argument("old", nargs="?", help="旧运行 ID 或提交前缀")
+    p.add_argument("new", nargs="?", help="新运行 ID 或提交前缀")
+    p.add_argument("--suite", default=None, help="只在指定套件的运行中查找")
+    p.add_argument("--min-change", type=float, default=0.05, help="最小相对变化（默认 0.05 即 5%%）")
+    p.add_argument("--sigma", type=float, default=3.0, help="显著性所需的标准误差倍数")
+    p.add_argument("--single-change", type=float, default=0.25,
+                   help=f"样本数少于 {MIN_ROUNDS} 的结果所需的最小相对变化（默认 0.25 即 25%%）")
+    p.add_argument("--all", action="store_true", help="所有指标的回归都返回非零状态码")
+    p.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    conn = connect(args.db)
+    try:
+        return args.func(conn, args)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+微基准测试
+
+覆盖密钥派生、加解密、模型序列化、OTP 计算、URI 解析、二维码生成与识别。
+全部数据由 benchmarks.fixtures 确定性生成，无需网络与显示器（Qt 使用 offscreen 平台）。
+缺少可选依赖（如 zbar 系统库）的项目会在结果中标记为跳过。
+
+用法: python -m benchmarks.micro [--filter crypto] [--sizes 10,1000,50000] [--repeat 5]
+                                  [--format json|table] [--output results.json]
+"""
+
+import os
+import sys
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.fixtures import make_accounts, make_uri, make_qr_image, make_frame
+from benchmarks.harness import environment, measure, write_report
+
+DEFAULT_SIZES = (10, 1000, 50000)
+PASSWORD = "benchmark-password"
+
+# 已注册的基准：(名称, 准备函数)，准备函数返回被测的无参可调用对象
+BENCHMARKS = []
+
+
+_app = None
+
+
+def _ensure_app(app_class):
+    global _app
+    if _app is None:
+        _app = app_class.instance() or app_class(sys.argv[:1])
+
+
+def benchmark(name):
+    """注册基准测试的装饰器"""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def register_sized(sizes):
+    """注册与账户数量相关的基准"""
+    for count in sizes:
+        def encrypt_setup(count=count):
+            from utils.config import encrypt_data
+            data = make_accounts(count)
+            return lambda: encrypt_data(data, PASSWORD)
+
+        def decrypt_setup(count=count):
+            from utils.config import encrypt_data, decrypt_data
+            encrypted = encrypt_data(make_accounts(count), PASSWORD)
+            return lambda: decrypt_data(encrypted, PASSWORD)
+
+        def from_list_setup(count=count):
+            from models.otp_model import OTPModel
+            data = make_accounts(count)
+            return lambda: OTPModel.from_list(data)
+
+        def to_list_setup(count=count):
+            from models.otp_model import OTPModel
+            model = OTPModel.from_list(make_accounts(count))
+            return model.to_list
+
+        benchmark(f"crypto.encrypt_data[{count}]")(encrypt_setup)
+        benchmark(f"crypto.decrypt_data[{count}]")(decrypt_setup)
+        benchmark(f"model.from_list[{count}]")(from_list_setup)
+        benchmark(f"model.to_list[{count}]")(to_list_setup)
+
+
+@benchmark("crypto.get_encryption_key")
+def kdf_setup():
+    from utils.config import get_encryption_key
+    return lambda: get_encryption_key(PASSWORD)
+
+
+@benchmark("otp.get_otp")
+def get_otp_setup():
+    from models.otp_model import OTPAccount
+    account = OTPAccount.from_dict(make_accounts(1)[0])
+    return account.get_otp
+
+
+@benchmark("qr.parse_otp_uri")
+def parse_uri_setup():
+    from utils.qr_utils import parse_otp_uri
+    uri = make_uri(make_accounts(1)[0])
+    return lambda: parse_otp_uri(uri)
+
+
+@benchmark("qr.get_qrcode")
+def get_qrcode_setup():
+    from PyQt6.QtGui import QGuiApplication
+    from models.otp_model import OTPAccount
+    # QPixmap 需要 QGuiApplication
+    _ensure_app(QGuiApplication)
+    account = OTPAccount.from_dict(make_accounts(1)[0])
+    return account.get_qrcode
+
+
+def register_decode():
+    """注册二维码识别基准：纯二维码、含二维码的画面与不含二维码的画面（未命中路径）"""
+    cases = {
+        "qr_clean": lambda: make_qr_image(make_uri(make_accounts(1)[0])).convert("RGB"),
+        "frame_1080p_qr": lambda: make_frame("1080p", True),
+        "frame_1080p_empty": lambda: make_frame("1080p", False),
+    }
+    for case, make_image in cases.items():
+        def setup(make_image=make_image):
+            from utils.qr_utils import decode_qr_from_image
+            image = make_image()
+            return lambda: decode_qr_from_image(image)
+        benchmark(f"qr.decode_qr_from_image[{case}]")(setup)
+
+
+def run(name_filter=None, repeat=5, target_round=0.05):
+    """运行匹配过滤条件的基准，返回结果列表"""
+    results = []
+    for name, setup in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        print(f"运行 {name} ...", file=sys.stderr)
+        try:
+            fn = setup()
+        except ImportError as e:
+            results.append({"name": name, "error": f"{type(e).__name__}: {e}"})
+            continue
+        result = {"name": name}
+        result.update(measure(fn, repeat=repeat, target_round=target_round))
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LightAuth 微基准测试")
+    parser.add_argument("--filter", default=None, help="只运行名称包含该字符串的基准")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="账户数量列表，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=5, help="重复轮数")
+    parser.add_argument("--target-round", type=float, default=0.05, help="每轮最短时间（秒）")
+    parser.add_argument("--format", choices=("json", "table"), default="json")
+    parser.add_argument("--output", default=None, help="输出文件，默认写到标准输出")
+    parser.add_argument("--list", action="store_true", help="列出所有基准后退出")
+    args = parser.parse_args(argv)
+
+    register_sized(int(size) for size in args.sizes.split(",") if size)
+    register_decode()
+
+    if args.list:
+        for name, _ in BENCHMARKS:
+            print(name)
+        return 0
+
+    report = {
+        "suite": "micro",
+        "environment": environment(),
+        "results": run(args.filter, args.repeat, args.target_round),
+    }
+    write_report(report, args.output, args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+二维码识别输入转换开销对比
+
+比较相机帧（cv2 BGR ndarray）与屏幕截图（QImage）在送入 zbar 之前的转换开销：
+    旧路径  相机: BGR->RGB -> PIL 图像 -> 转灰度 -> 字节
+           屏幕: QImage 转 RGBA8888 -> ndarray 视图 -> PIL RGBA 图像 -> 转灰度 -> 字节
+    新路径  相机: BGR->灰度（一次） -> 字节
+           屏幕: 直接引用 QImage 的 BGRA 缓冲区 -> 灰度（一次） -> 字节
+
+只测量到 zbar 的输入为止（zbar 本身两条路径相同），因此无需安装 zbar。
+“中间缓冲区”为每帧新分配的图像缓冲区总字节数（PIL 的 RGB/RGBA 图像内部按每像素 4 字节存储）。
+
+用法: python -m benchmarks.qr_input [--sizes 1080p,4k] [--format json|table] [--output result.json]
+"""
+
+import os
+import sys
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.fixtures import make_frame
+from benchmarks.harness import environment, measure, write_report
+from utils.qr_utils import to_luminance
+
+
+def _nbytes(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes if obj.base is None else 0  # 视图不占新内存
+    if isinstance(obj, bytes):
+        return len(obj)
+    if isinstance(obj, Image.Image):
+        return obj.width * obj.height * (4 if obj.mode in ("RGB", "RGBA") else len(obj.getbands()))
+    if hasattr(obj, "sizeInBytes"):
+        return obj.sizeInBytes()
+    return 0
+
+
+def camera_old(frame):
+    import cv2
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    pil = Image.fromarray(rgb)
+    gray = pil.convert("L")
+    return [rgb, pil, gray, gray.tobytes()]
+
+
+def camera_new(frame):
+    gray = to_luminance(frame, "bgr")
+    return [gray, np.ascontiguousarray(gray).tobytes()]
+
+
+def screen_old(qimage):
+    from PyQt6.QtGui import QImage
+    rgba = qimage.convertToFormat(QImage.Format.Format_RGBA8888)
+    ptr = rgba.bits()
+    ptr.setsize(rgba.sizeInBytes())
+    arr = np.frombuffer(ptr, dtype=np.uint8).reshape((rgba.height(), rgba.width(), 4))
+    pil = Image.fromarray(arr, "RGBA")
+    gray = pil.convert("L")
+    return [rgba, pil, gray, gray.tobytes()]
+
+
+def screen_new(qimage):
+    from gui.qr_scanner_dialogs import qimage_to_raw
+    source, raw = qimage_to_raw(qimage)
+    gray = to_luminance(raw)
+    # 未发生格式转换时 source 就是输入本身，不计入
+    return [None if source is qimage else source, gray, np.ascontiguousarray(gray).tobytes()]
+
+
+def make_qimage(frame):
+    """把 BGR 帧转换为与屏幕截图相同格式（Format_RGB32）的 QImage"""
+    from PyQt6.QtGui import QImage
+    bgra = np.dstack([frame, np.full(frame.shape[:2], 255, np.uint8)])
+    h, w = frame.shape[:2]
+    return QImage(bgra.data, w, h, w * 4, QImage.Format.Format_RGB32).copy()
+
+
+def run_case(name, fn, source, repeat):
+    result = {"name": name}
+    try:
+        buffers = fn(source)
+    except ImportError as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    result.update(measure(lambda: fn(source), repeat=repeat))
+    result["intermediate_bytes"] = sum(_nbytes(obj) for obj in buffers)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="二维码识别输入转换开销对比")
+    parser.add_argument("--sizes", default="1080p,4k")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--format", choices=("json", "table"), default="table")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    app = None
+    results = []
+    for size in args.sizes.split(","):
+        frame = np.asarray(make_frame(size, True, mode="RGB"))[:, :, ::-1].copy()  # BGR，与 cv2 帧一致
+        results.append(run_case(f"qr_input.camera_old[{size}]", camera_old, frame, args.repeat))
+        results.append(run_case(f"qr_input.camera_new[{size}]", camera_new, frame, args.repeat))
+        try:
+            from PyQt6.QtGui import QGuiApplication
+            app = app or QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+            qimage = make_qimage(frame)
+        except ImportError as e:
+            results.append({"name": f"qr_input.screen[{size}]", "error": f"{type(e).__name__}: {e}"})
+            continue
+        results.append(run_case(f"qr_input.screen_old[{size}]", screen_old, qimage, args.repeat))
+        results.append(run_case(f"qr_input.screen_new[{size}]", screen_new, qimage, args.repeat))
+
+    write_report({"suite": "qr_input", "environment": environment(), "results": results}, args.output, args.format)
+    if args.format == "table":
+        for result in results:
+            if "intermediate_bytes" in result:
+                print(f"{result['name']:<40} 中间缓冲区 {result['intermediate_bytes'] / (1 << 20):8.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+大账户库规模与内存回归检查
+
+生成 10 万个账户的账户库，检查以下操作的耗时与峰值内存（tracemalloc）是否低于上限：
+    vault_roundtrip   save_accounts + load_accounts（加密）
+    model_build       OTPModel.from_list + to_list
+    export_import     导出同样大小的加密 .lauth 文件并按导入对话框的流程读取、解密、构建账户
+    dedupe            向已有账户库批量导入全部重复账户与一半新账户
+
+上限按机器等级配置（--machine-class，或环境变量 LIGHTAUTH_SCALE_CLASS），以 10 万个账户为基准，
+账户数量不同时按线性比例缩放（不低于固定下限），因此 O(n²) 行为在较大规模下都会超出上限。
+也可以用 --limits 指定 JSON 文件覆盖上限，格式与 MACHINE_CLASSES 中的条目相同。
+超出上限时以非零状态码退出。
+
+用法: python -m benchmarks.scale_check [--accounts 100000] [--machine-class ci] [--limits limits.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+from benchmarks.fixtures import make_accounts
+
+BASE_ACCOUNTS = 100000
+PASSWORD = "benchmark-password"
+# 缩放后上限的下限，避免小规模运行时被密钥派生等固定开销误判
+MIN_SECONDS = 0.5
+MIN_MB = 16
+
+# 每项检查在 10 万个账户下的上限：(秒, 峰值 MB)
+MACHINE_CLASSES = {
+    "desktop": {
+        "vault_roundtrip": (3.0, 200),
+        "model_build": (2.0, 150),
+        "export_import": (4.0, 250),
+        "dedupe": (2.0, 150),
+    },
+    "laptop": {
+        "vault_roundtrip": (6.0, 200),
+        "model_build": (4.0, 150),
+        "export_import": (8.0, 250),
+        "dedupe": (4.0, 150),
+    },
+    "ci": {
+        "vault_roundtrip": (15.0, 200),
+        "model_build": (10.0, 150),
+        "export_import": (20.0, 250),
+        "dedupe": (10.0, 150),
+    },
+}
+
+
+def check_vault_roundtrip(data):
+    from utils.config import save_accounts, load_accounts
+
+    save_accounts(data, PASSWORD)
+    loaded = load_accounts(PASSWORD)
+    assert loaded == data, "保存后读取的账户与原数据不一致"
+
+
+def check_model_build(data):
+    from models.otp_model import OTPModel
+
+    model = OTPModel.from_list(data)
+    assert model.count() == len(data)
+    assert model.to_list() == data, "模型序列化结果与原数据不一致"
+
+
+def check_export_import(data, path):
+    from models.otp_model import OTPAccount
+    from utils.config import decrypt_data
+    from gui.export_dialog import write_export_file
+    from gui.import_dialog import read_import_file
+
+    export_data = {"version": "1.0", "encrypted": True, "accounts": data}
+    write_export_file(path, export_data, PASSWORD)
+    kind, payload = read_import_file(path)
+    assert kind == "encrypted"
+    imported = decrypt_data(payload, PASSWORD)
+    accounts = [OTPAccount.from_dict(account_data) for account_data in imported["accounts"]]
+    assert len(accounts) == len(data)
+
+
+def check_dedupe(data, extra):
+    from models.otp_model import OTPModel, OTPAccount
+
+    model = OTPModel.from_list(data)
+    incoming = [OTPAccount.from_dict(account_data) for account_data in data + extra]
+    added = model.add_accounts(incoming, skip_duplicates=True)
+    assert added == len(extra), f"去重后应添加 {len(extra)} 个账户，实际添加 {added} 个"
+    assert model.count() == len(data) + len(extra)
+
+
+def run_check(fn, *args, memory=True):
+    """运行一次检查，返回 (秒, 峰值 MB)；峰值在单独一次运行中测量，避免 tracemalloc 影响计时"""
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn(*args)
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1 << 20)
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak_mb
+
+
+def load_limits(machine_class, limits_path=None):
+    limits = dict(MACHINE_CLASSES[machine_class])
+    if limits_path:
+        with open(limits_path, 'r', encoding='utf-8') as f:
+            limits.update({name: tuple(value) for name, value in json.load(f).items()})
+    return limits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="大账户库规模与内存回归检查")
+    parser.add_argument("--accounts", type=int, default=BASE_ACCOUNTS)
+    parser.add_argument(
+        "--machine-class", choices=sorted(MACHINE_CLASSES),
+        default=os.environ.get("LIGHTAUTH_SCALE_CLASS", "laptop"),
+    )
+    parser.add_argument("--limits", default=None, help="覆盖上限的 JSON 文件")
+    parser.add_argument("--no-memory", action="store_true", help="跳过 tracemalloc 峰值内存检查")
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix="lightauth-scale-")
+    # 必须在导入 utils.config 之前设置，避免读写用户数据
+    os.environ["LIGHTAUTH_DATA_DIR"] = data_dir
+    from utils.config import init_config
+    init_config()
+
+    limits = load_limits(args.machine_class, args.limits)
+    scale = args.accounts / BASE_ACCOUNTS
+    data = make_accounts(args.accounts)
+    extra = make_accounts(args.accounts // 2, seed=1)
+    for account in extra:
+        account["name"] = "new-" + account["name"]
+
+    checks = {
+        "vault_roundtrip": (check_vault_roundtrip, data),
+        "model_build": (check_model_build, data),
+        "export_import": (check_export_import, data, os.path.join(data_dir, "export.lauth")),
+        "dedupe": (check_dedupe, data, extra),
+    }
+
+    failures = []
+    print(f"账户数量 {args.accounts}，机器等级 {args.machine_class}")
+    try:
+        for name, (fn, *fn_args) in checks.items():
+            max_seconds, max_mb = limits[name]
+            max_seconds = max(max_seconds * scale, MIN_SECONDS)
+            max_mb = max(max_mb * scale, MIN_MB)
+            try:
+                elapsed, peak_mb = run_check(fn, *fn_args, memory=not args.no_memory)
+            except AssertionError as e:
+                failures.append(f"{name}: {e}")
+                print(f"{name:<16} 失败: {e}")
+                continue
+
+            status = "OK"
+            if elapsed > max_seconds:
+                failures.append(f"{name}: 耗时 {elapsed:.2f}s 超过上限 {max_seconds:.2f}s")
+                status = "FAIL"
+            if peak_mb is not None and peak_mb > max_mb:
+                failures.append(f"{name}: 峰值内存 {peak_mb:.1f}MB 超过上限 {max_mb:.1f}MB")
+                status = "FAIL"
+            peak = f"{peak_mb:8.1f} / {max_mb:.1f} MB" if peak_mb is not None else "-"
+            print(f"{name:<16} {elapsed:7.2f} / {max_seconds:.2f} s   {peak}   {status}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if failures:
+        print("\n".join(["FAIL:"] + failures), file=sys.stderr)
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OTPModel 多线程压力测试
+
+多个读线程持续遍历快照并校验一致性，多个写线程同时增删改账户，
+事务写线程在 transaction() 中批量添加、修改账户（含嵌套事务），其中一部分事务抛出异常以触发回滚。
+校验内容：
+    - 读线程从不看到未提交或已回滚的账户
+    - 事务线程自身在事务内能看到未提交的修改
+    - 每次提交恰好通知一次，回滚与嵌套事务的内层退出不通知
+    - 结束后账户数量与写入次数一致
+失败时以非零状态码退出。
+
+用法: python -m benchmarks.stress_model [--readers 8] [--writers 4] [--ops 2000]
+                                        [--txn-writers 2] [--transactions 300]
+"""
+
+import sys
+import time
+import argparse
+import threading
+
+from models.otp_model import OTPModel, OTPAccount
+
+SECRET = "JBSWY3DPEHPK3PXP"
+# 事务中添加的账户以发行方标记：提交的事务与会回滚的事务
+TXN_ISSUER = "txn"
+ROLLBACK_ISSUER = "rollback"
+# 每个事务添加的账户数（另有一个在嵌套事务中添加）
+TXN_SIZE = 3
+
+
+class Rollback(Exception):
+    """事务写线程主动抛出以触发回滚"""
+
+
+def run(readers=8, writers=4, ops=2000, txn_writers=2, transactions=300):
+    """运行压力测试，返回错误信息列表"""
+    model = OTPModel()
+    errors = []
+    stop = threading.Event()
+    added = [0] * (writers + txn_writers)
+    removed = [0] * writers
+    # 即将提交的事务编号；在事务内（仍持有写锁、尚未提交）加入，读线程看到的事务账户必须在其中
+    committing = set()
+    # 各线程收到的通知次数；监听器在提交的线程中同步调用
+    notifications = {}
+
+    def on_change(_model):
+        ident = threading.get_ident()
+        notifications[ident] = notifications.get(ident, 0) + 1
+
+    model.add_listener(on_change)
+
+    def reader(locked):
+        # 事务持有写锁期间 read_locked() 会阻塞，因此另设一个只读快照、不取读锁的读线程
+        while not stop.is_set():
+            snapshot = model.snapshot()
+            count = len(snapshot)
+            names = [account.name for account in snapshot]
+            if len(names) != count:
+                errors.append("快照在遍历过程中发生变化")
+            # get_accounts() 经过 _view()，非事务线程同样只能看到已提交的账户
+            for account in snapshot + model.get_accounts():
+                if account.issuer == ROLLBACK_ISSUER:
+                    errors.append("读线程看到了已回滚事务中的账户")
+                elif account.issuer == TXN_ISSUER and account.name.rsplit("-", 1)[0] not in committing:
+                    errors.append("读线程看到了未提交事务中的账户")
+            if not locked:
+                continue
+            with model.read_locked():
+                first = model.count()
+                data = model.to_list()
+                if len(data) != first or model.count() != first:
+                    errors.append("读锁期间模型被修改")
+
+    def writer(slot):
+        for i in range(ops):
+            name = f"w{slot}-{i}"
+            model.add_account(OTPAccount(name, SECRET, issuer=f"issuer{slot}"))
+            added[slot] += 1
+            if i % 3 == 0:
+                model.update_account(0, OTPAccount(name + "-u", SECRET))
+            if i % 5 == 0:
+                # 查找与删除需在同一写锁内完成，避免索引被其他写线程改变
+                with model.write_locked():
+                    index = next(
+                        (idx for idx, account in enumerate(model.snapshot()) if account.name == name),
+                        -1,
+                    )
+                    if index >= 0:
+                        model.remove_account(index)
+                        removed[slot] += 1
+
+    def txn_writer(slot):
+        ident = threading.get_ident()
+        for i in range(transactions):
+            txn_id = f"t{slot}-{i}"
+            rollback = i % 4 == 0
+            issuer = ROLLBACK_ISSUER if rollback else TXN_ISSUER
+            names = [f"{txn_id}-{j}" for j in range(TXN_SIZE + 1)]
+            before = notifications.get(ident, 0)
+            try:
+                with model.transaction():
+                    base = model.count()
+                    for j, name in enumerate(names[:TXN_SIZE]):
+                        model.add_account(OTPAccount(name, SECRET, issuer=issuer))
+                        # 事务线程自身可见未提交的修改
+                        if model.count() != base + j + 1 or model.get_account(base + j).name != name:
+                            errors.append("事务线程看不到自己未提交的修改")
+                    # 让出 GIL，使不取读锁的读线程在事务进行期间读取快照
+                    time.sleep(0)
+                    model.update_account(base, OTPAccount(names[0], SECRET, issuer=issuer))
+                    with model.transaction():
+                        model.add_account(OTPAccount(names[-1], SECRET, issuer=issuer))
+                    if notifications.get(ident, 0) != before:
+                        errors.append("事务提交前发出了通知")
+                    if rollback:
+                        raise Rollback()
+                    committing.add(txn_id)
+            except Rollback:
+                if notifications.get(ident, 0) != before:
+                    errors.append("回滚的事务发出了通知")
+                visible = {account.name for account in model.snapshot()}
+                if visible.intersection(names):
+                    errors.append("回滚后仍存在事务中添加的账户")
+                continue
+            if notifications.get(ident, 0) != before + 1:
+                errors.append(f"一次提交收到 {notifications.get(ident, 0) - before} 次通知")
+            added[writers + slot] += len(names)
+
+    reader_threads = [threading.Thread(target=reader, args=(i > 0,)) for i in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(slot,)) for slot in range(writers)]
+    writer_threads += [threading.Thread(target=txn_writer, args=(slot,)) for slot in range(txn_writers)]
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+
+    expected = sum(added) - sum(removed)
+    if model.count() != expected:
+        errors.append(f"账户数量不一致: 期望 {expected}，实际 {model.count()}")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OTPModel 多线程压力测试")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--txn-writers", type=int, default=2, help="事务写线程数")
+    parser.add_argument("--transactions", type=int, default=300, help="每个事务写线程的事务数")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    errors = run(args.readers, args.writers, args.ops, args.txn_writers, args.transactions)
+    elapsed = time.perf_counter() - start
+    if errors:
+        for message in sorted(set(errors)):
+            print("FAIL:", message, file=sys.stderr)
+        return 1
+    print(
+        f"OK: {args.readers} 读 / {args.writers} 写线程, 每写线程 {args.ops} 次操作, "
+        f"{args.txn_writers} 事务线程, 每线程 {args.transactions} 个事务, 用时 {elapsed:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+GUI 线程阻塞检查
+
+在 offscreen 平台上用合成账户库启动 MainWindow，通过真实的界面入口依次执行耗时操作，
+并用高频定时器测量每个操作期间事件循环的最大停顿：
+    save      MainWindow.save_accounts（加密保存）
+    import    MainWindow.import_accounts（选择加密文件、解密、导入）
+    export    MainWindow.export_accounts（加密导出）
+    cameras   CameraScanDialog 打开时枚举相机
+模态对话框（文件选择、密码输入、提示框）由脚本自动操作。
+
+停顿按事件循环的实际间隔计算，不扣除任何部分：账户列表控件只能在 GUI 线程创建，
+由 ListBuilder 分批构建，每批之间返回事件循环，同样必须满足阈值。
+每个操作在列表分批构建全部完成后才算结束。
+打开、关闭模态对话框时 Qt 会把窗口阻塞、激活等事件逐个发送给每个条目部件，
+这部分停顿仍随账户数增长（约 1000 个账户时接近 50 ms），默认规模为 500 个账户。
+
+作为对照，先在 GUI 线程连续同步保存（save_accounts(wait=True)），阻塞阈值的两倍时长，
+其停顿必须超过阈值，证明探针能检测到阻塞；之后每个操作的最大停顿都必须低于阈值。
+任一条件不满足时以非零状态码退出。
+
+数据目录为临时目录，不会读写用户数据。
+
+用法: python -m benchmarks.ui_blocking_check [--accounts 500] [--import-accounts 50] [--threshold-ms 50]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+DATA_DIR = tempfile.mkdtemp(prefix="lightauth-blocking-")
+# 必须在导入 utils.config 之前设置
+os.environ["LIGHTAUTH_DATA_DIR"] = DATA_DIR
+
+from PyQt6.QtCore import Qt, QTimer, QEventLoop
+from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox, QDialogButtonBox, QLineEdit
+
+from utils.config import init_config, save_accounts
+from gui.tasks import task_runner
+from gui import camera_devices
+from benchmarks.fixtures import make_accounts
+
+PROBE_INTERVAL_MS = 5
+PASSWORD = "benchmark-password"
+# 单个操作的超时（秒）
+SCENARIO_TIMEOUT = 60
+
+
+class LoopProbe:
+    """通过定时器回调间隔测量事件循环停顿"""
+
+    def __init__(self):
+        self.max_gap = 0.0
+        self._last = None
+        self.timer = QTimer()
+        self.timer.setInterval(PROBE_INTERVAL_MS)
+        self.timer.timeout.connect(self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.max_gap = max(self.max_gap, now - self._last)
+        self._last = now
+
+    def start(self):
+        self.max_gap = 0.0
+        self._last = None
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        return self.max_gap
+
+
+class ModalDriver:
+    """自动操作弹出的模态对话框
+
+    steps 为 (对话框类型, 回调) 列表，当前模态对话框为该类型时调用回调；提示框一律确认并记录其文本。
+    每次操作都推迟到下一轮事件循环执行，以免在定时器回调中进入嵌套的模态循环。
+    """
+
+    def __init__(self, steps, interval_ms=10):
+        self.steps = steps
+        self.messages = []
+        self._pending = False
+        self.timer = QTimer()
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._poll)
+
+    def _poll(self):
+        dialog = QApplication.activeModalWidget()
+        if dialog is None or self._pending:
+            return
+        if isinstance(dialog, QMessageBox):
+            self.messages.append(dialog.text())
+            self._defer(dialog.accept)
+            return
+        for dialog_type, step in self.steps:
+            if isinstance(dialog, dialog_type):
+                self._defer(lambda: step(dialog))
+                return
+
+    def _defer(self, action):
+        self._pending = True
+
+        def run():
+            self._pending = False
+            action()
+
+        QTimer.singleShot(0, run)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+
+def choose_file(path):
+    """文件对话框步骤：输入 path 并点击确认按钮
+
+    静态函数创建的对话框不能直接调用 accept，selectFile 也不会启用确认按钮，因此模拟输入文件名。
+    """
+    def step(dialog):
+        dialog.findChild(QLineEdit, "fileNameEdit").setText(path)
+        box = dialog.findChild(QDialogButtonBox)
+        for button in box.buttons():
+            if box.buttonRole(button) == QDialogButtonBox.ButtonRole.AcceptRole:
+                button.click()
+                return
+    return QFileDialog, step
+
+
+def run_scenario(start, is_done):
+    """执行一个操作直到 is_done() 为真
+
+    Returns:
+        dict(elapsed=耗时, stall=最大停顿)，单位为秒
+    """
+    probe = LoopProbe()
+    loop = QEventLoop()
+    result = {}
+
+    def poll():
+        if "end" not in result and is_done():
+            result["end"] = time.perf_counter()
+            # 操作结束后再多观察一段时间
+            QTimer.singleShot(100, loop.quit)
+        elif time.perf_counter() - result["start"] > SCENARIO_TIMEOUT:
+            loop.quit()
+
+    def run():
+        result["start"] = time.perf_counter()
+        poller.start()
+        start()
+
+    poller = QTimer()
+    poller.setInterval(PROBE_INTERVAL_MS)
+    poller.timeout.connect(poll)
+    probe.start()
+    QTimer.singleShot(50, run)
+    loop.exec()
+    poller.stop()
+    stall = probe.stop()
+    if "end" not in result:
+        raise TimeoutError("操作未在规定时间内完成")
+    return {"elapsed": result["end"] - result["start"], "stall": stall}
+
+
+def check_save(window):
+    """加密保存：后台 io 通道执行"""
+    def start():
+        window.save_accounts()
+    return run_scenario(start, lambda: window._save_task is not None and window._save_task.done())
+
+
+def check_blocking_save(window, duration):
+    """对照组：在 GUI 线程连续同步保存，直到阻塞时长不少于 duration 秒"""
+    state = {}
+
+    def start():
+        begin = time.perf_counter()
+        window.save_accounts(wait=True)
+        while time.perf_counter() - begin < duration:
+            window.save_accounts(wait=True)
+        state["done"] = True
+    return run_scenario(start, lambda: state.get("done"))
+
+
+def check_import(window, import_path):
+    """导入加密文件：读取、解密在后台执行，确认后批量导入"""
+    from gui.import_dialog import ImportDialog
+
+    before = window.model.count()
+
+    def drive_import(dialog):
+        if not dialog.file_path_edit.text():
+            dialog.browse_file()
+        elif dialog.import_btn.isEnabled():
+            dialog.import_accounts()
+        elif dialog.password_group.isVisible() and dialog.decrypt_btn.isEnabled() and not dialog.password_edit.text():
+            dialog.password_edit.setText(PASSWORD)
+            dialog.decrypt_file()
+
+    driver = ModalDriver([choose_file(import_path), (ImportDialog, drive_import)])
+    state = {}
+
+    def start():
+        driver.start()
+        window.import_accounts()
+        state["done"] = True
+
+    try:
+        # 导入后主窗口列表分批追加新条目
+        result = run_scenario(start, lambda: state.get("done") and not window.list_builder.is_pending())
+    finally:
+        driver.stop()
+    if window.model.count() == before:
+        raise RuntimeError(f"导入未添加任何账户: {driver.messages}")
+    return result
+
+
+def check_export(window, export_path):
+    """加密导出：加密与写入在后台执行"""
+    from gui.export_dialog import ExportDialog
+
+    def drive_export(dialog):
+        if not dialog.encrypt_cb.isChecked():
+            dialog.select_all_cb.click()
+            dialog.encrypt_cb.setChecked(True)
+            dialog.password_edit.setText(PASSWORD)
+            dialog.confirm_password_edit.setText(PASSWORD)
+            dialog.export_accounts()
+
+    driver = ModalDriver([choose_file(export_path), (ExportDialog, drive_export)])
+    state = {}
+
+    def start():
+        driver.start()
+        window.export_accounts()
+        state["done"] = True
+
+    try:
+        result = run_scenario(start, lambda: state.get("done"))
+    finally:
+        driver.stop()
+    if not os.path.exists(export_path):
+        raise RuntimeError(f"导出文件未生成: {driver.messages}")
+    return result
+
+
+def check_cameras(window):
+    """打开相机扫描对话框：相机枚举在后台执行"""
+    from gui.qr_scanner_dialogs import CameraScanDialog
+
+    camera_devices.invalidate()
+    state = {}
+
+    def start():
+        state["dialog"] = dialog = CameraScanDialog(window)
+        dialog.show()
+
+    def is_done():
+        dialog = state.get("dialog")
+        return dialog is not None and dialog.refresh_btn.isEnabled()
+
+    try:
+        return run_scenario(start, is_done)
+    finally:
+        if "dialog" in state:
+            state["dialog"].reject()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="检查主窗口的耗时操作是否阻塞 GUI 线程")
+    parser.add_argument("--accounts", type=int, default=500, help="账户库中的账户数量")
+    parser.add_argument("--import-accounts", type=int, default=50, help="导入文件中的账户数量")
+    parser.add_argument("--threshold-ms", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    init_config()
+    save_accounts(make_accounts(args.accounts))
+    import_path = os.path.join(DATA_DIR, "import.lauth")
+    export_path = os.path.join(DATA_DIR, "export.lauth")
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    app.setAttribute(Qt.ApplicationAttribute.AA_DontUseNativeDialogs)
+    from gui.main_window import MainWindow
+    from gui.export_dialog import write_export_file
+
+    write_export_file(import_path, {
+        "version": "1.0", "encrypted": True, "accounts": make_accounts(args.import_accounts, seed=1),
+    }, PASSWORD)
+
+    window = MainWindow()
+    window.timer.stop()
+    # 相当于已解锁加密的账户库，保存时需要派生密钥并加密
+    window.encryption_password = PASSWORD
+    window.show()
+    window.finish_accounts_list()
+    app.processEvents()
+
+    threshold = args.threshold_ms / 1000
+    failures = []
+    print(f"{'操作':<10} {'耗时ms':>9} {'最大停顿ms':>11}")
+
+    def report(name, result, status):
+        print(f"{name:<10} {result['elapsed'] * 1000:>9.1f} {result['stall'] * 1000:>11.1f}  {status}")
+
+    try:
+        baseline = check_blocking_save(window, 2 * threshold)
+        detected = baseline["stall"] > threshold
+        report("对照", baseline, "已检测到阻塞" if detected else "未检测到阻塞")
+        if not detected:
+            failures.append(f"对照组停顿未超过 {args.threshold_ms} ms，探针未能检测到阻塞")
+
+        scenarios = (
+            ("save", lambda: check_save(window)),
+            ("import", lambda: check_import(window, import_path)),
+            ("export", lambda: check_export(window, export_path)),
+            ("cameras", lambda: check_cameras(window)),
+        )
+        for name, check in scenarios:
+            try:
+                result = check()
+            except (RuntimeError, TimeoutError) as e:
+                failures.append(f"{name}: {e}")
+                continue
+            blocked = result["stall"] > threshold
+            report(name, result, "阻塞" if blocked else "OK")
+            if blocked:
+                failures.append(f"{name}: 事件循环停顿 {result['stall'] * 1000:.1f} ms 超过 {args.threshold_ms} ms")
+    finally:
+        window.close()
+        task_runner().shutdown()
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,51 +52,7 @@ class AccountDialog(QDialog):
         
         main_layout.addWidget(self.button_box)
         
-        # 如果父窗口处于深色主题，则覆盖本对话框样式为亮色，以确保文字可见
-        parent = self.parent()
-        dark_mode = False
-        if parent and hasattr(parent, "config"):
-            dark_mode = parent.config.get("theme", "light") == "dark"  # type: ignore[attr-defined]
-
-        if dark_mode:
-            self.setStyleSheet(
-                """
-                QDialog {
-                    background-color: #ffffff;
-                    color: #000000;
-                }
-                QWidget {
-                    color: #000000;
-                }
-                QLineEdit {
-                    background-color: #ffffff;
-                    color: #000000;
-                    border: 1px solid #cccccc;
-                }
-                QTabBar::tab {
-                    background: #e0e0e0;
-                    color: #000000;
-                    padding: 6px;
-                }
-                QTabBar::tab:selected {
-                    background: #ffffff;
-                }
-                QPushButton {
-                    background-color: #4184f3;
-                    color: #ffffff;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #5294ff;
-                }
-                QPushButton:pressed {
-                    background-color: #3367d6;
-                }
-                """
-            )
+        # 颜色由主窗口的主题样式表统一提供（含标签页），无需单独覆盖
     
     def create_manual_tab(self):
         """创建手动输入标签页"""
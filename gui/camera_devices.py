@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+相机设备枚举
+
+按平台选择 OpenCV 采集后端并枚举可用相机，结果在进程内缓存，需要时再刷新：
+    Linux    V4L2：遍历 /dev/video*，用 VIDIOC_QUERYCAP 判断是否为采集设备，不打开视频流
+    Windows  DirectShow：依次尝试打开前几个索引
+    macOS    AVFoundation：依次尝试打开前几个索引
+枚举可能较慢，应在后台线程调用 list_cameras()。
+"""
+
+import os
+import re
+import sys
+import glob
+import struct
+import threading
+from typing import List, NamedTuple, Optional
+
+import cv2
+
+# 非 Linux 平台依次尝试的索引数量
+MAX_PROBE_INDEX = 5
+
+# linux/videodev2.h
+VIDIOC_QUERYCAP = 0x80685600  # _IOR('V', 0, struct v4l2_capability)，结构体 104 字节
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_VIDEO_CAPTURE_MPLANE = 0x00001000
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+
+class CameraDevice(NamedTuple):
+    """可用相机：OpenCV 索引、显示名称与采集后端"""
+
+    index: int
+    name: str
+    api: int
+
+
+def capture_api():
+    """当前平台使用的 OpenCV 采集后端"""
+    if sys.platform == "win32":
+        return cv2.CAP_DSHOW  # DirectShow 在 Windows 中打开更快
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    if sys.platform == "darwin":
+        return cv2.CAP_AVFOUNDATION
+    return cv2.CAP_ANY
+
+
+def _query_v4l2(path):
+    """读取 V4L2 设备信息，返回 (名称, 是否为采集设备)；无法查询时返回 None"""
+    import fcntl
+
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+    except OSError:
+        return None
+    try:
+        buf = bytearray(104)
+        fcntl.ioctl(fd, VIDIOC_QUERYCAP, buf)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    card = bytes(buf[16:48]).split(b"\0", 1)[0].decode("utf-8", "replace")
+    capabilities, device_caps = struct.unpack_from("=II", buf, 84)
+    caps = device_caps if capabilities & V4L2_CAP_DEVICE_CAPS else capabilities
+    return card, bool(caps & (V4L2_CAP_VIDEO_CAPTURE | V4L2_CAP_VIDEO_CAPTURE_MPLANE))
+
+
+def _sysfs_name(index):
+    """从 sysfs 读取设备名称与节点序号（序号不为 0 的通常是元数据节点）"""
+    base = f"/sys/class/video4linux/video{index}"
+    try:
+        with open(os.path.join(base, "name"), encoding="utf-8") as f:
+            name = f.read().strip()
+    except OSError:
+        name = ""
+    try:
+        with open(os.path.join(base, "index"), encoding="utf-8") as f:
+            node_index = int(f.read().strip())
+    except (OSError, ValueError):
+        node_index = 0
+    return name, node_index
+
+
+def _linux_devices(api):
+    devices = []
+    for path in glob.glob("/dev/video*"):
+        match = re.fullmatch(r"/dev/video(\d+)", path)
+        if not match:
+            continue
+        index = int(match.group(1))
+        info = _query_v4l2(path)
+        if info is not None:
+            name, is_capture = info
+        else:
+            # 无权限打开设备时只能依据 sysfs 判断
+            name, node_index = _sysfs_name(index)
+            is_capture = node_index == 0
+        if is_capture:
+            devices.append(CameraDevice(index, name or f"video{index}", api))
+    return sorted(devices)
+
+
+def _probe_devices(api, max_index=MAX_PROBE_INDEX):
+    """依次尝试打开前几个索引"""
+    devices = []
+    for index in range(max_index):
+        cap = cv2.VideoCapture(index, api)
+        if cap and cap.isOpened():
+            devices.append(CameraDevice(index, f"相机 {index}", api))
+            cap.release()
+    return devices
+
+
+def enumerate_cameras():
+    """枚举当前平台的可用相机（不使用缓存）"""
+    api = capture_api()
+    if sys.platform.startswith("linux") and os.path.isdir("/dev"):
+        return _linux_devices(api)
+    return _probe_devices(api)
+
+
+_cache: Optional[List[CameraDevice]] = None
+_cache_lock = threading.Lock()
+
+
+def list_cameras(refresh=False) -> List[CameraDevice]:
+    """返回可用相机列表，首次调用或 refresh 为 True 时重新枚举（可能较慢，在后台线程调用）"""
+    global _cache
+    with _cache_lock:
+        if _cache is None or refresh:
+            _cache = enumerate_cameras()
+        return list(_cache)
+
+
+def cached_cameras() -> Optional[List[CameraDevice]]:
+    """已缓存的相机列表，尚未枚举时返回 None"""
+    with _cache_lock:
+        return None if _cache is None else list(_cache)
+
+
+def invalidate():
+    """清除缓存，例如相机被拔出后"""
+    global _cache
+    with _cache_lock:
+        _cache = None
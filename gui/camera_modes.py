@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+相机采集模式
+
+设置采集分辨率、像素格式（MJPEG / 原始 YUYV）与帧率，并提供只取亮度的灰度识别路径：
+    MJPEG  关闭 OpenCV 的 RGB 转换后拿到压缩帧，只对实际送去识别的帧做灰度 JPEG 解码，
+           被丢弃的帧不再解码
+    YUYV   关闭 RGB 转换后直接取 Y 通道作为灰度图，无需颜色转换
+预览帧仍转换为彩色，但只在 GUI 需要新预览时转换。
+驱动不支持关闭 RGB 转换时自动退回普通的 BGR 帧。
+
+本模块不依赖 Qt。
+"""
+
+import time
+from typing import NamedTuple
+
+import cv2
+
+from utils.qr_utils import decode_qr_from_image
+
+
+class CaptureSettings(NamedTuple):
+    """采集设置；0 或空字符串表示使用驱动默认值"""
+
+    width: int = 0
+    height: int = 0
+    fps: int = 0
+    fourcc: str = ""
+
+
+class FrameFormat(NamedTuple):
+    """相机实际输出的帧格式；raw 为 True 时帧为未经 RGB 转换的原始数据"""
+
+    fourcc: str
+    width: int
+    height: int
+    raw: bool = False
+
+
+# 预设模式：二维码识别不需要高分辨率，720p MJPEG 在 USB 带宽、转换开销与识别率之间较为均衡
+CAPTURE_PRESETS = {
+    "720p-mjpg": ("1280x720 MJPEG 30fps", CaptureSettings(1280, 720, 30, "MJPG")),
+    "480p-mjpg": ("640x480 MJPEG 30fps", CaptureSettings(640, 480, 30, "MJPG")),
+    "1080p-mjpg": ("1920x1080 MJPEG 30fps", CaptureSettings(1920, 1080, 30, "MJPG")),
+    "480p-yuyv": ("640x480 YUYV 30fps", CaptureSettings(640, 480, 30, "YUYV")),
+    "720p-yuyv": ("1280x720 YUYV 10fps", CaptureSettings(1280, 720, 10, "YUYV")),
+    "default": ("驱动默认", CaptureSettings()),
+}
+DEFAULT_PRESET = "720p-mjpg"
+
+# 基准测试时可接受的最低分辨率，过低时二维码难以识别
+MIN_BENCHMARK_WIDTH = 640
+
+
+def fourcc_to_str(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\0 ")
+
+
+def apply_settings(cap, settings, grayscale=True):
+    """在已打开的 VideoCapture 上应用采集设置，返回实际生效的 FrameFormat"""
+    # V4L2 需要先设置像素格式再设置分辨率
+    if settings.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*settings.fourcc))
+    if settings.width and settings.height:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings.height)
+    if settings.fps:
+        cap.set(cv2.CAP_PROP_FPS, settings.fps)
+    # 只保留最新帧，降低延迟
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    fourcc = fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
+    raw = False
+    if grayscale and fourcc in ("MJPG", "YUYV"):
+        raw = bool(cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+    return FrameFormat(
+        fourcc, int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), raw
+    )
+
+
+def _is_bgr(frame):
+    return frame.ndim == 3 and frame.shape[2] == 3
+
+
+def frame_to_gray(frame, fmt):
+    """把相机帧转换为二维灰度数组"""
+    if _is_bgr(frame):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if fmt.fourcc == "MJPG":
+        gray = cv2.imdecode(frame.reshape(-1), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError("无法解码 MJPEG 帧")
+        return gray
+    if fmt.fourcc == "YUYV" and frame.size == fmt.width * fmt.height * 2:
+        return frame.reshape(fmt.height, fmt.width, 2)[:, :, 0]
+    raise ValueError(f"不支持的原始帧格式: {fmt.fourcc} {frame.shape}")
+
+
+def frame_to_bgr(frame, fmt):
+    """把相机帧转换为 BGR 彩色图（用于预览）"""
+    if _is_bgr(frame):
+        return frame
+    if fmt.fourcc == "MJPG":
+        bgr = cv2.imdecode(frame.reshape(-1), cv2.IMREAD_COLOR)
+        if bgr is None:
+            raise ValueError("无法解码 MJPEG 帧")
+        return bgr
+    if fmt.fourcc == "YUYV" and frame.size == fmt.width * fmt.height * 2:
+        return cv2.cvtColor(frame.reshape(fmt.height, fmt.width, 2), cv2.COLOR_YUV2BGR_YUYV)
+    raise ValueError(f"不支持的原始帧格式: {fmt.fourcc} {frame.shape}")
+
+
+def open_camera(index, api, settings, grayscale=True):
+    """打开相机并应用设置，返回 (cap, FrameFormat, 第一帧)；无法打开或读取时返回 (cap, None, None)
+
+    第一帧无法按原始格式解析时自动恢复 OpenCV 的 RGB 转换。
+    """
+    cap = cv2.VideoCapture(int(index), api)
+    if not cap.isOpened():
+        return cap, None, None
+    fmt = apply_settings(cap, settings, grayscale)
+    ok, frame = cap.read()
+    if not ok:
+        return cap, None, None
+    if fmt.raw:
+        try:
+            frame_to_gray(frame, fmt)
+        except (ValueError, cv2.error):
+            cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            fmt = fmt._replace(raw=False)
+            ok, frame = cap.read()
+            if not ok:
+                return cap, None, None
+    return cap, fmt, frame
+
+
+def benchmark_modes(index, api, presets=None, frames=30, grayscale=True, warmup=5, task=None):
+    """依次以各预设模式打开相机，测量实际帧率、灰度转换与识别耗时
+
+    每种模式的延迟估计为 帧间隔 + 灰度转换 + 识别，延迟最低（且分辨率不低于 MIN_BENCHMARK_WIDTH）
+    的模式即为最佳模式。
+    Args:
+        task: 可选的后台任务句柄，每种模式与每帧之前调用 task.check_cancelled()，取消后立即释放相机
+    Returns:
+        (最佳预设名或 None, 各模式结果列表)
+    """
+    check_cancelled = task.check_cancelled if task is not None else lambda: None
+    presets = presets or list(CAPTURE_PRESETS)
+    results = []
+    for key in presets:
+        check_cancelled()
+        settings = CAPTURE_PRESETS[key][1]
+        result = {"preset": key}
+        results.append(result)
+        cap, fmt, frame = open_camera(index, api, settings, grayscale)
+        try:
+            if fmt is None:
+                result["error"] = "无法打开或读取"
+                continue
+            result.update(fourcc=fmt.fourcc, width=fmt.width, height=fmt.height, raw=fmt.raw)
+            for _ in range(warmup):
+                check_cancelled()
+                cap.read()
+
+            convert = decode = 0.0
+            count = 0
+            start = time.perf_counter()
+            while count < frames:
+                check_cancelled()
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                t0 = time.perf_counter()
+                gray = frame_to_gray(frame, fmt)
+                t1 = time.perf_counter()
+                decode_qr_from_image(gray)
+                decode += time.perf_counter() - t1
+                convert += t1 - t0
+                count += 1
+            elapsed = time.perf_counter() - start
+            if not count:
+                result["error"] = "无法读取"
+                continue
+            # 读取与处理在同一线程串行进行，从总时间中扣除处理时间得到相机的帧间隔
+            interval = max(elapsed - convert - decode, 0.0) / count
+            result.update(
+                fps=1.0 / interval if interval else 0.0,
+                convert_ms=convert * 1000 / count,
+                decode_ms=decode * 1000 / count,
+                latency_ms=(interval + (convert + decode) / count) * 1000,
+            )
+        except (ValueError, cv2.error) as e:
+            result["error"] = str(e)
+        finally:
+            cap.release()
+
+    candidates = [r for r in results if "latency_ms" in r and r["width"] >= MIN_BENCHMARK_WIDTH]
+    best = min(candidates, key=lambda r: r["latency_ms"])["preset"] if candidates else None
+    return best, results
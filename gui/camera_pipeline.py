@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+相机采集与二维码解码流水线
+
+    采集线程: 按相机帧率读取帧 -> 生成预览 QImage 发给 GUI -> 把原始帧放入最新帧槽
+    解码线程: 从最新帧槽取最新的一帧转为灰度并解码，解码期间到达的旧帧直接丢弃
+
+GUI 线程只接收可直接显示的 QImage 与解码结果，预览保持相机帧率，
+解码则以 CPU 允许的速度进行。GUI 尚未显示上一帧预览时新的预览帧会被丢弃，
+避免事件队列堆积。采集模式与灰度识别路径见 gui.camera_modes。
+
+画面静止时解码逐步退避（最长 BACKOFF_MAX 秒一次），画面变化后立即恢复；
+识别结果需在 CONFIRM_FRAMES 次解码中保持一致才通知 GUI，避免列表闪烁。
+"""
+
+import threading
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from utils.qr_utils import decode_qr_from_image
+from utils.metrics import metrics
+from gui.camera_modes import CaptureSettings, open_camera, frame_to_gray, frame_to_bgr
+
+# 连续读取失败多少次后认为相机断开
+MAX_READ_FAILURES = 30
+# 结果需连续一致的解码次数
+CONFIRM_FRAMES = 3
+# 静止画面的解码间隔（秒）：从 BACKOFF_START 开始加倍，直到 BACKOFF_MAX
+BACKOFF_START = 0.1
+BACKOFF_MAX = 1.0
+# 缩略图平均亮度差超过该值视为画面变化
+MOTION_THRESHOLD = 3.0
+MOTION_THUMB_SIZE = (32, 24)
+
+
+def motion_thumbnail(gray):
+    """用于比较画面变化的小缩略图，平均掉传感器噪声"""
+    step = max(min(gray.shape[0] // MOTION_THUMB_SIZE[1], gray.shape[1] // MOTION_THUMB_SIZE[0]) // 4, 1)
+    small = cv2.resize(gray[::step, ::step], MOTION_THUMB_SIZE, interpolation=cv2.INTER_AREA)
+    return small.astype(np.int16)
+
+
+class AdaptiveRate:
+    """画面静止且没有待确认的结果时逐步拉长解码间隔，直到 BACKOFF_MAX 秒一次"""
+
+    def __init__(self, static_decodes=CONFIRM_FRAMES, threshold=MOTION_THRESHOLD):
+        self.static_decodes = static_decodes
+        self.threshold = threshold
+        self.interval = 0.0
+        self._reference = None  # 本次静止开始时的缩略图
+        self._static = 0
+
+    def observe(self, gray, pending=False):
+        """根据即将解码的帧更新下一次解码前的等待间隔
+
+        pending 为 True 表示有尚未确认的识别结果，此时保持全速解码。
+        """
+        thumb = motion_thumbnail(gray)
+        moving = (
+            self._reference is None
+            or float(np.abs(thumb - self._reference).mean()) > self.threshold
+        )
+        if moving:
+            # 与静止开始时的帧比较，缓慢的变化累积起来也能被发现
+            self._reference = thumb
+            self._static = 0
+            self.interval = 0.0
+        elif pending or self._static < self.static_decodes:
+            self._static += 1
+            self.interval = 0.0
+        else:
+            self.interval = min(max(self.interval * 2, BACKOFF_START), BACKOFF_MAX)
+
+
+class CodeConfirmer:
+    """同一组识别结果连续出现 frames 次后才确认；未识别到的帧既不计数也不打断"""
+
+    def __init__(self, frames=CONFIRM_FRAMES):
+        self.frames = frames
+        self._candidate = None
+        self._count = 0
+        self._confirmed = None
+
+    @property
+    def pending(self):
+        """是否有已出现但尚未确认的结果"""
+        return self._candidate is not None and self._candidate != self._confirmed
+
+    def update(self, codes):
+        """记录一次解码结果，返回新确认的结果列表，没有新确认时返回 None"""
+        if not codes:
+            return None
+        key = tuple(sorted(set(codes)))
+        if key != self._candidate:
+            self._candidate = key
+            self._count = 0
+        self._count += 1
+        if self._count >= self.frames and key != self._confirmed:
+            self._confirmed = key
+            return list(key)
+        return None
+
+
+class LatestFrameSlot:
+    """单槽信箱：写入总是覆盖旧帧，读取者只会拿到最新的一帧"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._taken_seq = 0
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, frame):
+        with self._cond:
+            if self._seq != self._taken_seq:
+                # 上一帧还没被取走，直接覆盖
+                self.dropped += 1
+                metrics.count("camera.frames_dropped")
+            self._frame = frame
+            self._seq += 1
+            self._cond.notify()
+
+    def take(self, timeout=None):
+        """等待并取走最新一帧；超时或已关闭时返回 None"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or self._seq != self._taken_seq, timeout):
+                return None
+            if self._closed:
+                return None
+            self._taken_seq = self._seq
+            frame, self._frame = self._frame, None
+            return frame
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._frame = None
+            self._cond.notify_all()
+
+
+class CameraPipelineSignals(QObject):
+    """流水线信号，在 GUI 线程中接收"""
+
+    frame_ready = pyqtSignal(QImage)
+    codes_decoded = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+
+class CameraPipeline:
+    """相机采集/解码流水线，必须在 GUI 线程中创建
+
+    decoder 接收二维灰度数组；preview_height 指定时预览帧在采集线程中先缩小到该高度。
+    """
+
+    def __init__(self, camera_index, api_preference=cv2.CAP_ANY, decoder=decode_qr_from_image,
+                 settings=CaptureSettings(), grayscale=True, preview_height=None,
+                 confirm_frames=CONFIRM_FRAMES):
+        self.camera_index = camera_index
+        self.api_preference = api_preference
+        self.decoder = decoder
+        self.settings = settings
+        self.grayscale = grayscale
+        self.preview_height = preview_height
+        self.confirm_frames = confirm_frames
+        self.frame_format = None  # 相机打开后实际生效的帧格式
+        self.signals = CameraPipelineSignals()
+        self._slot = LatestFrameSlot()
+        self._stop_event = threading.Event()
+        self._preview_pending = threading.Event()
+        self._threads = []
+        # 先于使用方的槽函数连接，预览送达后才允许发送下一帧
+        self.signals.frame_ready.connect(lambda _: self._preview_pending.clear())
+
+    def start(self):
+        """启动采集与解码线程（打开相机也在采集线程中进行）"""
+        if self._threads:
+            return
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="lightauth-camera", daemon=True),
+            threading.Thread(target=self._decode_loop, name="lightauth-decode", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """停止流水线并释放相机"""
+        self._stop_event.set()
+        self._slot.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def is_running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _capture_loop(self):
+        cap, fmt, frame = open_camera(self.camera_index, self.api_preference, self.settings, self.grayscale)
+        try:
+            if fmt is None:
+                self.signals.error.emit("无法打开该相机")
+                return
+            self.frame_format = fmt
+            failures = 0
+            while not self._stop_event.is_set():
+                if frame is None:  # 第一帧已在打开相机时读取
+                    ok, frame = cap.read()
+                    if not ok:
+                        frame = None
+                        failures += 1
+                        if failures >= MAX_READ_FAILURES:
+                            self.signals.error.emit("相机无法读取画面")
+                            return
+                        continue
+                failures = 0
+                metrics.count("camera.frames")
+                self._slot.put(frame)
+                if not self._preview_pending.is_set():
+                    try:
+                        qimage = self._to_qimage(frame_to_bgr(frame, fmt))
+                    except (ValueError, cv2.error):
+                        qimage = None  # 损坏的压缩帧，跳过预览
+                    if qimage is not None:
+                        self._preview_pending.set()
+                        self.signals.frame_ready.emit(qimage)
+                frame = None
+        finally:
+            cap.release()
+            self._slot.close()
+
+    def _to_qimage(self, frame):
+        """BGR 帧转换为独立持有数据的 QImage，可安全跨线程传递"""
+        height = frame.shape[0]
+        if self.preview_height and height > self.preview_height:
+            width = max(int(frame.shape[1] * self.preview_height / height), 1)
+            frame = cv2.resize(frame, (width, self.preview_height), interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb.shape
+        return QImage(rgb.data, w, h, ch * w, QImage.Format.Format_RGB888).copy()
+
+    def _decode_loop(self):
+        rate = AdaptiveRate(self.confirm_frames)
+        confirmer = CodeConfirmer(self.confirm_frames)
+        while not self._stop_event.is_set():
+            # 画面静止时先等待，再取最新的一帧
+            if rate.interval and self._stop_event.wait(rate.interval):
+                return
+            frame = self._slot.take(timeout=0.5)
+            if frame is None:
+                if self._slot.closed:
+                    return
+                continue
+            try:
+                gray = frame_to_gray(frame, self.frame_format)
+                rate.observe(gray, confirmer.pending)
+                if rate.interval:
+                    metrics.count("camera.decodes_backed_off")
+                decoded = self.decoder(gray)
+            except Exception:
+                continue
+            # 只在确认了新的结果时通知 GUI
+            confirmed = confirmer.update([data for data, _rect in decoded])
+            if confirmed is not None:
+                self.signals.codes_decoded.emit(confirmed)
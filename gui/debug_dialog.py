@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+隐藏的调试面板：实时查看性能指标并导出为 JSON，开启区间追踪并导出 Chrome trace（Ctrl+Shift+D 打开）
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox, QHeaderView
+)
+from PyQt6.QtCore import QTimer, qVersion
+
+from utils.metrics import metrics
+from utils.tracing import tracer
+from gui.tasks import task_runner
+
+COLUMNS = ["指标", "次数/值", "平均", "P50", "P95", "最大", "单位"]
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+class DebugDialog(QDialog):
+    """性能指标调试面板"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+        # 每秒刷新一次
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+        self.refresh()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("调试 - 性能指标")
+        self.resize(640, 400)
+
+        layout = QVBoxLayout(self)
+
+        self.enabled_check = QCheckBox("采集性能指标")
+        self.enabled_check.setChecked(metrics.enabled)
+        self.enabled_check.toggled.connect(self.toggle_enabled)
+        layout.addWidget(self.enabled_check)
+
+        self.trace_check = QCheckBox("记录追踪区间")
+        self.trace_check.setChecked(tracer.enabled)
+        self.trace_check.toggled.connect(self.toggle_tracing)
+        layout.addWidget(self.trace_check)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        reset_btn = QPushButton("清空")
+        reset_btn.clicked.connect(self.reset)
+        btn_layout.addWidget(reset_btn)
+
+        export_btn = QPushButton("导出 JSON")
+        export_btn.clicked.connect(self.export_json)
+        btn_layout.addWidget(export_btn)
+
+        trace_btn = QPushButton("导出 Trace")
+        trace_btn.clicked.connect(self.export_trace)
+        btn_layout.addWidget(trace_btn)
+
+        self.backend_btn = QPushButton("识别后端基准")
+        self.backend_btn.clicked.connect(self.benchmark_qr_backends)
+        btn_layout.addWidget(self.backend_btn)
+
+        btn_layout.addStretch()
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+    def toggle_enabled(self, checked):
+        """开启或关闭指标采集"""
+        metrics.enabled = checked
+
+    def toggle_tracing(self, checked):
+        """开启或关闭区间追踪"""
+        tracer.enabled = checked
+
+    def reset(self):
+        """清空指标与追踪记录"""
+        metrics.reset()
+        tracer.clear()
+        self.refresh()
+
+    def refresh(self):
+        """刷新表格"""
+        snapshot = metrics.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, data) in enumerate(snapshot.items()):
+            if data["type"] == "histogram":
+                values = [name, data["count"], data["mean"], data["p50"], data["p95"], data["max"], data["unit"]]
+            else:
+                values = [name, data["value"], None, None, None, None, ""]
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(_fmt(value)))
+
+    def export_json(self):
+        """导出指标为 JSON 文件"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出性能指标", "lightauth-metrics.json", "JSON 文件 (*.json)"
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(metrics.to_json({"qt": qVersion()}))
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"导出失败: {str(e)}")
+
+    def export_trace(self):
+        """导出追踪区间为 Chrome trace JSON 文件"""
+        if not tracer.event_count():
+            QMessageBox.information(self, "提示", "没有追踪记录，请先勾选“记录追踪区间”并执行操作")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出追踪数据", "lightauth-trace.json", "JSON 文件 (*.json)"
+        )
+        if not file_path:
+            return
+        try:
+            tracer.dump(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"导出失败: {str(e)}")
+
+    def benchmark_qr_backends(self):
+        """在后台重新测量二维码识别后端并按结果排序"""
+        from utils.qr_utils import benchmark_backends, select_backend
+
+        def run():
+            # 用同一次测量结果排序并显示，避免重复测量
+            timings = benchmark_backends()
+            return timings, select_backend(timings=timings)
+
+        self.backend_btn.setEnabled(False)
+        task_runner().submit(run, on_result=self.on_backends_benchmarked, on_error=self.on_backends_failed)
+
+    def on_backends_benchmarked(self, result):
+        timings, order = result
+        self.backend_btn.setEnabled(True)
+        lines = [
+            f"{name}: {'不可用' if ms is None else f'{ms:.1f} ms'}"
+            for name, ms in timings.items()
+        ]
+        lines.append("当前顺序: " + (" > ".join(order) or "无可用后端"))
+        QMessageBox.information(self, "识别后端", "\n".join(lines))
+
+    def on_backends_failed(self, e):
+        self.backend_btn.setEnabled(True)
+        QMessageBox.critical(self, "错误", f"基准测试失败: {str(e)}")
@@ -6,10 +6,27 @@ import os
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QCheckBox,
     QPushButton, QLabel, QLineEdit, QFileDialog,
-    QListWidget, QListWidgetItem, QMessageBox, QGroupBox, QWidget
+    QListWidget, QMessageBox, QGroupBox, QWidget
 )
 from PyQt6.QtCore import Qt
 from utils.config import encrypt_data
+from gui.tasks import task_runner
+from gui.list_builder import ListBuilder
+from utils.tracing import trace_span
+
+
+def write_export_file(file_path, export_data, password=""):
+    """写入导出文件，提供密码时加密后写入（在后台线程执行）"""
+    if password:
+        # 加密导出
+        encrypted_data = encrypt_data(export_data, password)
+        with open(file_path, 'wb') as f:
+            f.write(encrypted_data)
+    else:
+        # 不加密直接保存 JSON
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(export_data, f, indent=4)
+    return file_path
 
 class CheckableAccountItemWidget(QWidget):
     """自定义的可勾选账户条目，包含一个真实的复选框"""
@@ -39,6 +56,7 @@ class ExportDialog(QDialog):
         
         self.init_ui()
     
+    @trace_span("gui.export_list", "gui")
     def init_ui(self):
         """初始化UI"""
         self.setWindowTitle("导出账户")
@@ -58,14 +76,10 @@ class ExportDialog(QDialog):
         select_layout.addStretch()
         accounts_layout.addLayout(select_layout)
         
-        # 账户列表
+        # 账户列表，条目分批创建
         self.accounts_list = QListWidget()
-        for account in self.accounts:
-            item = QListWidgetItem(self.accounts_list)
-            widget = CheckableAccountItemWidget(f"{account.name} ({account.issuer})")
-            widget.checkbox.stateChanged.connect(self.update_select_all_state)
-            item.setSizeHint(widget.sizeHint())
-            self.accounts_list.setItemWidget(item, widget)
+        self.list_builder = ListBuilder(self.accounts_list, self.make_account_row)
+        self.list_builder.append(self.accounts)
         
         accounts_layout.addWidget(self.accounts_list)
         accounts_group.setLayout(accounts_layout)
@@ -110,6 +124,14 @@ class ExportDialog(QDialog):
         
         layout.addLayout(btn_layout)
     
+    def make_account_row(self, item, account, row):
+        """为账户条目创建可勾选部件，勾选状态沿用全选框（全选时尚未创建的条目也应选中）"""
+        widget = CheckableAccountItemWidget(f"{account.name} ({account.issuer})")
+        widget.set_checked(self.select_all_cb.isChecked())
+        widget.checkbox.stateChanged.connect(self.update_select_all_state)
+        item.setSizeHint(widget.sizeHint())
+        self.accounts_list.setItemWidget(item, widget)
+    
     def update_select_all_state(self):
         """当单个条目状态改变时，更新"全选"复选框的状态"""
         all_checked = True
@@ -126,10 +148,18 @@ class ExportDialog(QDialog):
 
     def toggle_select_all(self, checked):
         """全选/取消全选"""
+        # 逐个勾选时屏蔽条目的状态信号，否则每个条目都会重新扫描整个列表（O(n²)）；全选框已是目标状态
         for i in range(self.accounts_list.count()):
             widget = self.accounts_list.itemWidget(self.accounts_list.item(i))
             if widget:
+                widget.checkbox.blockSignals(True)
                 widget.set_checked(checked)
+                widget.checkbox.blockSignals(False)
+    
+    def done(self, result):
+        # 对话框关闭后不再构建剩余条目
+        self.list_builder.cancel()
+        super().done(result)
     
     def toggle_password_field(self, checked):
         """切换密码字段状态"""
@@ -139,11 +169,17 @@ class ExportDialog(QDialog):
     def get_selected_accounts(self):
         """获取选中的账户"""
         selected_accounts = []
-        for i in range(self.accounts_list.count()):
+        built = self.accounts_list.count()
+        for i in range(built):
             widget = self.accounts_list.itemWidget(self.accounts_list.item(i))
             if widget and widget.is_checked():
                 selected_accounts.append(self.accounts[i])
                 self.selected_indices.append(i)
+        # 尚未创建的条目创建时沿用全选框的状态，无需等待构建完成
+        if self.select_all_cb.isChecked():
+            for i in range(built, len(self.accounts)):
+                selected_accounts.append(self.accounts[i])
+                self.selected_indices.append(i)
         return selected_accounts
     
     def export_accounts(self):
@@ -189,23 +225,25 @@ class ExportDialog(QDialog):
             "accounts": [account.to_dict() for account in selected_accounts]
         }
         
-        try:
-            if self.encrypt_cb.isChecked():
-                # 加密导出
-                encrypted_data = encrypt_data(export_data, self.password_edit.text())
-                with open(file_path, 'wb') as f:
-                    f.write(encrypted_data)
-            else:
-                # 不加密直接保存 JSON
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=4)
-                    
+        password = self.password_edit.text() if self.encrypt_cb.isChecked() else ""
+        count = len(selected_accounts)
+
+        def on_exported(path):
+            self.export_btn.setEnabled(True)
             QMessageBox.information(
                 self, 
                 "导出成功", 
-                f"成功导出 {len(selected_accounts)} 个账户到 {file_path}"
+                f"成功导出 {count} 个账户到 {path}"
             )
             self.accept()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "导出失败", f"导出过程中发生错误: {str(e)}") 
\ No newline at end of file
+
+        def on_failed(e):
+            self.export_btn.setEnabled(True)
+            QMessageBox.critical(self, "导出失败", f"导出过程中发生错误: {str(e)}")
+
+        # 加密与写入在后台执行，避免界面卡顿
+        self.export_btn.setEnabled(False)
+        task_runner().submit(
+            write_export_file, file_path, export_data, password,
+            lane="io", on_result=on_exported, on_error=on_failed
+        )
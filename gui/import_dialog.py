@@ -6,11 +6,30 @@ import os
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QCheckBox,
     QPushButton, QLabel, QLineEdit, QFileDialog,
-    QListWidget, QListWidgetItem, QMessageBox, QGroupBox, QWidget
+    QListWidget, QMessageBox, QGroupBox, QWidget
 )
 from PyQt6.QtCore import Qt
 from utils.config import decrypt_data
 from models.otp_model import OTPAccount
+from gui.tasks import task_runner
+from gui.list_builder import ListBuilder
+from utils.tracing import trace_span
+
+
+@trace_span("import.read_file", "io")
+def read_import_file(file_path):
+    """读取导入文件（在后台线程执行）
+
+    Returns:
+        ("json", 数据字典) 或 ("encrypted", 原始字节)
+    """
+    with open(file_path, 'rb') as f:
+        file_data = f.read()
+    try:
+        return "json", json.loads(file_data.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        # 可能是加密文件
+        return "encrypted", file_data
 
 class CheckableAccountItemWidget(QWidget):
     """自定义的可勾选账户条目，包含一个真实的复选框"""
@@ -100,6 +119,7 @@ class ImportDialog(QDialog):
         
         # 账户列表
         self.accounts_list = QListWidget()
+        self.list_builder = ListBuilder(self.accounts_list, self.make_account_row)
         accounts_layout.addWidget(self.accounts_list)
         
         accounts_group.setLayout(accounts_layout)
@@ -135,32 +155,37 @@ class ImportDialog(QDialog):
             self.load_file(file_path)
     
     def load_file(self, file_path):
-        """加载文件"""
-        try:
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
+        """加载文件（读取与解析在后台执行）"""
+        self.browse_btn.setEnabled(False)
+        task_runner().submit(
+            read_import_file, file_path,
+            on_result=self.on_file_loaded, on_error=self.on_file_load_failed
+        )
+    
+    def on_file_loaded(self, result):
+        """文件读取完成"""
+        self.browse_btn.setEnabled(True)
+        kind, payload = result
+        if kind == "json":
+            self.import_data = payload
+            self.is_encrypted = self.import_data.get('encrypted', False)
             
-            # 尝试作为JSON加载
-            try:
-                self.import_data = json.loads(file_data.decode('utf-8'))
-                self.is_encrypted = self.import_data.get('encrypted', False)
-                
-                if self.is_encrypted:
-                    # 文件声明加密但内容为JSON，这是一个错误
-                    QMessageBox.warning(self, "警告", "文件格式错误：声明为加密但内容未加密")
-                    return
-                    
-                # 显示账户列表
-                self.show_accounts_list()
-                
-            except json.JSONDecodeError:
-                # 可能是加密文件
-                self.is_encrypted = True
-                self.password_group.setVisible(True)
-                self.raw_file_data = file_data
+            if self.is_encrypted:
+                # 文件声明加密但内容为JSON，这是一个错误
+                QMessageBox.warning(self, "警告", "文件格式错误：声明为加密但内容未加密")
+                return
                 
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"无法加载文件: {str(e)}")
+            # 显示账户列表
+            self.show_accounts_list()
+        else:
+            self.is_encrypted = True
+            self.password_group.setVisible(True)
+            self.raw_file_data = payload
+    
+    def on_file_load_failed(self, e):
+        """文件读取失败"""
+        self.browse_btn.setEnabled(True)
+        QMessageBox.critical(self, "错误", f"无法加载文件: {str(e)}")
     
     def decrypt_file(self):
         """解密文件"""
@@ -172,46 +197,60 @@ class ImportDialog(QDialog):
             QMessageBox.warning(self, "警告", "请输入密码")
             return
             
-        try:
-            self.import_data = decrypt_data(self.raw_file_data, password)
-            
-            if not self.import_data:
-                QMessageBox.warning(self, "警告", "密码错误或文件格式不正确")
-                return
-                
-            # 显示账户列表
-            self.show_accounts_list()
+        # 密钥派生与解密在后台执行
+        self.decrypt_btn.setEnabled(False)
+        task_runner().submit(
+            decrypt_data, self.raw_file_data, password,
+            on_result=self.on_decrypted, on_error=self.on_decrypt_failed
+        )
+    
+    def on_decrypted(self, data):
+        """解密完成"""
+        self.decrypt_btn.setEnabled(True)
+        self.import_data = data
+        
+        if not self.import_data:
+            QMessageBox.warning(self, "警告", "密码错误或文件格式不正确")
+            return
             
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"解密过程中发生错误: {str(e)}")
+        # 显示账户列表
+        self.show_accounts_list()
+    
+    def on_decrypt_failed(self, e):
+        """解密出错"""
+        self.decrypt_btn.setEnabled(True)
+        QMessageBox.critical(self, "错误", f"解密过程中发生错误: {str(e)}")
     
+    @trace_span("gui.import_list", "gui")
     def show_accounts_list(self):
         """显示账户列表"""
         if not self.import_data or 'accounts' not in self.import_data:
             QMessageBox.warning(self, "警告", "文件中没有找到账户数据")
             return
             
-        # 清空账户列表
+        # 清空账户列表，条目分批创建
+        self.list_builder.cancel()
         self.accounts_list.clear()
-        
-        # 添加账户到列表
-        for account_data in self.import_data['accounts']:
-            name = account_data.get('name', '未命名')
-            issuer = account_data.get('issuer', '')
-            display_text = f"{name} ({issuer})" if issuer else name
-            
-            item = QListWidgetItem(self.accounts_list)
-            widget = CheckableAccountItemWidget(display_text)
-            widget.checkbox.stateChanged.connect(self.update_select_all_state)
-            item.setSizeHint(widget.sizeHint())
-            item.setData(Qt.ItemDataRole.UserRole, account_data) # 仍然需要存储原始数据
-            self.accounts_list.setItemWidget(item, widget)
+        self.list_builder.append(self.import_data['accounts'])
         
         # 显示账户选择区域
         self.password_group.setVisible(False)
         self.accounts_group.setVisible(True)
         self.import_btn.setEnabled(True)
     
+    def make_account_row(self, item, account_data, row):
+        """为账户条目创建可勾选部件，勾选状态沿用全选框（全选时尚未创建的条目也应选中）"""
+        name = account_data.get('name', '未命名')
+        issuer = account_data.get('issuer', '')
+        display_text = f"{name} ({issuer})" if issuer else name
+        
+        widget = CheckableAccountItemWidget(display_text)
+        widget.set_checked(self.select_all_cb.isChecked())
+        widget.checkbox.stateChanged.connect(self.update_select_all_state)
+        item.setSizeHint(widget.sizeHint())
+        item.setData(Qt.ItemDataRole.UserRole, account_data) # 仍然需要存储原始数据
+        self.accounts_list.setItemWidget(item, widget)
+    
     def update_select_all_state(self):
         """当单个条目状态改变时，更新"全选"复选框的状态"""
         all_checked = True
@@ -227,17 +266,22 @@ class ImportDialog(QDialog):
     
     def toggle_select_all(self, checked):
         """全选/取消全选"""
+        # 逐个勾选时屏蔽条目的状态信号，否则每个条目都会重新扫描整个列表（O(n²)）；全选框已是目标状态
         for i in range(self.accounts_list.count()):
             widget = self.accounts_list.itemWidget(self.accounts_list.item(i))
             if widget:
+                widget.checkbox.blockSignals(True)
                 widget.set_checked(checked)
+                widget.checkbox.blockSignals(False)
     
+    @trace_span("gui.import_build", "gui")
     def import_accounts(self):
         """导入账户"""
         self.accounts_to_import = []
         
         # 收集选中的账户
-        for i in range(self.accounts_list.count()):
+        built = self.accounts_list.count()
+        for i in range(built):
             item = self.accounts_list.item(i) # item用于获取数据
             widget = self.accounts_list.itemWidget(item) # widget用于获取勾选状态
             if widget and widget.is_checked():
@@ -245,6 +289,11 @@ class ImportDialog(QDialog):
                 if account_data:
                     otp_account = OTPAccount.from_dict(account_data)
                     self.accounts_to_import.append(otp_account)
+        # 尚未创建的条目创建时沿用全选框的状态，无需等待构建完成
+        if self.select_all_cb.isChecked():
+            for account_data in self.import_data['accounts'][built:]:
+                if account_data:
+                    self.accounts_to_import.append(OTPAccount.from_dict(account_data))
         
         if not self.accounts_to_import:
             QMessageBox.warning(self, "警告", "请至少选择一个账户进行导入")
@@ -252,6 +301,11 @@ class ImportDialog(QDialog):
             
         self.accept()
     
+    def done(self, result):
+        # 对话框关闭后不再构建剩余条目
+        self.list_builder.cancel()
+        super().done(result)
+    
     def get_imported_accounts(self):
         """获取要导入的账户"""
         return self.accounts_to_import 
\ No newline at end of file
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分批构建列表条目
+
+QListWidget 的条目部件只能在 GUI 线程创建，在应用级样式表下每行约 0.5 ~ 3 ms（列表可见时更高），
+账户较多时一次性建表会长时间阻塞事件循环。ListBuilder 把条目分批追加到列表末尾，
+每批挂载部件的时间不超过 BATCH_BUDGET_MS，批次之间返回事件循环，界面在构建期间保持响应。
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from utils.tracing import trace_span
+
+# 每批挂载部件的时间预算（毫秒）；插入条目与批次之后的布局、重绘随列表长度增长，另需留出余量
+BATCH_BUDGET_MS = 10
+# 每次构建第一批插入的条目数，之后按上一批在预算内挂载的数量调整
+FIRST_BATCH_ROWS = 4
+
+
+class ListBuilder(QObject):
+    """分批向 QListWidget 末尾追加带部件的条目，必须在 GUI 线程中使用
+
+    make_row(item, value, row) 为已加入列表的新条目创建部件、设置尺寸提示并挂载，row 为其所在行。
+    append() 立即返回，各批次在之后的事件循环中依次构建；全部完成后发出 finished。
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, list_widget, make_row):
+        super().__init__(list_widget)
+        self.list_widget = list_widget
+        self._make_row = make_row
+        self._values = []
+        self._unmounted = []  # 已插入列表、尚未挂载部件的 (条目, 值)，位于列表末尾
+        self._batch_rows = FIRST_BATCH_ROWS
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_batch)
+
+    def is_pending(self):
+        """是否还有尚未构建的条目"""
+        return bool(self._values or self._unmounted)
+
+    def append(self, values):
+        """追加条目，排在尚未构建的条目之后"""
+        if not self.is_pending():
+            self._batch_rows = FIRST_BATCH_ROWS
+        self._values.extend(values)
+        if self.is_pending() and not self._timer.isActive():
+            self._timer.start(0)
+
+    def cancel(self):
+        """丢弃尚未构建的条目，已构建的条目保留"""
+        self._timer.stop()
+        self._values = []
+        for _ in self._unmounted:
+            self.list_widget.takeItem(self.list_widget.count() - 1)
+        self._unmounted = []
+
+    def finish(self):
+        """同步构建全部剩余条目（如需要读取整个列表时）"""
+        self._timer.stop()
+        if self.is_pending():
+            self._insert(len(self._values))
+            self._mount(None)
+            self.finished.emit()
+
+    def _insert(self, count):
+        """一次性插入 count 个空条目：逐个插入时列表每次都会重新定位已挂载的全部部件"""
+        values = self._values[:count]
+        del self._values[:count]
+        if not values:
+            return
+        first_row = self.list_widget.count()
+        self.list_widget.addItems([""] * len(values))
+        self._unmounted.extend(
+            (self.list_widget.item(first_row + offset), value) for offset, value in enumerate(values)
+        )
+
+    def _mount(self, deadline):
+        """按顺序为已插入的条目挂载部件，超过 deadline 时停止，返回挂载的数量"""
+        with trace_span("gui.list_batch", "gui") as span:
+            row = self.list_widget.count() - len(self._unmounted)
+            mounted = 0
+            while self._unmounted:
+                item, value = self._unmounted.pop(0)
+                self._make_row(item, value, row + mounted)
+                mounted += 1
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+            span.args["rows"] = mounted
+        return mounted
+
+    def _run_batch(self):
+        deadline = time.perf_counter() + BATCH_BUDGET_MS / 1000
+        if not self._unmounted:
+            self._insert(self._batch_rows)
+        mounted = self._mount(deadline)
+        # 预算内挂载完时下一批多插入一些，超出预算时按本批实际挂载的数量插入
+        self._batch_rows = max(1, mounted if self._unmounted else mounted * 2)
+        if self.is_pending():
+            self._timer.start(0)
+        else:
+            self.finished.emit()
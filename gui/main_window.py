@@ -13,20 +13,26 @@ from PyQt6.QtWidgets import (
     QApplication
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QSize, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QAction, QIcon, QFont, QPixmap
+from PyQt6.QtGui import QAction, QIcon, QFont, QPixmap, QShortcut, QKeySequence
 
 from models.otp_model import OTPModel, OTPAccount
 from utils.config import (
-    load_config, save_config, load_accounts, save_accounts, 
+    load_config, update_config, load_accounts, save_accounts, 
     hash_password, verify_password
 )
 from gui.account_dialog import AccountDialog
 from gui.settings_dialog import SettingsDialog
-from gui.otp_item_widget import OTPItemWidget
+from gui.otp_item_widget import OTPItemWidget, AccountListWidget
 from gui.export_dialog import ExportDialog
 from gui.import_dialog import ImportDialog
-from gui.styles import LIGHT_STYLE, DARK_STYLE
+from gui.theme import theme_manager
 from gui.animations import SlideAnimation
+from gui.tasks import task_runner
+from gui.list_builder import ListBuilder
+from gui.stall_detector import StallDetector
+from utils.profiling import startup_timer
+from utils.metrics import metrics
+from utils.tracing import trace_span
 
 # 以下指令用于静态类型检查工具，忽略由于动态属性导致的类型错误
 # mypy: ignore-errors
@@ -35,32 +41,56 @@ class MainWindow(QMainWindow):
     """主窗口"""
     
     update_signal = pyqtSignal()
+    # 模型变更通知，可能由后台线程（代理、后台任务）发出，跨线程时以排队方式在 GUI 线程处理
+    model_changed = pyqtSignal(object)
     
     def __init__(self):
         super().__init__()
-        self.model = OTPModel()
+        self.model = None
+        self._save_task = None  # 后台保存任务
+        self._list_accounts = ()  # 账户列表对应的账户快照（含尚未构建的条目）
+        self.stall_detector = None  # 可选的界面卡顿检测器
+        self.model_changed.connect(self.on_model_changed)
+        self.set_model(OTPModel())
         self.config = load_config()
         self.encryption_password = ""
         self.animations = []  # 保存动画对象的引用，避免被垃圾回收
+        self._shown_at = None  # 首次显示时刻，用于启动计时
         
         # 设置应用图标
-        self.setup_icons()
+        with startup_timer.phase("icons"):
+            self.setup_icons()
         
         # 应用样式
-        self.apply_theme()
+        with startup_timer.phase("theme"):
+            self.apply_theme()
         
         # 检查是否启用加密
-        if self.config.get("encryption_enabled", False):
-            self.prompt_for_password()
-        else:
-            self.load_application_data()
+        with startup_timer.phase("unlock"):
+            if self.config.get("encryption_enabled", False):
+                self.prompt_for_password()
+            else:
+                self.load_application_data()
         
-        self.init_ui()
+        with startup_timer.phase("init_ui"):
+            self.init_ui()
         
         # 设置更新计时器
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_otp_codes)
         self.timer.start(1000)  # 每秒更新一次
+        
+        # 按配置启用卡顿检测
+        self.update_stall_detector()
+    
+    def update_stall_detector(self):
+        """根据配置启动或停止界面卡顿检测"""
+        if self.config.get("stall_detector_enabled", False):
+            if self.stall_detector is None:
+                self.stall_detector = StallDetector(self.config.get("stall_threshold_ms", 500))
+            self.stall_detector.start()
+        elif self.stall_detector is not None:
+            self.stall_detector.stop()
     
     def setup_icons(self):
         """设置应用图标"""
@@ -73,12 +103,18 @@ class MainWindow(QMainWindow):
             self.setWindowIcon(self.app_icon)
     
     def apply_theme(self):
-        """应用主题样式"""
-        theme = self.config.get("theme", "light")
-        if theme == "dark":
-            self.setStyleSheet(DARK_STYLE)
-        else:
-            self.setStyleSheet(LIGHT_STYLE)
+        """应用主题样式
+
+        样式表在应用程序级别只设置一次，切换主题时跳过账户条目：条目在绘制时读取调色板，重绘即可。
+        """
+        if theme_manager().apply(self.config.get("theme", "light"), skip=self.is_account_row_widget):
+            if hasattr(self, "accounts_list"):
+                self.accounts_list.viewport().update()
+
+    def is_account_row_widget(self, widget):
+        """是否为账户条目（或其子部件）"""
+        accounts_list = getattr(self, "accounts_list", None)
+        return accounts_list is not None and accounts_list.viewport().isAncestorOf(widget)
     
     def prompt_for_password(self, retry=False):
         """提示用户输入密码"""
@@ -94,10 +130,11 @@ class MainWindow(QMainWindow):
         message = "请输入解锁密码:" if not retry else "密码错误，请重试:"
         
         # 弹出密码输入框
-        password, ok = QInputDialog.getText(
-            self, "安全验证", message, 
-            QLineEdit.EchoMode.Password
-        )
+        with startup_timer.phase("password_prompt"):
+            password, ok = QInputDialog.getText(
+                self, "安全验证", message, 
+                QLineEdit.EchoMode.Password
+            )
         
         if ok:
             # 验证密码
@@ -111,11 +148,33 @@ class MainWindow(QMainWindow):
             # 用户取消，退出应用
             self.close()
     
+    @trace_span("gui.unlock", "gui")
     def load_application_data(self):
         """加载应用数据"""
         # 加载账户数据，如果启用了加密，则使用用户输入的密码
-        accounts_data = load_accounts(self.encryption_password)
-        self.model = OTPModel.from_list(accounts_data)
+        with startup_timer.phase("load_accounts"):
+            accounts_data = load_accounts(self.encryption_password)
+        with startup_timer.phase("build_model"):
+            self.set_model(OTPModel.from_list(accounts_data))
+    
+    def set_model(self, model):
+        """替换账户模型并订阅其变更通知"""
+        if self.model is not None:
+            self.model.remove_listener(self._emit_model_changed)
+        self.model = model
+        self.model.add_listener(self._emit_model_changed)
+    
+    def _emit_model_changed(self, model):
+        """模型监听器，可能在任意线程调用，只转发信号"""
+        self.model_changed.emit(model)
+    
+    def on_model_changed(self, model):
+        """模型每次提交后：持久化一次并刷新一次列表（始终在 GUI 线程执行）"""
+        if model is not self.model:
+            # 排队期间模型已被替换
+            return
+        self.save_accounts()
+        self.update_accounts_list()
     
     def init_ui(self):
         """初始化UI"""
@@ -154,10 +213,11 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(header_layout)
         
         # 账户列表
-        self.accounts_list = QListWidget()
+        self.accounts_list = AccountListWidget()
         self.accounts_list.setSpacing(8)
         self.accounts_list.setVerticalScrollMode(QListWidget.ScrollMode.ScrollPerPixel)
         main_layout.addWidget(self.accounts_list)
+        self.list_builder = ListBuilder(self.accounts_list, self._make_account_row)
         
         # 底部按钮
         btn_layout = QHBoxLayout()
@@ -178,7 +238,8 @@ class MainWindow(QMainWindow):
         self.create_menus()
         
         # 更新账户列表
-        self.update_accounts_list()
+        with startup_timer.phase("update_accounts_list"):
+            self.update_accounts_list()
     
     def create_menus(self):
         """创建菜单"""
@@ -216,22 +277,71 @@ class MainWindow(QMainWindow):
         about_action = QAction("关于", self)
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
+        
+        # 隐藏的调试面板
+        debug_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        debug_shortcut.activated.connect(self.show_debug_dialog)
     
-    def update_accounts_list(self):
-        """更新账户列表"""
-        self.accounts_list.clear()
-        
-        for idx, account in enumerate(self.model.get_accounts()):
-            item = QListWidgetItem()
-            widget = OTPItemWidget(account, idx, self)
-            item.setSizeHint(widget.sizeHint())
-            
-            self.accounts_list.addItem(item)
-            self.accounts_list.setItemWidget(item, widget)
-            
-            # 不再使用动画，直接显示
-            # 保留占位，避免anim引用
-            # self.animations.append(None)
+    def update_accounts_list(self, rebuild=False):
+        """使账户列表与模型一致
+
+        只处理与当前列表的差异：末尾追加、单行替换与删除；其他情况从第一处差异起重建。
+        新条目由 ListBuilder 分批创建，账户较多时不会长时间阻塞事件循环；rebuild 为 True 时重建全部条目。
+        """
+        # 只取一次快照，更新期间其他线程的修改不会造成条目与账户错位
+        accounts = self.model.snapshot()
+        with metrics.timed("gui.list_rebuild_ms"), trace_span("gui.list_rebuild", "gui", accounts=len(accounts)):
+            self._sync_accounts_list(accounts, rebuild)
+        metrics.set_gauge("model.accounts", len(accounts))
+    
+    def finish_accounts_list(self):
+        """同步构建账户列表中尚未构建的条目"""
+        self.list_builder.finish()
+    
+    def _sync_accounts_list(self, accounts, rebuild):
+        # 未构建的条目直接丢弃，按已构建的部分计算差异
+        self.list_builder.cancel()
+        shown = self._list_accounts[:self.accounts_list.count()]
+        self._list_accounts = accounts
+
+        prefix = suffix = 0
+        if not rebuild:
+            limit = min(len(shown), len(accounts))
+            while prefix < limit and shown[prefix] is accounts[prefix]:
+                prefix += 1
+            while suffix < limit - prefix and shown[-1 - suffix] is accounts[-1 - suffix]:
+                suffix += 1
+        removed = len(shown) - prefix - suffix
+        inserted = len(accounts) - prefix - suffix
+
+        if inserted == 0:
+            # 删除：移除对应条目，后续条目的序号前移
+            for _ in range(removed):
+                self.accounts_list.takeItem(prefix)
+            self._renumber_account_rows(prefix)
+        elif removed == inserted == 1:
+            # 编辑：原位替换条目部件
+            self._make_account_row(self.accounts_list.item(prefix), accounts[prefix], prefix)
+        else:
+            if prefix == 0:
+                self.accounts_list.clear()
+            else:
+                while self.accounts_list.count() > prefix:
+                    self.accounts_list.takeItem(self.accounts_list.count() - 1)
+            self.list_builder.append(accounts[prefix:])
+    
+    def _make_account_row(self, item, account, row):
+        """为账户条目创建部件"""
+        widget = OTPItemWidget(account, row, self)
+        item.setSizeHint(self.accounts_list.row_size(widget))
+        self.accounts_list.setItemWidget(item, widget)
+    
+    def _renumber_account_rows(self, start):
+        """更新 start 之后各条目部件记录的账户序号"""
+        for row in range(start, self.accounts_list.count()):
+            widget = self.accounts_list.itemWidget(self.accounts_list.item(row))
+            if widget:
+                widget.index = row
     
     def update_otp_codes(self):
         """更新所有OTP码"""
@@ -239,11 +349,12 @@ class MainWindow(QMainWindow):
             return
         self._updating_otp = True
         try:
-            for idx in range(self.accounts_list.count()):
-                item = self.accounts_list.item(idx)
-                widget = self.accounts_list.itemWidget(item)
-                if widget:
-                    widget.update_otp()
+            with metrics.timed("gui.tick_ms"), trace_span("gui.tick", "gui"):
+                for idx in range(self.accounts_list.count()):
+                    item = self.accounts_list.item(idx)
+                    widget = self.accounts_list.itemWidget(item)
+                    if widget:
+                        widget.update_otp()
         finally:
             self._updating_otp = False
     
@@ -253,8 +364,6 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             account = dialog.get_account()
             self.model.add_account(account)
-            self.save_accounts()
-            self.update_accounts_list()
     
     def edit_account(self, index):
         """编辑账户"""
@@ -264,8 +373,6 @@ class MainWindow(QMainWindow):
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 edited_account = dialog.get_account()
                 self.model.update_account(index, edited_account)
-                self.save_accounts()
-                self.update_accounts_list()
     
     def delete_account(self, index):
         """删除账户"""
@@ -287,8 +394,6 @@ class MainWindow(QMainWindow):
                 # 应用删除动画
                 def remove_item():
                     self.model.remove_account(index)
-                    self.save_accounts()
-                    self.update_accounts_list()
                 
                 if widget:
                     anim = SlideAnimation.slide_out(widget, direction="left", finished_callback=remove_item)
@@ -298,6 +403,8 @@ class MainWindow(QMainWindow):
     
     def open_settings(self):
         """打开设置对话框"""
+        # 扫描对话框等会直接写入配置文件（如屏幕扫描区域、相机模式），先合并最新配置，避免用旧副本覆盖
+        self.config = {**self.config, **load_config()}
         dialog = SettingsDialog(self.config, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             new_config = dialog.get_settings()
@@ -326,9 +433,9 @@ class MainWindow(QMainWindow):
                     # 设置新的密码哈希
                     new_config["encryption_password_hash"] = hash_password(new_password)
                     
-                    # 如果更改了密码，需要重新加密数据
-                    self.encryption_password = new_password
-                    self.save_accounts()
+                    # 如果更改了密码，需要先用新密码重新加密数据，成功后才保存新的密码哈希
+                    if not self.reencrypt_accounts(new_password):
+                        return
                 elif not encryption_was_on:
                     # 首次启用加密且用户没有输入新密码，阻止保存
                     QMessageBox.warning(self, "警告", "首次启用加密时必须输入新密码。")
@@ -344,12 +451,10 @@ class MainWindow(QMainWindow):
                     QMessageBox.critical(self, "错误", "当前密码不正确")
                     return
 
-                # 清空密码相关信息
-                self.encryption_password = ""
+                # 将数据重新保存为"无密码加密"形式，成功后才清空密码哈希
+                if not self.reencrypt_accounts(""):
+                    return
                 new_config["encryption_password_hash"] = ""
-
-                # 将数据重新保存为"无密码加密"形式，以便后续正常读取
-                self.save_accounts()
             
             # 清除临时密码字段
             if "temp_current_password" in new_config:
@@ -362,14 +467,12 @@ class MainWindow(QMainWindow):
             new_theme = new_config.get("theme", "light")
             
             # 保存新的配置
-            self.config = new_config
-            save_config(self.config)
+            self.config = update_config(new_config)
+            self.update_stall_detector()
             
             # 如果主题改变，应用新主题
             if old_theme != new_theme:
                 self.apply_theme()
-                # 重新创建账户列表部件以应用新主题颜色
-                self.update_accounts_list()
 
             # 更新所有已存在账户项的复制提示显示状态
             auto_copy_enabled = self.config.get("auto_copy", False)
@@ -379,9 +482,43 @@ class MainWindow(QMainWindow):
                 if widget and hasattr(widget, "toggle_copy_hint"):
                     widget.toggle_copy_hint(auto_copy_enabled)
     
-    def save_accounts(self):
-        """保存账户数据，使用加密密码（如果启用）"""
-        save_accounts(self.model.to_list(), self.encryption_password)
+    def save_accounts(self, wait=False):
+        """保存账户数据，使用加密密码（如果启用）
+
+        密钥派生、加密与写入在后台 io 通道串行执行，尚未开始的旧保存任务会被新任务取代；
+        wait 为 True 时等待后台写入结束后同步保存（用于退出前）。
+        """
+        data = self.model.to_list()
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+        if wait:
+            task_runner().wait_idle("io")
+            save_accounts(data, self.encryption_password)
+            return
+        self._save_task = task_runner().submit(
+            save_accounts, data, self.encryption_password,
+            lane="io", on_error=self.on_save_failed
+        )
+    
+    def reencrypt_accounts(self, password):
+        """用新密码同步重新加密并保存账户数据
+
+        必须在写入新的密码哈希之前完成，否则中途退出或保存失败会导致配置与账户库的密钥不一致。
+        失败时恢复原密码并提示，返回 False。
+        """
+        previous = self.encryption_password
+        self.encryption_password = password
+        try:
+            self.save_accounts(wait=True)
+        except Exception as e:
+            self.encryption_password = previous
+            QMessageBox.critical(self, "错误", f"重新加密账户数据失败，设置未保存: {str(e)}")
+            return False
+        return True
+
+    def on_save_failed(self, error):
+        """后台保存失败"""
+        QMessageBox.critical(self, "错误", f"保存账户数据失败: {str(error)}")
     
     def import_accounts(self):
         """导入账户"""
@@ -390,19 +527,15 @@ class MainWindow(QMainWindow):
             imported_accounts = dialog.get_imported_accounts()
             
             if imported_accounts:
-                # 添加导入的账户
-                for account in imported_accounts:
-                    self.model.add_account(account)
-                
-                # 保存并更新界面
-                self.save_accounts()
-                self.update_accounts_list()
+                # 批量添加并跳过已存在的账户，提交时只保存一次、刷新一次界面
+                with trace_span("gui.import_commit", "gui", accounts=len(imported_accounts)):
+                    added = self.model.add_accounts(imported_accounts, skip_duplicates=True)
                 
-                QMessageBox.information(
-                    self, 
-                    "导入成功", 
-                    f"成功导入 {len(imported_accounts)} 个账户"
-                )
+                skipped = len(imported_accounts) - added
+                message = f"成功导入 {added} 个账户"
+                if skipped:
+                    message += f"，跳过 {skipped} 个重复账户"
+                QMessageBox.information(self, "导入成功", message)
     
     def export_accounts(self):
         """导出账户"""
@@ -413,6 +546,15 @@ class MainWindow(QMainWindow):
         dialog = ExportDialog(self.model.get_accounts(), self)
         dialog.exec()
     
+    def show_debug_dialog(self):
+        """显示性能指标调试面板（非模态）"""
+        from gui.debug_dialog import DebugDialog
+        
+        if getattr(self, "debug_dialog", None) is None:
+            self.debug_dialog = DebugDialog(self)
+        self.debug_dialog.show()
+        self.debug_dialog.raise_()
+    
     def show_about(self):
         """显示关于对话框"""
         # 获取Logo路径
@@ -437,10 +579,26 @@ class MainWindow(QMainWindow):
         
         about_box.exec()
     
+    def showEvent(self, event):
+        """窗口显示事件"""
+        super().showEvent(event)
+        if self._shown_at is None and startup_timer.enabled:
+            self._shown_at = time.perf_counter()
+
+    def paintEvent(self, event):
+        """首次绘制完成时结束启动计时"""
+        super().paintEvent(event)
+        if self._shown_at is not None:
+            startup_timer.record("first_paint", self._shown_at)
+            self._shown_at = None
+            startup_timer.finish()
+
     def closeEvent(self, event):
         """窗口关闭事件"""
-        # 保存账户数据
-        self.save_accounts()
+        # 保存账户数据（同步，确保退出前写入完成）
+        self.save_accounts(wait=True)
+        if self.stall_detector is not None:
+            self.stall_detector.stop()
         event.accept()
 
     # 启动动画已禁用
@@ -4,13 +4,82 @@
 import pyperclip
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QPushButton, QProgressBar, QMenu, QSizePolicy
+    QLabel, QMenu, QSizePolicy, QListWidget
 )
-from PyQt6.QtCore import Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QAction, QColor, QFontMetrics
+from PyQt6.QtCore import Qt, QSize, QTimer, QRectF, QEvent
+from PyQt6.QtGui import QFont, QAction, QFontMetrics, QPainter, QPen
 from typing import cast
 from PyQt6.QtWidgets import QListWidgetItem
 
+from gui.theme import theme_color, theme_manager
+
+
+class ThemedLabel(QLabel):
+    """按调色板令牌在绘制时取色的标签，切换主题无需重建"""
+
+    def __init__(self, text="", token="text", parent=None):
+        super().__init__(text, parent)
+        self._token = token
+
+    def set_color_token(self, token):
+        """设置文字颜色令牌"""
+        if token != self._token:
+            self._token = token
+            self.update()
+
+    def color_token(self):
+        return self._token
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(theme_color(self._token))
+        painter.setFont(self.font())
+        flags = self.alignment().value
+        if self.wordWrap():
+            flags |= Qt.TextFlag.TextWordWrap.value
+        painter.drawText(self.contentsRect(), flags, self.text())
+
+
+class CountdownBar(QWidget):
+    """自绘倒计时进度条，颜色在绘制时从调色板读取"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._value = 0
+        self._chunk_token = "success"
+        self.setFixedHeight(6)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+
+    def setValue(self, value):
+        value = max(0, min(100, int(value)))
+        if value != self._value:
+            self._value = value
+            self.update()
+
+    def value(self):
+        return self._value
+
+    def set_chunk_token(self, token):
+        """设置进度块颜色令牌"""
+        if token != self._chunk_token:
+            self._chunk_token = token
+            self.update()
+
+    def sizeHint(self):
+        return QSize(100, 6)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        rect = QRectF(self.rect())
+        painter.setBrush(theme_color("progress_track"))
+        painter.drawRoundedRect(rect, 3, 3)
+        if self._value > 0:
+            chunk = QRectF(rect.x(), rect.y(), rect.width() * self._value / 100, rect.height())
+            painter.setBrush(theme_color(self._chunk_token))
+            painter.drawRoundedRect(chunk, 3, 3)
+
 
 class OTPItemWidget(QWidget):
     """OTP项目部件，显示单个OTP账户信息"""
@@ -27,27 +96,8 @@ class OTPItemWidget(QWidget):
     
     def init_ui(self):
         """初始化UI"""
-        # 根据主窗口配置确定当前主题
+        # 颜色均在绘制时从主题调色板读取，此处只搭建布局
         self.setObjectName("otpItem")
-        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
-
-        self.dark_mode = (
-            getattr(self.main_window, "config", {}).get("theme", "light") == "dark"
-        )
-
-        base_bg = "#3d3d3d" if self.dark_mode else "white"
-        border_normal = "#505050" if self.dark_mode else "#e0e0e0"
-
-        # 设置初始样式
-        self.setStyleSheet(
-            f"""
-            QWidget#otpItem {{
-                background-color: {base_bg};
-                border-radius: 8px;
-                border: 1px solid {border_normal};
-            }}
-        """
-        )
         
         # 主布局
         main_layout = QVBoxLayout(self)
@@ -60,21 +110,17 @@ class OTPItemWidget(QWidget):
         account_layout = QVBoxLayout()
         
         # 账户名称
-        self.name_label = QLabel(self.account.name)
+        self.name_label = ThemedLabel(self.account.name, "text")
         self.name_label.setFont(QFont("Noto Sans CJK SC", 11, QFont.Weight.Bold))
-        if self.dark_mode:
-            self.name_label.setStyleSheet("color: #f0f0f0;")
         account_layout.addWidget(self.name_label)
         
         # 发行方
         if self.account.issuer:
-            self.issuer_label = QLabel(self.account.issuer)
+            self.issuer_label = ThemedLabel(self.account.issuer, "text_secondary")
             self.issuer_label.setFont(QFont("Noto Sans CJK SC", 9))
             self.issuer_label.setWordWrap(True)
             self.issuer_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
             self.issuer_label.setToolTip(self.account.issuer)
-            issuer_color = "#b0b0b0" if self.dark_mode else "#707070"
-            self.issuer_label.setStyleSheet(f"color: {issuer_color};")
             account_layout.addWidget(self.issuer_label)
         
         info_layout.addLayout(account_layout)
@@ -84,20 +130,19 @@ class OTPItemWidget(QWidget):
         otp_layout = QVBoxLayout()
         otp_layout.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
         
-        self.otp_label = QLabel()
+        self.otp_label = ThemedLabel("", "otp")
         self.otp_label.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         self.otp_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
         self.otp_label.setCursor(Qt.CursorShape.PointingHandCursor)
         self.otp_label.mousePressEvent = self.copy_otp
-        otp_color = "#90CAF9" if self.dark_mode else "#2979FF"
-        self.otp_label.setStyleSheet(f"color: {otp_color};")
         otp_layout.addWidget(self.otp_label)
         
         # 添加"点击复制"提示文本
-        self.copy_hint = QLabel("点击复制")
+        self.copy_hint = ThemedLabel("点击复制", "text_hint")
         self.copy_hint.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        hint_color = "#c0c0c0" if self.dark_mode else "#909090"
-        self.copy_hint.setStyleSheet(f"color: {hint_color}; font-size: 8pt;")
+        hint_font = self.copy_hint.font()
+        hint_font.setPointSize(8)
+        self.copy_hint.setFont(hint_font)
         otp_layout.addWidget(self.copy_hint)
         
         info_layout.addLayout(otp_layout)
@@ -107,28 +152,12 @@ class OTPItemWidget(QWidget):
         # 进度条和计时器
         progress_layout = QHBoxLayout()
         
-        self.timer_label = QLabel()
-        timer_color = "#c0c0c0" if self.dark_mode else "#707070"
-        self.timer_label.setStyleSheet(f"color: {timer_color};")
+        self.timer_label = ThemedLabel("", "text_muted")
+        self.timer_font = self.timer_label.font()
         progress_layout.addWidget(self.timer_label)
         
         # 进度条
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setTextVisible(False)
-        self.progress_bar.setMaximumHeight(6)
-        pg_bg = "#505050" if self.dark_mode else "#f0f0f0"
-        self.progress_bar.setStyleSheet(
-            f"""
-            QProgressBar {{
-                background-color: {pg_bg};
-                border: none;
-                border-radius: 3px;
-            }}
-            QProgressBar::chunk {{
-                border-radius: 3px;
-            }}
-        """
-        )
+        self.progress_bar = CountdownBar()
         progress_layout.addWidget(self.progress_bar)
         
         main_layout.addLayout(progress_layout)
@@ -145,6 +174,16 @@ class OTPItemWidget(QWidget):
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
     
+    def paintEvent(self, event):
+        """绘制卡片背景与边框，颜色取自当前主题"""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        pen = QPen(theme_color("border_hover" if self._hover_in else "border"))
+        pen.setWidth(1)
+        painter.setPen(pen)
+        painter.setBrush(theme_color("surface"))
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+    
     # 阴影效果已移除
     def setup_effects(self):
         pass
@@ -160,39 +199,13 @@ class OTPItemWidget(QWidget):
         super().leaveEvent(event)
     
     def animate_hover(self, hover_in):
-        """悬停动画"""
-        base_bg = "#3d3d3d" if self.dark_mode else "white"
-        border_hover = "#707070" if self.dark_mode else "#d0d0d0"
-        border_normal = "#505050" if self.dark_mode else "#e0e0e0"
-
-        if hover_in and not self._hover_in:
-            self._hover_in = True
-            self.setStyleSheet(
-                f"""
-                QWidget#otpItem {{
-                    background-color: {base_bg};
-                    border-radius: 8px;
-                    border: 1px solid {border_hover};
-                }}
-            """
-            )
-        elif (not hover_in) and self._hover_in:
-            self._hover_in = False
-            self.setStyleSheet(
-                f"""
-                QWidget#otpItem {{
-                    background-color: {base_bg};
-                    border-radius: 8px;
-                    border: 1px solid {border_normal};
-                }}
-            """
-            )
+        """悬停效果：仅切换状态并重绘边框"""
+        if hover_in != self._hover_in:
+            self._hover_in = hover_in
+            self.update()
     
     def update_otp(self):
         """更新OTP码"""
-        # 根据主题确定进度条背景色
-        pg_bg = "#505050" if self.dark_mode else "#f0f0f0"
-
         # 获取当前OTP码
         otp = self.account.get_otp()
         
@@ -220,49 +233,20 @@ class OTPItemWidget(QWidget):
         if not show_seconds:
             return
         
-        # 根据剩余时间仅在必要时更新样式，避免频繁调用setStyleSheet
-        if remaining <= 5 and getattr(self, '_last_style', '') != 'danger':
-            self.progress_bar.setStyleSheet(f"""
-                QProgressBar {{
-                    background-color: {pg_bg};
-                    border: none;
-                    border-radius: 3px;
-                }}
-                QProgressBar::chunk {{
-                    background-color: #FF5252;
-                    border-radius: 3px;
-                }}
-            """)
-            self.timer_label.setStyleSheet("color: #FF5252; font-weight: bold;")
-            self._last_style = 'danger'
-        elif 5 < remaining <= 10 and getattr(self, '_last_style', '') != 'warning':
-            self.progress_bar.setStyleSheet(f"""
-                QProgressBar {{
-                    background-color: {pg_bg};
-                    border: none;
-                    border-radius: 3px;
-                }}
-                QProgressBar::chunk {{
-                    background-color: #FFD740;
-                    border-radius: 3px;
-                }}
-            """)
-            self.timer_label.setStyleSheet("color: #FFB300;")
-            self._last_style = 'warning'
-        elif remaining > 10 and getattr(self, '_last_style', '') != 'normal':
-            self.progress_bar.setStyleSheet(f"""
-                QProgressBar {{
-                    background-color: {pg_bg};
-                    border: none;
-                    border-radius: 3px;
-                }}
-                QProgressBar::chunk {{
-                    background-color: #4CAF50;
-                    border-radius: 3px;
-                }}
-            """)
-            self.timer_label.setStyleSheet("color: #707070;")
-            self._last_style = 'normal'
+        # 根据剩余时间仅在状态变化时切换颜色令牌
+        if remaining <= 5:
+            state, chunk_token, text_token = 'danger', "danger", "danger"
+        elif remaining <= 10:
+            state, chunk_token, text_token = 'warning', "warning", "warning_text"
+        else:
+            state, chunk_token, text_token = 'normal', "success", "text_muted"
+
+        if getattr(self, '_last_style', '') != state:
+            self.progress_bar.set_chunk_token(chunk_token)
+            self.timer_label.set_color_token(text_token)
+            self.timer_font.setBold(state == 'danger')
+            self.timer_label.setFont(self.timer_font)
+            self._last_style = state
 
         # 根据当前配置设置复制提示可见性
         auto_copy_enabled = getattr(self.main_window, "config", {}).get("auto_copy", False)
@@ -279,11 +263,10 @@ class OTPItemWidget(QWidget):
             pyperclip.copy(otp)
             
             # 添加复制成功的视觉反馈
-            original_style = self.otp_label.styleSheet()
-            self.otp_label.setStyleSheet("color: #4CAF50; font-weight: bold;")
+            self.otp_label.set_color_token("success")
             
-            # 1 秒后恢复原来的样式
-            QTimer.singleShot(1000, lambda: self.otp_label.setStyleSheet(original_style))
+            # 1 秒后恢复原来的颜色
+            QTimer.singleShot(1000, lambda: self.otp_label.set_color_token("otp"))
             
         except Exception:
             pass
@@ -304,41 +287,7 @@ class OTPItemWidget(QWidget):
     def show_context_menu(self, position):
         """显示上下文菜单"""
         menu = QMenu(self)
-
-        if self.dark_mode:
-            menu.setStyleSheet("""
-                QMenu {
-                    background-color: #3d3d3d;
-                    border: 1px solid #505050;
-                    border-radius: 4px;
-                    padding: 5px;
-                    color: #f0f0f0;
-                }
-                QMenu::item {
-                    padding: 5px 25px 5px 20px;
-                    border-radius: 3px;
-                    color: #f0f0f0;
-                }
-                QMenu::item:selected {
-                    background-color: #505050;
-                }
-            """)
-        else:
-            menu.setStyleSheet("""
-                QMenu {
-                    background-color: white;
-                    border: 1px solid #e0e0e0;
-                    border-radius: 4px;
-                    padding: 5px;
-                }
-                QMenu::item {
-                    padding: 5px 25px 5px 20px;
-                    border-radius: 3px;
-                }
-                QMenu::item:selected {
-                    background-color: #f0f0f0;
-                }
-            """)
+        menu.setStyleSheet(theme_manager().context_menu_stylesheet())
         
         if self.main_window is not None:
             edit_action = QAction("编辑", self)
@@ -352,35 +301,122 @@ class OTPItemWidget(QWidget):
         menu.exec(self.mapToGlobal(position))
     
     def sizeHint(self):
-        """根据 issuer 文本长度动态增加高度，避免裁剪"""
-        base_height = 90
+        """根据 issuer 文本换行后的行数动态增加高度，避免裁剪"""
+        accounts_list = getattr(self.main_window, "accounts_list", None)
+        if isinstance(accounts_list, AccountListWidget):
+            return accounts_list.row_size(self)
+        return QSize(DEFAULT_ROW_WIDTH, self.row_height(DEFAULT_ROW_WIDTH))
 
-        if self.account.issuer:
-            metrics = QFontMetrics(self.issuer_label.font())
-            # OTP 区域预估宽度 140，边距约 40
-            available_width = 380 - 140
-            text_width = metrics.horizontalAdvance(self.account.issuer)
-            lines = max(1, int(text_width / available_width) + 1)
-            extra_height = (lines - 1) * metrics.lineSpacing()
-        else:
-            extra_height = 0
-
-        total_height = base_height + extra_height
-        return QSize(380, total_height)
-
-    def refresh_list_item_size(self):
-        """刷新所属 QListWidgetItem 的 sizeHint"""
-        if self.main_window and self.main_window.accounts_list:
-            for i in range(self.main_window.accounts_list.count()):
-                item = self.main_window.accounts_list.item(i)
-                if self.main_window.accounts_list.itemWidget(item) is self:
-                    item.setSizeHint(self.sizeHint())  # type: ignore[arg-type]
-                    # 通知自身重新布局
-                    self.updateGeometry()
-                    break
-
-    # 当宽度变化时重新计算高度，确保文本不会被进度条遮挡
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        # 异步调用，确保布局完成后再刷新尺寸
-        QTimer.singleShot(0, self.refresh_list_item_size) 
\ No newline at end of file
+    def row_height(self, width, cache=None):
+        """计算给定宽度下的行高；cache 通常为所属列表的行高缓存，未提供时不缓存"""
+        if not self.account.issuer:
+            return RowHeightCache.BASE_HEIGHT
+        if cache is None:
+            cache = RowHeightCache()
+        return cache.height(self.account.issuer, width, self.issuer_label.font())
+
+
+# 未挂到列表时使用的默认行宽
+DEFAULT_ROW_WIDTH = 380
+
+
+class RowHeightCache:
+    """账户条目行高缓存，键为 (issuer 文本, 字体)
+
+    只保存当前宽度下的行高，宽度或字体变化时失效，条目数不超过列表中不同 issuer 的数量。
+    """
+
+    BASE_HEIGHT = 90
+    # OTP 区域预估宽度 140（含边距）
+    OTP_AREA_WIDTH = 140
+
+    def __init__(self):
+        self._heights = {}
+        self._metrics = {}
+        self._width = None
+
+    def set_width(self, width):
+        """宽度变化时清空缓存，返回宽度是否发生变化"""
+        if width == self._width:
+            return False
+        self._width = width
+        self._heights.clear()
+        return True
+
+    def clear(self):
+        """字体变化时清空全部缓存"""
+        self._heights.clear()
+        self._metrics.clear()
+
+    def height(self, issuer, width, font):
+        """获取 issuer 文本在给定宽度与字体下的行高"""
+        self.set_width(width)
+        font_key = font.key()
+        key = (issuer, font_key)
+        height = self._heights.get(key)
+        if height is None:
+            metrics = self._metrics.get(font_key)
+            if metrics is None:
+                metrics = QFontMetrics(font)
+                self._metrics[font_key] = metrics
+            text_width = max(1, width - self.OTP_AREA_WIDTH)
+            rect = metrics.boundingRect(0, 0, text_width, 1 << 20, Qt.TextFlag.TextWordWrap.value, issuer)
+            line_spacing = max(1, metrics.lineSpacing())
+            lines = max(1, round(rect.height() / line_spacing))
+            height = self.BASE_HEIGHT + (lines - 1) * line_spacing
+            self._heights[key] = height
+        return height
+
+
+
+class AccountListWidget(QListWidget):
+    """账户列表，宽度或字体变化时一次性批量刷新所有行高"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.row_cache = RowHeightCache()
+        # 上次批量刷新时使用的行宽
+        self._laid_out_width = None
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.timeout.connect(self.relayout_rows)
+
+    def row_width(self):
+        """当前视口下单行可用宽度"""
+        width = self.viewport().width() - 2 * self.spacing()
+        return width if width > 0 else DEFAULT_ROW_WIDTH
+
+    def row_size(self, widget):
+        """计算条目部件在当前宽度下的尺寸"""
+        width = self.row_width()
+        return QSize(width, widget.row_height(width, self.row_cache))
+
+    def relayout_rows(self):
+        """批量刷新所有行高，仅在尺寸变化时更新"""
+        width = self.row_width()
+        self._laid_out_width = width
+        self.row_cache.set_width(width)
+        self.setUpdatesEnabled(False)
+        try:
+            for i in range(self.count()):
+                item = self.item(i)
+                widget = self.itemWidget(item)
+                if widget is None:
+                    continue
+                size = QSize(width, widget.row_height(width, self.row_cache))
+                if item.sizeHint() != size:
+                    item.setSizeHint(size)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def viewportEvent(self, event):
+        # 视口尺寸还会随滚动条出现/消失而变化，以视口宽度为准；多次 resize 合并为一次刷新
+        if event.type() == QEvent.Type.Resize and self.row_width() != self._laid_out_width:
+            self._relayout_timer.start(0)
+        return super().viewportEvent(event)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.FontChange:
+            self.row_cache.clear()
+            self._relayout_timer.start(0)
@@ -1,17 +1,136 @@
 import sys
-import cv2
 from typing import List, Optional
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget,
-    QListWidgetItem, QComboBox, QMessageBox, QFileDialog, QApplication
+    QListWidgetItem, QComboBox, QMessageBox, QFileDialog, QApplication, QCheckBox
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QRect
 from PyQt6.QtGui import QImage, QPixmap, QGuiApplication
 from PIL import Image
-import numpy as np
 
-from utils.qr_utils import decode_qr_from_image
+from utils.qr_utils import decode_qr_from_image, to_luminance, parse_otp_uri, RawImage
+from utils.tiled_scan import Capture, scan
+from utils.screen_watch import ChangeDetector
+from utils.metrics import metrics
+from utils.config import load_config, update_config
+from gui.tasks import task_runner
+from gui.camera_pipeline import CameraPipeline
+from gui import camera_devices
+from gui.camera_modes import CAPTURE_PRESETS, DEFAULT_PRESET, benchmark_modes
+from gui.region_selector import RegionSelector, window_rect_at
+
+# 监视模式的抓屏间隔（毫秒）
+WATCH_INTERVAL_MS = 1000
+# 选择区域后等待遮罩从屏幕上消失再抓屏（毫秒）
+REGION_GRAB_DELAY_MS = 150
+
+
+# 小端机器上内存布局为 BGRA 的 32 位格式，截图通常就是其中之一
+_BGRA_FORMATS = (
+    QImage.Format.Format_RGB32,
+    QImage.Format.Format_ARGB32,
+    QImage.Format.Format_ARGB32_Premultiplied,
+)
+
+
+def qimage_to_raw(qimage):
+    """以 RawImage 形式直接引用 QImage 的像素缓冲区（不再经过 PIL）
+
+    截图常见的 32 位格式直接按 BGRA 引用，灰度图直接引用，其他格式先转换为 RGB32。
+    返回的 RawImage 引用 QImage 的内存，使用期间需保持返回的 QImage 存活。
+    """
+    fmt = qimage.format()
+    if fmt == QImage.Format.Format_Grayscale8:
+        pixel_format = "gray"
+    elif fmt in _BGRA_FORMATS and sys.byteorder == "little":
+        pixel_format = "bgra"
+    elif sys.byteorder == "little":
+        qimage = qimage.convertToFormat(QImage.Format.Format_RGB32)
+        pixel_format = "bgra"
+    else:
+        qimage = qimage.convertToFormat(QImage.Format.Format_Grayscale8)
+        pixel_format = "gray"
+
+    ptr = qimage.constBits()
+    size = qimage.sizeInBytes()
+
+    # PyQt6 需要 setsize()，PySide6 无此方法但已实现缓冲区协议
+    if hasattr(ptr, "setsize"):
+        ptr.setsize(size)
+
+    return qimage, RawImage(ptr, qimage.width(), qimage.height(), qimage.bytesPerLine(), pixel_format)
+
+
+def scan_screen_images(shots):
+    """识别屏幕截图（在后台线程执行）；多个屏幕的大截图分块并行识别，其余在当前进程内识别
+
+    Args:
+        shots: (QImage, 屏幕左上角逻辑坐标 (x, y), 设备像素比) 列表。
+    Returns:
+        (data, rect) 列表，rect 为虚拟桌面中的逻辑坐标。
+    """
+    images = []
+    captures = []
+    for qimage, origin, ratio in shots:
+        qimage, raw = qimage_to_raw(qimage)
+        images.append(qimage)  # 灰度数组可能直接引用 QImage 的缓冲区，识别完成前需保持存活
+        captures.append(Capture(to_luminance(raw), origin, ratio))
+    return scan(captures)
+
+
+def watch_screen_images(shots, detectors):
+    """监视模式：只识别与上一次截图相比发生变化的区域（在后台线程执行）
+
+    Args:
+        shots: 同 scan_screen_images。
+        detectors: 每个屏幕的 ChangeDetector，按屏幕左上角坐标索引。
+    """
+    images = []
+    captures = []
+    for qimage, origin, ratio in shots:
+        qimage, raw = qimage_to_raw(qimage)
+        gray = to_luminance(raw)
+        region = detectors.setdefault(origin, ChangeDetector()).update(gray)
+        metrics.count("screen.watch_frames")
+        if region is None:
+            metrics.count("screen.watch_unchanged")
+            continue
+        images.append(qimage)
+        x, y, w, h = region
+        captures.append(Capture(
+            gray[y:y + h, x:x + w],
+            (origin[0] + int(round(x / ratio)), origin[1] + int(round(y / ratio))),
+            ratio,
+        ))
+    if not captures:
+        return []
+    return scan(captures)
+
+
+def load_scan_region():
+    """读取上次选定的屏幕扫描区域"""
+    region = load_config().get("screen_scan_region")
+    if region and len(region) == 4:
+        rect = QRect(*region)
+        if rect.isValid():
+            return rect
+    return None
+
+
+def save_scan_region(rect):
+    """记住选定的屏幕扫描区域"""
+    try:
+        update_config({"screen_scan_region": [rect.x(), rect.y(), rect.width(), rect.height()]})
+    except OSError:
+        pass  # 记不住区域不影响本次扫描
+
+
+def decode_image_file(file_path):
+    """打开图片文件并解码二维码（在后台线程执行）"""
+    with Image.open(file_path) as pil_img:
+        pil_img.load()
+        return decode_qr_from_image(pil_img)
 
 
 class CameraScanDialog(QDialog):
@@ -20,13 +139,19 @@ class CameraScanDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("相机扫描二维码")
-        self.cap = None
-        self.timer = None
+        self.pipeline: Optional[CameraPipeline] = None
+        self.benchmark_task = None
+        self.devices = {}
         self.detected_codes: List[str] = []
         self.selected_data: Optional[str] = None
 
         self.init_ui()
-        self.enumerate_cameras()
+        # 已枚举过时直接使用缓存，对话框立即可用
+        cached = camera_devices.cached_cameras()
+        if cached is None:
+            self.enumerate_cameras()
+        else:
+            self.on_cameras_found(cached)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -36,10 +161,34 @@ class CameraScanDialog(QDialog):
         self.camera_combo = QComboBox()
         combo_layout.addWidget(QLabel("选择相机:"))
         combo_layout.addWidget(self.camera_combo)
+        self.refresh_btn = QPushButton("刷新")
+        self.refresh_btn.setToolTip("重新检测相机")
+        self.refresh_btn.clicked.connect(lambda: self.enumerate_cameras(refresh=True))
+        combo_layout.addWidget(self.refresh_btn)
         self.open_btn = QPushButton("开始扫描")
         self.open_btn.clicked.connect(self.start_scanning)
         combo_layout.addWidget(self.open_btn)
         layout.addLayout(combo_layout)
+        self.camera_combo.currentIndexChanged.connect(self.on_camera_changed)
+
+        # 采集模式
+        config = load_config()
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("采集模式:"))
+        self.mode_combo = QComboBox()
+        for key, (label, _settings) in CAPTURE_PRESETS.items():
+            self.mode_combo.addItem(label, key)
+        mode_layout.addWidget(self.mode_combo)
+        self.gray_check = QCheckBox("灰度识别")
+        self.gray_check.setToolTip("只取亮度识别，跳过对大部分帧的彩色转换")
+        self.gray_check.setChecked(config.get("camera_grayscale", True))
+        mode_layout.addWidget(self.gray_check)
+        self.bench_btn = QPushButton("测试最佳模式")
+        self.bench_btn.setToolTip("依次测试各采集模式，选择识别延迟最低的模式")
+        self.bench_btn.clicked.connect(self.benchmark_camera)
+        self.bench_btn.setEnabled(False)
+        mode_layout.addWidget(self.bench_btn)
+        layout.addLayout(mode_layout)
 
         # 预览区域
         self.video_label = QLabel("无视频信号")
@@ -54,6 +203,10 @@ class CameraScanDialog(QDialog):
 
         # 确定/取消
         btn_layout = QHBoxLayout()
+        self.auto_accept_check = QCheckBox("自动确定")
+        self.auto_accept_check.setToolTip("稳定识别到唯一的 otpauth 二维码时自动完成")
+        self.auto_accept_check.setChecked(True)
+        btn_layout.addWidget(self.auto_accept_check)
         self.ok_btn = QPushButton("确定")
         self.ok_btn.clicked.connect(self.finish_selection)
         self.ok_btn.setEnabled(False)
@@ -63,17 +216,105 @@ class CameraScanDialog(QDialog):
         btn_layout.addWidget(cancel_btn)
         layout.addLayout(btn_layout)
 
-    def enumerate_cameras(self):
-        """尝试检测前几个索引的相机"""
+    def enumerate_cameras(self, refresh=False):
+        """在后台检测可用相机，避免打开对话框时卡顿"""
+        self.camera_combo.clear()
+        self.camera_combo.addItem("正在检测相机...", -1)
+        self.open_btn.setEnabled(False)
+        self.refresh_btn.setEnabled(False)
+        # 枚举可能耗时数秒（DirectShow 逐个打开索引），不占用串行的 io 写入通道
+        task_runner().submit(
+            camera_devices.list_cameras, refresh,
+            on_result=self.on_cameras_found, on_error=self.on_enumerate_failed
+        )
+
+    def on_cameras_found(self, devices):
+        """相机检测完成"""
+        self.refresh_btn.setEnabled(True)
+        self.devices = {device.index: device for device in devices}
         self.camera_combo.clear()
-        for idx in range(5):  # 测试前5个索引
-            cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)  # CAP_DSHOW提升在Windows中的速度
-            if cap and cap.isOpened():
-                self.camera_combo.addItem(f"相机 {idx}", idx)
-                cap.release()
+        for device in devices:
+            self.camera_combo.addItem(f"{device.index}: {device.name}", device.index)
         if self.camera_combo.count() == 0:
             self.camera_combo.addItem("无可用相机", -1)
             self.open_btn.setEnabled(False)
+            self.bench_btn.setEnabled(False)
+        else:
+            self.open_btn.setEnabled(True)
+            self.bench_btn.setEnabled(True)
+
+    def current_device(self):
+        return self.devices.get(self.camera_combo.currentData())
+
+    def on_camera_changed(self, *args):
+        """切换相机时选中该相机上次使用的采集模式"""
+        device = self.current_device()
+        if device is None:
+            return
+        key = load_config().get("camera_modes", {}).get(device.name, DEFAULT_PRESET)
+        idx = self.mode_combo.findData(key)
+        self.mode_combo.setCurrentIndex(idx if idx >= 0 else self.mode_combo.findData(DEFAULT_PRESET))
+
+    def remember_mode(self, device, key):
+        """记住相机的采集模式与灰度识别设置"""
+        modes = dict(load_config().get("camera_modes", {}))
+        modes[device.name] = key
+        try:
+            update_config({"camera_modes": modes, "camera_grayscale": self.gray_check.isChecked()})
+        except OSError:
+            pass
+
+    def benchmark_camera(self):
+        """在后台测试当前相机的各采集模式"""
+        device = self.current_device()
+        if device is None:
+            return
+        self.stop_scanning()  # 测试需要独占相机
+        for widget in (self.open_btn, self.bench_btn, self.refresh_btn, self.camera_combo, self.mode_combo):
+            widget.setEnabled(False)
+        self.video_label.setText("正在测试采集模式...")
+        # 测试耗时数十秒，放在 cpu 通道，不阻塞 io 通道上的保存；关闭对话框时取消
+        self.benchmark_task = task_runner().submit(
+            benchmark_modes, device.index, device.api, grayscale=self.gray_check.isChecked(),
+            pass_task=True, on_result=self.on_benchmark_done, on_error=self.on_benchmark_failed
+        )
+
+    def _benchmark_finished(self):
+        self.benchmark_task = None
+        for widget in (self.open_btn, self.bench_btn, self.refresh_btn, self.camera_combo, self.mode_combo):
+            widget.setEnabled(True)
+        self.video_label.setText("无视频信号")
+
+    def on_benchmark_done(self, outcome):
+        self._benchmark_finished()
+        best, results = outcome
+        lines = []
+        for r in results:
+            label = CAPTURE_PRESETS[r["preset"]][0]
+            if "error" in r:
+                lines.append(f"{label}: {r['error']}")
+            else:
+                lines.append(
+                    f"{label}: 实际 {r['width']}x{r['height']} {r['fourcc']} {r['fps']:.0f}fps，"
+                    f"转换 {r['convert_ms']:.1f}ms，识别 {r['decode_ms']:.1f}ms，延迟 {r['latency_ms']:.0f}ms"
+                )
+        device = self.current_device()
+        if best is not None and device is not None:
+            self.mode_combo.setCurrentIndex(self.mode_combo.findData(best))
+            self.remember_mode(device, best)
+            lines.append(f"\n已选择: {CAPTURE_PRESETS[best][0]}")
+        else:
+            lines.append("\n没有可用的采集模式")
+        QMessageBox.information(self, "采集模式测试", "\n".join(lines))
+
+    def on_benchmark_failed(self, e):
+        self._benchmark_finished()
+        QMessageBox.critical(self, "错误", f"测试采集模式失败: {str(e)}")
+
+    def on_enumerate_failed(self, e):
+        """相机检测出错"""
+        self.on_cameras_found([])
+        QMessageBox.critical(self, "错误", f"检测相机失败: {str(e)}")
 
     def start_scanning(self):
         cam_idx = self.camera_combo.currentData()
@@ -81,48 +322,53 @@ class CameraScanDialog(QDialog):
             QMessageBox.warning(self, "警告", "未选择有效的相机")
             return
 
-        # 打开摄像头
-        if self.cap:
-            self.cap.release()
-        self.cap = cv2.VideoCapture(int(cam_idx), cv2.CAP_DSHOW)
-        if not self.cap.isOpened():
-            QMessageBox.critical(self, "错误", "无法打开该相机")
-            return
-
-        # 创建定时器读取帧
-        if not self.timer:
-            self.timer = QTimer(self)
-            self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
+        # 采集与解码在独立线程中进行，GUI 线程只负责显示
+        self.stop_scanning()
+        key = self.mode_combo.currentData()
+        device = self.current_device()
+        if device is not None:
+            self.remember_mode(device, key)
+        self.pipeline = CameraPipeline(
+            int(cam_idx), camera_devices.capture_api(),
+            settings=CAPTURE_PRESETS[key][1],
+            grayscale=self.gray_check.isChecked(),
+            preview_height=int(self.video_label.height() * self.devicePixelRatioF()),
+        )
+        self.pipeline.signals.frame_ready.connect(self.show_frame)
+        self.pipeline.signals.codes_decoded.connect(self.on_codes_decoded)
+        self.pipeline.signals.error.connect(self.on_camera_error)
+        self.pipeline.start()
         self.open_btn.setEnabled(False)
 
-    def update_frame(self):
-        if not self.cap:
-            return
-        ret, frame = self.cap.read()
-        if not ret:
-            return
-
-        # 检测二维码
-        decoded_list = []
-        try:
-            decoded = decode_qr_from_image(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
-            decoded_list = [d[0] for d in decoded]
-        except Exception:
-            pass
-
-        if decoded_list and decoded_list != self.detected_codes:
-            self.detected_codes = decoded_list
-            self.populate_codes(decoded_list)
+    def stop_scanning(self):
+        """停止当前相机流水线"""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
 
-        # 显示视频
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = frame_rgb.shape
-        bytes_per_line = ch * w
-        qimg = QImage(frame_rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+    def show_frame(self, qimg):
+        """显示预览帧"""
         self.video_label.setPixmap(QPixmap.fromImage(qimg).scaled(
             self.video_label.width(), self.video_label.height(), Qt.AspectRatioMode.KeepAspectRatio))
 
+    def on_codes_decoded(self, codes):
+        """解码线程确认了新的结果（已在连续多帧中保持一致）"""
+        if codes and codes != self.detected_codes:
+            self.detected_codes = codes
+            self.populate_codes(codes)
+            otp_codes = [c for c in codes if parse_otp_uri(c)]
+            if self.auto_accept_check.isChecked() and len(otp_codes) == 1:
+                self.selected_data = otp_codes[0]
+                self.accept()
+
+    def on_camera_error(self, message):
+        """相机打开或读取失败"""
+        self.stop_scanning()
+        # 相机可能已被拔出，下次打开对话框时重新检测
+        camera_devices.invalidate()
+        self.open_btn.setEnabled(True)
+        QMessageBox.critical(self, "错误", message)
+
     def populate_codes(self, codes: List[str]):
         self.codes_list.clear()
         for c in codes:
@@ -140,12 +386,13 @@ class CameraScanDialog(QDialog):
     def get_selected_data(self):
         return self.selected_data
 
-    def closeEvent(self, event):
-        if self.timer and self.timer.isActive():
-            self.timer.stop()
-        if self.cap:
-            self.cap.release()
-        super().closeEvent(event)
+    def done(self, result):
+        # accept / reject / 关闭窗口都会经过这里，确保相机被释放
+        if self.benchmark_task is not None:
+            self.benchmark_task.cancel()
+            self.benchmark_task = None
+        self.stop_scanning()
+        super().done(result)
 
 
 class ScreenScanDialog(QDialog):
@@ -155,6 +402,13 @@ class ScreenScanDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("屏幕扫描二维码")
         self.selected_data: Optional[str] = None
+        self._detectors = {}
+        self._watch_busy = False
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setInterval(WATCH_INTERVAL_MS)
+        self.watch_timer.timeout.connect(self.watch_tick)
+        self.region: Optional[QRect] = load_scan_region()
+        self._selector: Optional[RegionSelector] = None
         self.init_ui()
 
     def init_ui(self):
@@ -163,12 +417,25 @@ class ScreenScanDialog(QDialog):
         screen_layout = QHBoxLayout()
         screen_layout.addWidget(QLabel("选择屏幕:"))
         self.screen_combo = QComboBox()
-        for idx, s in enumerate(QGuiApplication.screens()):
+        screens = QGuiApplication.screens()
+        for idx, s in enumerate(screens):
             self.screen_combo.addItem(f"屏幕 {idx + 1} ({s.name()})", idx)
+        if len(screens) > 1:
+            self.screen_combo.addItem("全部屏幕", "all")
+        if self.region is not None:
+            self.update_region_item()
         screen_layout.addWidget(self.screen_combo)
+        self.region_btn = QPushButton("选择区域...")
+        self.region_btn.setToolTip("框选区域或单击窗口，只截取并识别该区域")
+        self.region_btn.clicked.connect(self.select_region)
+        screen_layout.addWidget(self.region_btn)
         self.scan_btn = QPushButton("扫描")
         self.scan_btn.clicked.connect(self.scan_screen)
         screen_layout.addWidget(self.scan_btn)
+        self.watch_check = QCheckBox("持续监视")
+        self.watch_check.setToolTip("定时截屏，画面变化时识别，发现 otpauth 二维码后自动停止")
+        self.watch_check.toggled.connect(self.set_watching)
+        screen_layout.addWidget(self.watch_check)
         layout.addLayout(screen_layout)
 
         self.image_label = QLabel()
@@ -190,38 +457,178 @@ class ScreenScanDialog(QDialog):
         btn_layout.addWidget(cancel_btn)
         layout.addLayout(btn_layout)
 
-    def scan_screen(self):
+    def grab_screens(self):
+        """抓取所选屏幕（须在 GUI 线程），显示预览并返回截图列表；失败时提示并返回 None"""
         idx = self.screen_combo.currentData()
         screens = QGuiApplication.screens()
-        if idx is None or idx >= len(screens):
+        if idx == "region":
+            return self.grab_region(self.region)
+        if idx == "all":
+            targets = screens
+        elif idx is None or idx >= len(screens):
             QMessageBox.warning(self, "警告", "屏幕选择无效")
+            return None
+        else:
+            targets = [screens[idx]]
+
+        shots = []
+        for screen in targets:
+            pixmap = screen.grabWindow(0)
+            if pixmap.isNull():
+                QMessageBox.critical(self, "错误", f"无法抓取屏幕图像: {screen.name()}")
+                return None
+            origin = screen.geometry().topLeft()
+            shots.append((pixmap.toImage(), (origin.x(), origin.y()), pixmap.devicePixelRatio()))
+        self.show_preview(shots)
+        return shots
+
+    def grab_region(self, region):
+        """只抓取区域与各屏幕相交的部分"""
+        shots = []
+        for screen in QGuiApplication.screens():
+            geometry = screen.geometry()
+            part = geometry.intersected(region)
+            if part.isEmpty():
+                continue
+            local = part.translated(-geometry.topLeft())
+            pixmap = screen.grabWindow(0, local.x(), local.y(), local.width(), local.height())
+            if pixmap.isNull():
+                QMessageBox.critical(self, "错误", f"无法抓取屏幕图像: {screen.name()}")
+                return None
+            shots.append((pixmap.toImage(), (part.x(), part.y()), pixmap.devicePixelRatio()))
+        if not shots:
+            QMessageBox.warning(self, "警告", "选定的区域不在任何屏幕内，请重新选择")
+            return None
+        self.show_preview(shots)
+        return shots
+
+    def show_preview(self, shots):
+        """显示截图（多张时显示第一张）"""
+        self.image_label.setPixmap(QPixmap.fromImage(shots[0][0]).scaled(
+            self.image_label.width(), self.image_label.height(), Qt.AspectRatioMode.KeepAspectRatio))
+
+    def update_region_item(self):
+        """在屏幕列表中添加或更新“选定区域”并选中"""
+        text = f"选定区域 ({self.region.width()}x{self.region.height()})"
+        idx = self.screen_combo.findData("region")
+        if idx < 0:
+            self.screen_combo.addItem(text, "region")
+            idx = self.screen_combo.count() - 1
+        else:
+            self.screen_combo.setItemText(idx, text)
+        self.screen_combo.setCurrentIndex(idx)
+
+    def select_region(self):
+        """显示区域选择遮罩"""
+        # 遮罩没有父窗口，需保留引用，否则会被立即回收
+        self._selector = RegionSelector()
+        self._selector.region_selected.connect(self.on_region_selected)
+        self._selector.point_selected.connect(self.on_point_selected)
+        self._selector.cancelled.connect(self.on_region_cancelled)
+        self._selector.show()
+        self._selector.activateWindow()
+
+    def on_region_selected(self, rect):
+        self._selector = None
+        QTimer.singleShot(REGION_GRAB_DELAY_MS, lambda: self.use_region(rect))
+
+    def on_point_selected(self, point):
+        self._selector = None
+        # 遮罩关闭后才能查询鼠标下的窗口
+        QTimer.singleShot(REGION_GRAB_DELAY_MS, lambda: self.use_region(window_rect_at(point)))
+
+    def on_region_cancelled(self):
+        self._selector = None
+
+    def use_region(self, rect):
+        """记住选定区域并立即扫描"""
+        if rect is None or rect.isEmpty():
             return
-        pixmap = screens[idx].grabWindow(0)
-        if pixmap.isNull():
-            QMessageBox.critical(self, "错误", "无法抓取屏幕图像")
-            return
+        self.region = rect
+        save_scan_region(rect)
+        self.update_region_item()
+        if self.scan_btn.isEnabled():
+            self.scan_screen()
 
-        # 显示截图
-        self.image_label.setPixmap(pixmap.scaled(
-            self.image_label.width(), self.image_label.height(), Qt.AspectRatioMode.KeepAspectRatio))
+    def scan_screen(self):
+        shots = self.grab_screens()
+        if shots is None:
+            return
 
-        # 将 QPixmap 转换为 PIL.Image
-        qimage = pixmap.toImage().convertToFormat(QImage.Format.Format_RGBA8888)
-        width = qimage.width()
-        height = qimage.height()
-        ptr = qimage.bits()
-        size = width * height * 4
+        # 抓屏需在 GUI 线程完成，格式转换与解码交给后台
+        self.scan_btn.setEnabled(False)
+        task_runner().submit(
+            scan_screen_images, shots,
+            on_result=self.on_decoded, on_error=self.on_decode_failed
+        )
 
-        # PyQt6 需要 setsize()，PySide6 无此方法但已实现缓冲区协议
-        if hasattr(ptr, "setsize"):
-            ptr.setsize(size)
+    def on_decoded(self, decoded):
+        """解码完成"""
+        self.scan_btn.setEnabled(not self.watch_check.isChecked())
+        # 不同屏幕上可能显示同一个二维码，列表中只保留一项
+        codes = list(dict.fromkeys(d[0] for d in decoded))
+        self.populate_codes(codes)
 
-        arr = np.frombuffer(ptr, dtype=np.uint8, count=size).reshape((height, width, 4))
-        pil_img = Image.fromarray(arr, 'RGBA')
+    def on_decode_failed(self, e):
+        """解码出错"""
+        self.scan_btn.setEnabled(True)
+        QMessageBox.critical(self, "错误", f"二维码解析失败: {str(e)}")
+
+    def set_watching(self, enabled):
+        """开启或关闭监视模式"""
+        if enabled:
+            self._detectors = {}
+            self.screen_combo.setEnabled(False)
+            self.region_btn.setEnabled(False)
+            self.scan_btn.setEnabled(False)
+            self.watch_timer.start()
+            self.watch_tick()
+        else:
+            self.watch_timer.stop()
+            self.screen_combo.setEnabled(True)
+            self.region_btn.setEnabled(True)
+            self.scan_btn.setEnabled(not self._watch_busy)
+
+    def stop_watching(self):
+        # 通过复选框关闭，保持界面状态一致
+        self.watch_check.setChecked(False)
+
+    def watch_tick(self):
+        # 上一次识别尚未完成时跳过本次抓屏
+        if self._watch_busy:
+            return
+        shots = self.grab_screens()
+        if shots is None:
+            self.stop_watching()
+            return
+        self._watch_busy = True
+        task_runner().submit(
+            watch_screen_images, shots, self._detectors,
+            on_result=self.on_watch_decoded, on_error=self.on_watch_failed
+        )
 
-        decoded = decode_qr_from_image(pil_img)
-        codes = [d[0] for d in decoded]
+    def on_watch_decoded(self, decoded):
+        self._watch_busy = False
+        if not self.watch_check.isChecked():
+            self.scan_btn.setEnabled(True)
+            return
+        codes = list(dict.fromkeys(d[0] for d in decoded))
+        otp_codes = [c for c in codes if parse_otp_uri(c)]
+        if not otp_codes:
+            return
+        # 发现有效的 otpauth 二维码即停止监视并选中
+        self.stop_watching()
         self.populate_codes(codes)
+        self.codes_list.setCurrentRow(codes.index(otp_codes[0]))
+
+    def on_watch_failed(self, e):
+        self._watch_busy = False
+        self.stop_watching()
+        self.on_decode_failed(e)
+
+    def done(self, result):
+        self.watch_timer.stop()
+        super().done(result)
 
     def populate_codes(self, codes: List[str]):
         self.codes_list.clear()
@@ -285,17 +692,24 @@ class ImageScanDialog(QDialog):
         )
         if not file_path:
             return
-        try:
-            pil_img = Image.open(file_path)
-            # 显示预览
-            qimg = QPixmap(file_path)
-            self.image_label.setPixmap(qimg.scaled(self.image_label.width(), self.image_label.height(), Qt.AspectRatioMode.KeepAspectRatio))
+        # 显示预览
+        qimg = QPixmap(file_path)
+        self.image_label.setPixmap(qimg.scaled(self.image_label.width(), self.image_label.height(), Qt.AspectRatioMode.KeepAspectRatio))
+
+        # 读取与解码在后台执行
+        task_runner().submit(
+            decode_image_file, file_path,
+            on_result=self.on_decoded, on_error=self.on_decode_failed
+        )
 
-            decoded = decode_qr_from_image(pil_img)
-            codes = [d[0] for d in decoded]
-            self.populate_codes(codes)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"无法打开图片: {str(e)}")
+    def on_decoded(self, decoded):
+        """解码完成"""
+        codes = [d[0] for d in decoded]
+        self.populate_codes(codes)
+
+    def on_decode_failed(self, e):
+        """打开或解码图片出错"""
+        QMessageBox.critical(self, "错误", f"无法打开图片: {str(e)}")
 
     def populate_codes(self, codes: List[str]):
         self.codes_list.clear()
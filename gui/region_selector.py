@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+屏幕区域选择遮罩
+
+覆盖整个虚拟桌面的半透明窗口：拖动鼠标框选区域，单击则选择鼠标下的窗口，Esc 取消。
+坐标均为 Qt 的全局逻辑坐标。
+"""
+
+import sys
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRect, QPoint, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QPen, QGuiApplication
+
+# 拖动距离小于该值（像素）视为单击
+CLICK_THRESHOLD = 8
+
+
+def virtual_desktop_rect():
+    """所有屏幕的外接矩形"""
+    rect = QRect()
+    for screen in QGuiApplication.screens():
+        rect = rect.united(screen.geometry())
+    return rect
+
+
+def _win32_window_rect_at(point, screen):
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    user32.WindowFromPoint.restype = wintypes.HWND
+    user32.WindowFromPoint.argtypes = [wintypes.POINT]
+    user32.GetAncestor.restype = wintypes.HWND
+    user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+    user32.GetWindowRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+    GA_ROOT = 2
+
+    # Qt 在 Windows 上保持屏幕原点不变、按设备像素比缩放尺寸
+    origin = screen.geometry().topLeft()
+    ratio = screen.devicePixelRatio()
+    native = wintypes.POINT(
+        int(origin.x() + (point.x() - origin.x()) * ratio),
+        int(origin.y() + (point.y() - origin.y()) * ratio),
+    )
+    hwnd = user32.WindowFromPoint(native)
+    if not hwnd:
+        return None
+    hwnd = user32.GetAncestor(hwnd, GA_ROOT) or hwnd
+    rect = wintypes.RECT()
+    if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+        return None
+    left = origin.x() + (rect.left - origin.x()) / ratio
+    top = origin.y() + (rect.top - origin.y()) / ratio
+    return QRect(
+        int(left), int(top),
+        int((rect.right - rect.left) / ratio), int((rect.bottom - rect.top) / ratio),
+    )
+
+
+def window_rect_at(point):
+    """返回全局坐标 point 处顶层窗口的矩形；无法获取其他程序的窗口时返回所在屏幕的矩形
+
+    须在遮罩关闭后调用，否则取到的是遮罩本身。
+    """
+    screen = QGuiApplication.screenAt(point) or QGuiApplication.primaryScreen()
+    if sys.platform == "win32":
+        try:
+            rect = _win32_window_rect_at(point, screen)
+        except (OSError, AttributeError):
+            rect = None
+        if rect is not None and rect.isValid():
+            return rect.intersected(virtual_desktop_rect())
+    # 其他平台 Qt 无法查询其他程序的窗口，退化为整个屏幕
+    return screen.geometry()
+
+
+class RegionSelector(QWidget):
+    """区域选择遮罩，选择结果通过信号返回后自动关闭"""
+
+    region_selected = pyqtSignal(QRect)
+    point_selected = pyqtSignal(QPoint)
+    cancelled = pyqtSignal()
+
+    def __init__(self):
+        super().__init__(None, Qt.WindowType.FramelessWindowHint
+                         | Qt.WindowType.WindowStaysOnTopHint
+                         | Qt.WindowType.Tool)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setCursor(Qt.CursorShape.CrossCursor)
+        self.setGeometry(virtual_desktop_rect())
+        self._start = None
+        self._current = None
+
+    def selection(self):
+        if self._start is None or self._current is None:
+            return QRect()
+        return QRect(self._start, self._current).normalized()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 110))
+        selection = self.selection()
+        if not selection.isEmpty():
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
+            painter.fillRect(selection, Qt.GlobalColor.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+            painter.setPen(QPen(QColor(0, 160, 255), 2))
+            painter.drawRect(selection)
+        else:
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter,
+                             "拖动鼠标框选二维码所在区域，单击选择窗口，按 Esc 取消")
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._start = self._current = event.position().toPoint()
+            self.update()
+        elif event.button() == Qt.MouseButton.RightButton:
+            self.cancel()
+
+    def mouseMoveEvent(self, event):
+        if self._start is not None:
+            self._current = event.position().toPoint()
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton or self._start is None:
+            return
+        self._current = event.position().toPoint()
+        selection = self.selection()
+        origin = self.geometry().topLeft()
+        self.close()
+        if selection.width() < CLICK_THRESHOLD and selection.height() < CLICK_THRESHOLD:
+            self.point_selected.emit(self._current + origin)
+        else:
+            self.region_selected.emit(selection.translated(origin))
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Escape:
+            self.cancel()
+
+    def cancel(self):
+        self.close()
+        self.cancelled.emit()
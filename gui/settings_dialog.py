@@ -98,6 +98,17 @@ class SettingsDialog(QDialog):
         security_group.setLayout(security_layout)
         main_layout.addWidget(security_group)
         
+        # 诊断选项
+        diagnostics_group = QGroupBox("诊断")
+        diagnostics_layout = QVBoxLayout()
+        
+        self.stall_detector_check = QCheckBox("记录界面卡顿及调用栈到本地日志")
+        self.stall_detector_check.setChecked(self.config.get("stall_detector_enabled", False))
+        diagnostics_layout.addWidget(self.stall_detector_check)
+        
+        diagnostics_group.setLayout(diagnostics_layout)
+        main_layout.addWidget(diagnostics_group)
+        
         # 按钮区域
         self.button_box = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
@@ -177,6 +188,9 @@ class SettingsDialog(QDialog):
         self.config["auto_copy"] = self.auto_copy_check.isChecked()
         self.config["show_seconds"] = self.show_seconds_check.isChecked()
         
+        # 保存诊断设置
+        self.config["stall_detector_enabled"] = self.stall_detector_check.isChecked()
+        
         # 保存加密设置
         self.config["encryption_enabled"] = encryption_enabled_after
         
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+GUI 事件循环卡顿检测（可选开启）
+
+GUI 线程中的定时器定期更新心跳，后台监视线程发现心跳超过阈值未更新时，
+通过 sys._current_frames 抓取 GUI 线程当前的 Python 调用栈；
+事件循环恢复后把卡顿时长与调用栈写入滚动日志文件。
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+import traceback
+from logging.handlers import RotatingFileHandler
+
+from PyQt6.QtCore import QTimer
+
+from utils.config import CONFIG_DIR
+
+STALL_LOG_FILE = os.path.join(CONFIG_DIR, "logs", "stalls.log")
+
+
+class StallDetector:
+    """事件循环卡顿检测器，必须在 GUI 线程中创建"""
+
+    def __init__(self, threshold_ms=500, log_path=STALL_LOG_FILE, ping_interval_ms=100):
+        self.threshold = threshold_ms / 1000.0
+        self.ping_interval_ms = ping_interval_ms
+        self.log_path = log_path
+        self._gui_ident = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stall = None  # (卡顿开始时的心跳, 调用栈)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._logger = None
+
+        self._timer = QTimer()
+        self._timer.setInterval(ping_interval_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def _beat(self):
+        self._heartbeat = time.perf_counter()
+
+    def _get_logger(self):
+        if self._logger is None:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            logger = logging.getLogger("lightauth.stall")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            if not logger.handlers:
+                handler = RotatingFileHandler(self.log_path, maxBytes=1 << 20, backupCount=3, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def is_running(self):
+        """检测器是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """开始检测"""
+        if self.is_running():
+            return
+        self._heartbeat = time.perf_counter()
+        self._stall = None
+        self._stop_event.clear()
+        self._timer.start()
+        self._thread = threading.Thread(target=self._watch, name="lightauth-stall", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止检测"""
+        self._timer.stop()
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _watch(self):
+        poll = min(self.threshold / 4, self.ping_interval_ms / 1000.0)
+        while not self._stop_event.wait(poll):
+            beat = self._heartbeat
+            if self._stall is None:
+                if time.perf_counter() - beat >= self.threshold:
+                    frame = sys._current_frames().get(self._gui_ident)
+                    stack = "".join(traceback.format_stack(frame)) if frame is not None else "<无法获取调用栈>\n"
+                    self._stall = (beat, stack)
+            else:
+                start, stack = self._stall
+                if beat != start:
+                    # 心跳恢复，记录整个卡顿时长（含一个心跳间隔的误差）
+                    self._stall = None
+                    self._report(beat - start, stack)
+
+    def _report(self, duration, stack):
+        try:
+            self._get_logger().info("GUI 线程卡顿 %.0f ms，卡顿时调用栈:\n%s", duration * 1000, stack)
+        except OSError:
+            pass
@@ -3,27 +3,87 @@
 
 """
 应用程序的样式表
+
+颜色统一定义在调色板 (PALETTES) 中，样式表由模板按调色板令牌生成；
+自绘部件通过 gui.theme 在绘制时读取同一份调色板。
 """
 
-LIGHT_STYLE = """
-QMainWindow {
-    background-color: #f5f5f5;
+import re
+from string import Template
+
+# 调色板：令牌 -> 颜色
+PALETTES = {
+    "light": {
+        "window_bg": "#f5f5f5",
+        "surface": "#ffffff",
+        "text": "#000000",
+        "text_secondary": "#707070",
+        "text_muted": "#707070",
+        "text_hint": "#909090",
+        "border": "#e0e0e0",
+        "border_hover": "#d0d0d0",
+        "hover": "#e0e0e0",
+        "menu_hover": "#f0f0f0",
+        "tab_bg": "#e0e0e0",
+        "track": "#e0e0e0",
+        "progress_track": "#f0f0f0",
+        "accent": "#4184f3",
+        "accent_hover": "#5294ff",
+        "accent_pressed": "#3367d6",
+        "on_accent": "#ffffff",
+        "otp": "#2979FF",
+        "success": "#4CAF50",
+        "warning": "#FFD740",
+        "warning_text": "#FFB300",
+        "danger": "#FF5252",
+    },
+    "dark": {
+        "window_bg": "#2d2d2d",
+        "surface": "#3d3d3d",
+        "text": "#f0f0f0",
+        "text_secondary": "#b0b0b0",
+        "text_muted": "#c0c0c0",
+        "text_hint": "#c0c0c0",
+        "border": "#505050",
+        "border_hover": "#707070",
+        "hover": "#505050",
+        "menu_hover": "#505050",
+        "tab_bg": "#505050",
+        "track": "#505050",
+        "progress_track": "#505050",
+        "accent": "#4184f3",
+        "accent_hover": "#5294ff",
+        "accent_pressed": "#3367d6",
+        "on_accent": "#ffffff",
+        "otp": "#90CAF9",
+        "success": "#4CAF50",
+        "warning": "#FFD740",
+        "warning_text": "#FFB300",
+        "danger": "#FF5252",
+    },
+}
+
+STYLE_TEMPLATE = Template("""
+QMainWindow, QDialog {
+    background-color: $window_bg;
+    color: $text;
 }
 
 QWidget {
+    color: $text;
     font-family: "Noto Sans CJK SC", "Source Han Sans SC", "PingFang SC", "Hiragino Sans GB", "WenQuanYi Micro Hei", sans-serif;
 }
 
 QListWidget {
-    background-color: #ffffff;
-    border: 1px solid #e0e0e0;
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 6px;
     padding: 5px;
 }
 
 QPushButton {
-    background-color: #4184f3;
-    color: white;
+    background-color: $accent;
+    color: $on_accent;
     border: none;
     border-radius: 4px;
     padding: 8px 16px;
@@ -31,16 +91,16 @@ QPushButton {
 }
 
 QPushButton:hover {
-    background-color: #5294ff;
+    background-color: $accent_hover;
 }
 
 QPushButton:pressed {
-    background-color: #3367d6;
+    background-color: $accent_pressed;
 }
 
 QProgressBar {
     border: none;
-    background-color: #e0e0e0;
+    background-color: $track;
     border-radius: 2px;
 }
 
@@ -49,22 +109,23 @@ QProgressBar::chunk {
 }
 
 QMenuBar {
-    background-color: #f5f5f5;
-    border-bottom: 1px solid #e0e0e0;
+    background-color: $window_bg;
+    border-bottom: 1px solid $border;
 }
 
 QMenuBar::item {
     padding: 6px 10px;
+    color: $text;
 }
 
 QMenuBar::item:selected {
-    background-color: #e0e0e0;
+    background-color: $hover;
     border-radius: 4px;
 }
 
 QMenu {
-    background-color: #ffffff;
-    border: 1px solid #e0e0e0;
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 4px;
     padding: 4px;
 }
@@ -72,29 +133,36 @@ QMenu {
 QMenu::item {
     padding: 6px 20px;
     border-radius: 3px;
+    color: $text;
 }
 
 QMenu::item:selected {
-    background-color: #e0e0e0;
+    background-color: $hover;
+}
+
+QLabel {
+    color: $text;
 }
 
 QLineEdit {
     padding: 6px;
-    border: 1px solid #e0e0e0;
+    border: 1px solid $border;
     border-radius: 4px;
-    background-color: #ffffff;
+    background-color: $surface;
+    color: $text;
 }
 
 QLineEdit:focus {
-    border: 1px solid #4184f3;
+    border: 1px solid $accent;
 }
 
 QGroupBox {
     font-weight: bold;
-    border: 1px solid #e0e0e0;
+    border: 1px solid $border;
     border-radius: 4px;
     margin-top: 10px;
     padding-top: 10px;
+    color: $text;
 }
 
 QGroupBox::title {
@@ -103,146 +171,91 @@ QGroupBox::title {
     padding: 0 5px;
 }
 
+QCheckBox {
+    color: $text;
+}
+
 QComboBox {
     padding: 6px;
-    border: 1px solid #e0e0e0;
+    border: 1px solid $border;
     border-radius: 4px;
-    background-color: #ffffff;
-    color: #000000;
+    background-color: $surface;
+    color: $text;
 }
 
 QComboBox QAbstractItemView {
-    background-color: #ffffff;
-    border: 1px solid #e0e0e0;
-    selection-background-color: #e0e0e0;
-    selection-color: #000000;
-}
-"""
-
-DARK_STYLE = """
-QMainWindow, QDialog {
-    background-color: #2d2d2d;
-    color: #f0f0f0;
-}
-
-QWidget {
-    color: #f0f0f0;
-    font-family: "Noto Sans CJK SC", "Source Han Sans SC", "PingFang SC", "Hiragino Sans GB", "WenQuanYi Micro Hei", sans-serif;
-}
-
-QListWidget {
-    background-color: #3d3d3d;
-    border: 1px solid #505050;
-    border-radius: 6px;
-    padding: 5px;
-}
-
-QPushButton {
-    background-color: #4184f3;
-    color: white;
-    border: none;
-    border-radius: 4px;
-    padding: 8px 16px;
-    font-weight: bold;
-}
-
-QPushButton:hover {
-    background-color: #5294ff;
-}
-
-QPushButton:pressed {
-    background-color: #3367d6;
-}
-
-QProgressBar {
-    border: none;
-    background-color: #505050;
-    border-radius: 2px;
-}
-
-QProgressBar::chunk {
-    border-radius: 2px;
+    background-color: $surface;
+    border: 1px solid $border;
+    selection-background-color: $hover;
+    selection-color: $text;
 }
 
-QMenuBar {
-    background-color: #2d2d2d;
-    border-bottom: 1px solid #505050;
+QTabWidget::pane {
+    border: 1px solid $border;
+    background-color: $surface;
 }
 
-QMenuBar::item {
-    padding: 6px 10px;
-    color: #f0f0f0;
+QTabBar::tab {
+    background: $tab_bg;
+    color: $text;
+    padding: 6px;
 }
 
-QMenuBar::item:selected {
-    background-color: #505050;
-    border-radius: 4px;
+QTabBar::tab:selected {
+    background: $surface;
 }
+""")
 
+# 账户条目右键菜单
+CONTEXT_MENU_TEMPLATE = Template("""
 QMenu {
-    background-color: #3d3d3d;
-    border: 1px solid #505050;
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 4px;
-    padding: 4px;
+    padding: 5px;
+    color: $text;
 }
-
 QMenu::item {
-    padding: 6px 20px;
+    padding: 5px 25px 5px 20px;
     border-radius: 3px;
-    color: #f0f0f0;
+    color: $text;
 }
-
 QMenu::item:selected {
-    background-color: #505050;
+    background-color: $menu_hover;
 }
+""")
 
-QLabel {
-    color: #f0f0f0;
-}
 
-QLineEdit {
-    padding: 6px;
-    border: 1px solid #505050;
-    border-radius: 4px;
-    background-color: #3d3d3d;
-    color: #f0f0f0;
-}
+def build_style(palette, template=STYLE_TEMPLATE):
+    """根据调色板生成样式表"""
+    return template.substitute(palette)
 
-QLineEdit:focus {
-    border: 1px solid #4184f3;
-}
 
-QGroupBox {
-    font-weight: bold;
-    border: 1px solid #505050;
-    border-radius: 4px;
-    margin-top: 10px;
-    padding-top: 10px;
-    color: #f0f0f0;
-}
+_RULE_RE = re.compile(r"([^{}]+)\{([^{}]*)\}")
 
-QGroupBox::title {
-    subcontrol-origin: margin;
-    subcontrol-position: top left;
-    padding: 0 5px;
-}
 
-QCheckBox {
-    color: #f0f0f0;
-}
+def _scope_selector(selector, attribute):
+    """为选择器生成两种限定形式：祖先带有属性，或最后一个部件本身带有属性"""
+    head, _, last = selector.rpartition(" ")
+    name, colon, rest = last.partition(":")
+    own = f"{head} {name}{attribute}{colon}{rest}".strip()
+    return f"*{attribute} {selector}", own
 
-QComboBox {
-    padding: 6px;
-    border: 1px solid #505050;
-    border-radius: 4px;
-    background-color: #3d3d3d;
-    color: #f0f0f0;
-}
 
-QComboBox QAbstractItemView {
-    background-color: #3d3d3d;
-    border: 1px solid #505050;
-    selection-background-color: #505050;
-    selection-color: #f0f0f0;
-}
-""" 
\ No newline at end of file
+def build_themed_style(palettes, default, property_name, template=STYLE_TEMPLATE):
+    """生成包含所有主题的样式表
+
+    默认主题的规则不加限定；其他主题的规则只作用于 property_name 属性等于主题名的顶层窗口及其子部件，
+    且优先级总是高于对应的默认规则。切换主题时只需修改属性并重新应用样式，样式表本身不变。
+    """
+    parts = [build_style(palettes[default], template)]
+    for name, palette in palettes.items():
+        if name == default:
+            continue
+        attribute = f'[{property_name}="{name}"]'
+        for selectors, body in _RULE_RE.findall(build_style(palette, template)):
+            scoped = []
+            for selector in selectors.split(","):
+                scoped.extend(_scope_selector(" ".join(selector.split()), attribute))
+            parts.append(",\n".join(scoped) + " {" + body + "}")
+    return "\n".join(parts)
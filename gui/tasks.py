@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+后台任务执行器
+
+将密钥派生、加解密、文件读写、二维码解码和相机枚举等耗时操作移出 GUI 线程。
+任务在 concurrent.futures 线程池中执行，进度、结果与异常通过 Qt 信号回到 GUI 线程。
+
+线程池按用途分为两条通道：
+    "cpu" - 计算密集型与其他耗时任务（解码、解密、文件读取、相机枚举等），可并行
+    "io"  - 仅用于持久化写入，单线程串行，保证写入顺序；耗时的非写入任务不要放在这里，
+            否则保存（包括关闭窗口时的同步保存）会排在其后
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class TaskCancelled(Exception):
+    """任务被取消时由任务函数抛出"""
+
+
+class TaskSignals(QObject):
+    """任务信号，在创建任务的线程（GUI 线程）中接收"""
+
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+
+
+class Task:
+    """后台任务句柄，支持进度上报与取消"""
+
+    def __init__(self, fn, args, kwargs, pass_task=False):
+        self.signals = TaskSignals()
+        self.future = None
+        self.lane = "cpu"
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._pass_task = pass_task
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消；尚未开始的任务直接取消，运行中的任务需自行检查 is_cancelled()"""
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.signals.cancelled.emit()
+
+    def is_cancelled(self):
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """在任务函数中调用，已取消时抛出 TaskCancelled"""
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report_progress(self, percent):
+        """在任务函数中上报进度 (0-100)"""
+        self.signals.progress.emit(int(percent))
+
+    def done(self):
+        """任务是否已结束"""
+        return self.future is not None and self.future.done()
+
+    def _run(self):
+        if self._cancel_event.is_set():
+            self.signals.cancelled.emit()
+            return None
+        kwargs = dict(self._kwargs)
+        if self._pass_task:
+            kwargs["task"] = self
+        try:
+            result = self._fn(*self._args, **kwargs)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+            return None
+        except Exception as exc:
+            self.signals.failed.emit(exc)
+            return None
+        if self._cancel_event.is_set():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
+        return result
+
+
+class TaskRunner:
+    """共享后台任务执行器"""
+
+    def __init__(self, max_workers=None):
+        workers = max_workers or min(4, os.cpu_count() or 1)
+        self._pools = {
+            "cpu": ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lightauth-cpu"),
+            "io": ThreadPoolExecutor(max_workers=1, thread_name_prefix="lightauth-io"),
+        }
+        self._tasks = set()  # 持有任务引用直到结束，避免信号对象被回收
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, lane="cpu", on_result=None, on_error=None,
+               on_progress=None, on_cancel=None, pass_task=False, **kwargs):
+        """提交后台任务
+
+        Args:
+            fn: 任务函数，pass_task 为 True 时额外接收 task 关键字参数用于上报进度与检查取消
+            lane: 线程池通道，"cpu" 或 "io"
+            on_result / on_error / on_progress / on_cancel: 在 GUI 线程中调用的回调
+        Returns:
+            Task 任务句柄
+        """
+        task = Task(fn, args, kwargs, pass_task=pass_task)
+        task.lane = lane
+        if on_result is not None:
+            task.signals.finished.connect(on_result)
+        if on_error is not None:
+            task.signals.failed.connect(on_error)
+        if on_progress is not None:
+            task.signals.progress.connect(on_progress)
+        if on_cancel is not None:
+            task.signals.cancelled.connect(on_cancel)
+        # 结束信号在 GUI 线程处理完之后再释放任务引用，保证排队中的信号仍可送达
+        forget = lambda *_: self._forget(task)
+        task.signals.finished.connect(forget)
+        task.signals.failed.connect(forget)
+        task.signals.cancelled.connect(forget)
+
+        with self._lock:
+            self._tasks.add(task)
+        task.future = self._pools[lane].submit(task._run)
+        return task
+
+    def _forget(self, task):
+        with self._lock:
+            self._tasks.discard(task)
+
+    def wait_idle(self, lane=None, timeout=None):
+        """等待指定通道（默认全部）中已提交的任务结束"""
+        with self._lock:
+            futures = [
+                task.future for task in self._tasks
+                if task.future is not None and (lane is None or task.lane == lane)
+            ]
+        if futures:
+            wait(futures, timeout=timeout)
+
+    def shutdown(self, wait_tasks=True):
+        """关闭线程池"""
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait_tasks, cancel_futures=not wait_tasks)
+
+
+_runner = None
+
+
+def task_runner():
+    """获取全局任务执行器"""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner()
+    return _runner
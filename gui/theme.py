@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+主题引擎：共享调色板，供部件在绘制时按令牌取色
+"""
+
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication
+
+from gui.styles import PALETTES, STYLE_TEMPLATE, CONTEXT_MENU_TEMPLATE, build_style, build_themed_style
+
+# 顶层窗口上记录当前主题的动态属性，样式表中非默认主题的规则按该属性限定
+THEME_PROPERTY = "lightauthTheme"
+DEFAULT_THEME = "light"
+
+
+class ThemeManager:
+    """主题管理器，保存当前调色板并负责切换
+
+    包含所有主题的样式表只在应用程序级别设置一次。切换主题时只修改顶层窗口的属性并重新应用
+    非自绘部件的样式；自绘部件（账户条目等）在绘制时读取调色板，重绘即可。
+    """
+
+    def __init__(self, name=DEFAULT_THEME):
+        self._name = name if name in PALETTES else DEFAULT_THEME
+        self._colors = {}  # 当前主题的 QColor 缓存
+        self._installed = False
+
+    def name(self):
+        """获取当前主题名称"""
+        return self._name
+
+    def set_theme(self, name):
+        """切换当前调色板，主题实际发生变化时返回 True"""
+        if name not in PALETTES:
+            name = DEFAULT_THEME
+        if name == self._name:
+            return False
+        self._name = name
+        self._colors.clear()
+        return True
+
+    def apply(self, name, skip=None):
+        """切换主题并应用到所有窗口
+
+        Args:
+            name: 主题名称。
+            skip: 判断部件是否跳过重新应用样式的函数，用于在绘制时自行取色的部件。
+        Returns:
+            主题实际发生变化或首次应用时返回 True。
+        """
+        app = QApplication.instance()
+        changed = self.set_theme(name)
+        if not self._installed:
+            app.setStyleSheet(self.stylesheet())
+            self._installed = True
+            changed = True
+        for window in app.topLevelWidgets():
+            window.setProperty(THEME_PROPERTY, self._name)
+        if not changed:
+            return False
+        style = app.style()
+        for widget in app.allWidgets():
+            if skip is not None and skip(widget):
+                continue
+            style.unpolish(widget)
+            style.polish(widget)
+            widget.update()
+        return True
+
+    def color(self, token):
+        """按令牌获取当前主题的颜色"""
+        color = self._colors.get(token)
+        if color is None:
+            color = QColor(PALETTES[self._name][token])
+            self._colors[token] = color
+        return color
+
+    def stylesheet(self):
+        """获取包含所有主题的应用程序样式表"""
+        return build_themed_style(PALETTES, DEFAULT_THEME, THEME_PROPERTY, STYLE_TEMPLATE)
+
+    def context_menu_stylesheet(self):
+        """获取当前主题的右键菜单样式表"""
+        return build_style(PALETTES[self._name], CONTEXT_MENU_TEMPLATE)
+
+
+_manager = None
+
+
+def theme_manager():
+    """获取全局主题管理器"""
+    global _manager
+    if _manager is None:
+        _manager = ThemeManager()
+    return _manager
+
+
+def theme_color(token):
+    """按令牌获取当前主题颜色的快捷函数"""
+    return theme_manager().color(token)
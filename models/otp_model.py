@@ -3,10 +3,11 @@
 
 import time
 import pyotp
-import qrcode
 from io import BytesIO
-from PIL import Image, ImageQt
-from PyQt6.QtGui import QPixmap
+from contextlib import contextmanager
+
+from utils.rwlock import ReadWriteLock
+from utils.tracing import trace_span
 
 class OTPAccount:
     """OTP账户类，管理单个OTP账户"""
@@ -39,6 +40,11 @@ class OTPAccount:
     
     def get_qrcode(self, size=200):
         """生成QR码图像"""
+        # 延迟导入，保证命令行模式不加载 qrcode / PIL / Qt
+        import qrcode
+        from PIL import Image, ImageQt
+        from PyQt6.QtGui import QPixmap
+
         qr = qrcode.QRCode(
             version=1,
             error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -76,50 +82,183 @@ class OTPAccount:
 
 
 class OTPModel:
-    """OTP模型类，管理所有OTP账户"""
+    """OTP模型类，管理所有OTP账户
+
+    线程安全：账户列表以不可变元组保存，写操作在写锁内复制后整体替换（写时复制），
+    因此 snapshot() 几乎零开销，后台任务可以在不加锁的情况下遍历快照；
+    需要在多次调用之间保持一致视图时使用 read_locked()。
+
+    每次提交的修改都会通知监听器；使用 transaction() 可将多次修改合并为一次提交与一次通知。
+    """
+    
+    def __init__(self, accounts=()):
+        self._lock = ReadWriteLock()
+        self._accounts = tuple(accounts)
+        self._pending = None  # 事务中的工作副本，仅事务所在线程可见
+        self._pending_dirty = False
+        self._listeners = []
+    
+    @property
+    def accounts(self):
+        """当前账户的只读快照"""
+        return self._accounts
+    
+    def snapshot(self):
+        """获取当前已提交账户的不可变快照"""
+        return self._accounts
+    
+    def read_locked(self):
+        """读锁上下文，期间不会有写操作"""
+        return self._lock.read_locked()
+    
+    def write_locked(self):
+        """写锁上下文，用于需要原子完成的多步写操作"""
+        return self._lock.write_locked()
+    
+    # ----------------------- 变更通知 -----------------------
+    def add_listener(self, callback):
+        """注册变更监听器，每次提交后以 callback(model) 调用"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """移除变更监听器"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
     
-    def __init__(self):
-        self.accounts = []
+    @trace_span("model.notify", "model")
+    def _notify(self):
+        for callback in list(self._listeners):
+            callback(self)
     
+    # ----------------------- 事务 -----------------------
+    @contextmanager
+    def transaction(self):
+        """事务上下文
+
+        事务内任意次增删改只作用于工作副本，正常退出时一次性提交并只通知一次；
+        发生异常时全部回滚。嵌套事务并入最外层事务。
+        """
+        with self._lock.write_locked():
+            if self._pending is not None:
+                yield self
+                return
+            self._pending = list(self._accounts)
+            self._pending_dirty = False
+            try:
+                yield self
+            except BaseException:
+                self._pending = None
+                raise
+            dirty = self._pending_dirty
+            if dirty:
+                self._accounts = tuple(self._pending)
+            self._pending = None
+        if dirty:
+            self._notify()
+    
+    def _apply(self, change):
+        """在写锁内应用修改；change(list) 返回是否发生变化。事务外立即提交并通知"""
+        with self._lock.write_locked():
+            # 事务进行期间写锁由事务线程持有，能走到这里说明就是事务线程本身
+            if self._pending is not None:
+                self._pending_dirty = change(self._pending) or self._pending_dirty
+                return
+            accounts = list(self._accounts)
+            if not change(accounts):
+                return
+            self._accounts = tuple(accounts)
+        self._notify()
+    
+    def _view(self):
+        """当前线程可见的账户序列（事务线程可见未提交的修改）"""
+        pending = self._pending
+        if pending is not None and self._lock.is_write_owner():
+            return pending
+        return self._accounts
+    
+    # ----------------------- 增删改查 -----------------------
     def add_account(self, account):
         """添加账户"""
-        self.accounts.append(account)
+        def change(accounts):
+            accounts.append(account)
+            return True
+        self._apply(change)
+    
+    def add_accounts(self, accounts, skip_duplicates=False):
+        """批量添加账户，只提交与通知一次
+
+        Args:
+            accounts: 要添加的账户
+            skip_duplicates: 跳过与已有账户（或本批中更早的账户）重复的账户；默认与 add_account 一样全部添加
+        Returns:
+            实际添加的账户数量
+        """
+        added = 0
+
+        def change(current):
+            nonlocal added
+            seen = {self.account_key(account) for account in current} if skip_duplicates else None
+            for account in accounts:
+                if seen is not None:
+                    key = self.account_key(account)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                current.append(account)
+                added += 1
+            return added > 0
+        self._apply(change)
+        return added
     
     def remove_account(self, index):
         """删除账户"""
-        if 0 <= index < len(self.accounts):
-            del self.accounts[index]
+        def change(accounts):
+            if 0 <= index < len(accounts):
+                del accounts[index]
+                return True
+            return False
+        self._apply(change)
     
     def update_account(self, index, account):
         """更新账户"""
-        if 0 <= index < len(self.accounts):
-            self.accounts[index] = account
+        def change(accounts):
+            if 0 <= index < len(accounts):
+                accounts[index] = account
+                return True
+            return False
+        self._apply(change)
     
     def get_account(self, index):
         """获取指定索引的账户"""
-        if 0 <= index < len(self.accounts):
-            return self.accounts[index]
+        accounts = self._view()
+        if 0 <= index < len(accounts):
+            return accounts[index]
         return None
     
     def get_accounts(self):
-        """获取所有账户"""
-        return self.accounts
+        """获取所有账户（不可变快照）"""
+        return tuple(self._view())
     
     def count(self):
         """获取账户数量"""
-        return len(self.accounts)
+        return len(self._view())
     
+    @trace_span("model.to_list", "model")
     def to_list(self):
         """将账户列表转换为可序列化的列表"""
-        return [account.to_dict() for account in self.accounts]
+        return [account.to_dict() for account in self._view()]
     
     @classmethod
+    @trace_span("model.from_list", "model")
     def from_list(cls, data_list):
         """从数据列表创建模型"""
-        model = cls()
-        for account_data in data_list:
-            model.add_account(OTPAccount.from_dict(account_data))
-        return model
+        return cls(OTPAccount.from_dict(account_data) for account_data in data_list)
+    
+    @staticmethod
+    def account_key(account):
+        """判断重复账户所用的键：发行方、名称与规范化后的密钥"""
+        return (account.issuer, account.name, account.secret.replace(" ", "").upper())
     
     @staticmethod
     def generate_secret():
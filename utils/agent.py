@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+本地解锁代理（类似 ssh-agent）
+
+代理在内存中保存已解锁的 OTPModel，通过权限受限的 Unix 域套接字回答请求，
+命令行与辅助脚本无需每次都重新进行 PBKDF2 与解密。空闲超时后清除内存中的密钥并退出。
+
+协议：每帧为 4 字节大端长度 + UTF-8 JSON。
+请求为单个对象或对象数组（批量），对象格式:
+    {"op": "list"}                      列出账户 [{"id", "name", "issuer"}]
+    {"op": "codes", "ids": [0, 2]}      获取验证码，省略 ids 表示全部
+    {"op": "remaining"}                 当前验证码剩余有效秒数
+    {"op": "ping"}
+    {"op": "lock"}                      立即清除密钥并退出
+响应与请求一一对应: {"ok": true, "result": ...} 或 {"ok": false, "error": "..."}。
+
+用法: python -m utils.agent [--socket PATH] [--idle-timeout 秒] [--password-stdin]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import asyncio
+import argparse
+import tempfile
+
+HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 1 << 20  # 单帧上限 1 MiB
+DEFAULT_IDLE_TIMEOUT = 15 * 60  # 默认空闲 15 分钟后清除密钥
+OTP_INTERVAL = 30
+
+
+def default_socket_path():
+    """获取默认套接字路径，可通过 LIGHTAUTH_AGENT_SOCK 环境变量覆盖"""
+    env_path = os.environ.get("LIGHTAUTH_AGENT_SOCK")
+    if env_path:
+        return env_path
+    base_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(base_dir, f"lightauth-{uid}", "agent.sock")
+
+
+def encode_frame(payload):
+    """将对象编码为一帧"""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader):
+    """读取一帧并解码，连接关闭时返回 None"""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError("帧过大")
+    body = await reader.readexactly(length)
+    return json.loads(body.decode("utf-8"))
+
+
+class UnlockAgent:
+    """解锁代理，持有已解锁的账户模型并回答请求"""
+
+    def __init__(self, model, socket_path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.model = model
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.last_activity = time.monotonic()
+        self._server = None
+        self._stopped = None
+        self._code_step = None
+        self._codes = {}  # 当前时间步内已计算的验证码缓存 id -> code
+
+    # ----------------------- 请求处理 -----------------------
+    def handle(self, request):
+        """处理单个或批量请求，返回对应响应"""
+        self.last_activity = time.monotonic()
+        if isinstance(request, list):
+            return [self._handle_one(item) for item in request]
+        return self._handle_one(request)
+
+    def _handle_one(self, request):
+        if self.model is None:
+            return {"ok": False, "error": "locked"}
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "bad request"}
+        handler = getattr(self, f"_op_{request.get('op')}", None)
+        if handler is None:
+            return {"ok": False, "error": "unknown op"}
+        try:
+            return {"ok": True, "result": handler(request)}
+        except Exception as exc:
+            return {"ok": False, "error": str(exc)}
+
+    def _op_ping(self, request):
+        return "pong"
+
+    def _op_list(self, request):
+        return [
+            {"id": idx, "name": account.name, "issuer": account.issuer}
+            for idx, account in enumerate(self.model.get_accounts())
+        ]
+
+    def _op_codes(self, request):
+        accounts = self.model.get_accounts()
+        ids = request.get("ids")
+        if ids is None:
+            ids = range(len(accounts))
+        step = int(time.time()) // OTP_INTERVAL
+        if step != self._code_step:
+            self._code_step = step
+            self._codes = {}
+        codes = {}
+        for idx in ids:
+            if not isinstance(idx, int) or not 0 <= idx < len(accounts):
+                continue
+            code = self._codes.get(idx)
+            if code is None:
+                code = accounts[idx].totp.at(step * OTP_INTERVAL)
+                self._codes[idx] = code
+            codes[str(idx)] = code
+        return {"codes": codes, "remaining": OTP_INTERVAL - int(time.time()) % OTP_INTERVAL}
+
+    def _op_remaining(self, request):
+        return OTP_INTERVAL - int(time.time()) % OTP_INTERVAL
+
+    def _op_lock(self, request):
+        self.wipe()
+        return "locked"
+
+    def wipe(self):
+        """清除内存中的密钥并停止服务"""
+        if self.model is not None:
+            for account in self.model.get_accounts():
+                account.secret = ""
+                account.totp = None
+            self.model = None
+        self._codes = {}
+        if self._stopped is not None and not self._stopped.is_set():
+            self._stopped.set()
+
+    # ----------------------- 服务端 -----------------------
+    def _prepare_socket_dir(self):
+        """创建仅当前用户可访问的套接字目录，并清理遗留的套接字文件"""
+        sock_dir = os.path.dirname(self.socket_path)
+        os.makedirs(sock_dir, mode=0o700, exist_ok=True)
+        st = os.stat(sock_dir)
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            raise PermissionError(f"套接字目录不属于当前用户: {sock_dir}")
+        os.chmod(sock_dir, 0o700)
+
+        if os.path.exists(self.socket_path):
+            if agent_available(self.socket_path):
+                raise RuntimeError(f"代理已在运行: {self.socket_path}")
+            os.unlink(self.socket_path)
+
+    async def _serve_client(self, reader, writer):
+        try:
+            while self.model is not None:
+                request = await read_frame(reader)
+                if request is None:
+                    break
+                writer.write(encode_frame(self.handle(request)))
+                await writer.drain()
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _idle_watchdog(self):
+        while not self._stopped.is_set():
+            idle = time.monotonic() - self.last_activity
+            if idle >= self.idle_timeout:
+                self.wipe()
+                break
+            try:
+                await asyncio.wait_for(self._stopped.wait(), self.idle_timeout - idle)
+            except asyncio.TimeoutError:
+                pass
+
+    async def serve(self):
+        """启动服务并运行到空闲超时或收到 lock 请求"""
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("当前平台不支持 Unix 域套接字")
+
+        self._prepare_socket_dir()
+        self._stopped = asyncio.Event()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._serve_client, path=self.socket_path)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+
+        watchdog = asyncio.ensure_future(self._idle_watchdog())
+        try:
+            await self._stopped.wait()
+        finally:
+            watchdog.cancel()
+            self._server.close()
+            await self._server.wait_closed()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.wipe()
+
+
+# ----------------------- 客户端 -----------------------
+class AgentClient:
+    """同步代理客户端，供命令行与脚本使用"""
+
+    def __init__(self, socket_path=None, timeout=2.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(self, payload):
+        """发送单个或批量请求并返回响应"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(encode_frame(payload))
+            (length,) = HEADER.unpack(self._recv_exactly(sock, HEADER.size))
+            if length > MAX_FRAME_SIZE:
+                raise ValueError("帧过大")
+            return json.loads(self._recv_exactly(sock, length).decode("utf-8"))
+
+    @staticmethod
+    def _recv_exactly(sock, size):
+        chunks = []
+        while size:
+            chunk = sock.recv(size)
+            if not chunk:
+                raise ConnectionError("代理连接已关闭")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+
+def agent_available(socket_path=None):
+    """检测代理是否正在运行"""
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    try:
+        response = AgentClient(socket_path, timeout=0.5).request({"op": "ping"})
+        return bool(response.get("ok"))
+    except (OSError, ValueError):
+        return False
+
+
+def main(argv=None):
+    """代理入口：解锁账户数据后在前台运行"""
+    from utils.config import load_config, load_accounts
+    from utils.cli import read_password
+    from models.otp_model import OTPModel
+
+    parser = argparse.ArgumentParser(prog="python -m utils.agent", description="LightAuth 本地解锁代理")
+    parser.add_argument("--socket", default=None, help="套接字路径")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, help="空闲多少秒后清除密钥并退出")
+    parser.add_argument("--password-stdin", action="store_true", help="从标准输入读取解锁密码")
+    args = parser.parse_args(argv)
+
+    password = read_password(load_config(), from_stdin=args.password_stdin)
+    if password is None:
+        print("密码错误", file=sys.stderr)
+        return 1
+
+    agent = UnlockAgent(
+        OTPModel.from_list(load_accounts(password)),
+        socket_path=args.socket,
+        idle_timeout=args.idle_timeout,
+    )
+    del password
+    print(f"LIGHTAUTH_AGENT_SOCK={agent.socket_path}")
+    sys.stdout.flush()
+    try:
+        asyncio.run(agent.serve())
+    except KeyboardInterrupt:
+        agent.wipe()
+    except (RuntimeError, PermissionError) as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
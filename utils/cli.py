@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+无界面命令行模式：解锁账户数据并输出当前验证码
+
+本模块只依赖 utils.config 与 OTP 模型，不会导入 PyQt6/PySide6、cv2 或 qrcode。
+用法: python LightAuth.py --cli [-f 关键字] [--json] [--password-stdin] [--agent]
+  或: python -m utils.cli ...
+
+指定 --agent 时优先向本地解锁代理 (utils.agent) 查询，代理不可用时回退为直接解锁。
+"""
+
+import sys
+import json
+import getpass
+import argparse
+
+from utils.config import load_config, load_accounts, verify_password
+from models.otp_model import OTPModel
+
+
+def build_parser():
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="LightAuth --cli",
+        description="不启动图形界面，直接输出当前 OTP 验证码",
+    )
+    parser.add_argument(
+        "-f", "--filter",
+        default="",
+        help="按账户名称或发行方筛选（不区分大小写的子串匹配）",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="以 JSON 格式输出",
+    )
+    parser.add_argument(
+        "--password-stdin",
+        action="store_true",
+        help="从标准输入读取解锁密码（首行），适用于脚本",
+    )
+    parser.add_argument(
+        "--agent",
+        action="store_true",
+        help="优先从本地解锁代理读取验证码，避免重复解密",
+    )
+    return parser
+
+
+def read_password(config, from_stdin=False):
+    """获取并验证解锁密码
+
+    Returns:
+        验证通过的密码；未启用加密时返回空字符串；验证失败返回 None
+    """
+    stored_hash = config.get("encryption_password_hash", "")
+    if not config.get("encryption_enabled", False) or not stored_hash:
+        return ""
+
+    if from_stdin:
+        password = sys.stdin.readline().rstrip("\r\n")
+    else:
+        password = getpass.getpass("请输入解锁密码: ")
+
+    if not verify_password(password, stored_hash):
+        return None
+    return password
+
+
+def matches(name, issuer, keyword):
+    """判断账户名称或发行方是否包含关键字（不区分大小写）"""
+    keyword = keyword.lower()
+    return not keyword or keyword in name.lower() or keyword in issuer.lower()
+
+
+def rows_from_accounts(accounts, keyword=""):
+    """从本地解锁的账户生成输出行"""
+    return [
+        {
+            "name": account.name,
+            "issuer": account.issuer,
+            "code": account.get_otp(),
+            "remaining": account.get_remaining_seconds(),
+        }
+        for account in accounts
+        if matches(account.name, account.issuer, keyword)
+    ]
+
+
+def rows_from_agent(keyword="", socket_path=None):
+    """通过一次批量请求从解锁代理获取输出行，代理不可用时返回 None"""
+    from utils.agent import AgentClient
+
+    try:
+        listing, codes = AgentClient(socket_path).request([{"op": "list"}, {"op": "codes"}])
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not (listing.get("ok") and codes.get("ok")):
+        return None
+
+    code_map = codes["result"]["codes"]
+    remaining = codes["result"]["remaining"]
+    return [
+        {
+            "name": entry["name"],
+            "issuer": entry["issuer"],
+            "code": code_map.get(str(entry["id"]), ""),
+            "remaining": remaining,
+        }
+        for entry in listing["result"]
+        if matches(entry["name"], entry["issuer"], keyword)
+    ]
+
+
+def format_rows(rows, as_json=False):
+    """格式化验证码输出"""
+    if as_json:
+        return json.dumps(rows, ensure_ascii=False, indent=2)
+
+    lines = []
+    for row in rows:
+        label = f"{row['issuer']}:{row['name']}" if row["issuer"] else row["name"]
+        lines.append(f"{row['code']}  {row['remaining']:>2}秒  {label}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """命令行入口，返回进程退出码"""
+    args = build_parser().parse_args(argv)
+
+    rows = rows_from_agent(args.filter) if args.agent else None
+    if rows is None:
+        config = load_config()
+        password = read_password(config, from_stdin=args.password_stdin)
+        if password is None:
+            print("密码错误", file=sys.stderr)
+            return 1
+
+        model = OTPModel.from_list(load_accounts(password))
+        rows = rows_from_accounts(model.get_accounts(), args.filter)
+
+    output = format_rows(rows, as_json=args.json)
+    if output:
+        print(output)
+    if not rows:
+        # --json 时标准输出仍为空数组，退出码与文本模式一致
+        print("未找到匹配的账户", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
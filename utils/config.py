@@ -9,8 +9,11 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import hashlib
 
-# 配置文件路径 - 存储在当前目录下
-CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+from utils.metrics import metrics
+from utils.tracing import trace_span
+
+# 配置文件路径 - 存储在当前目录下，可通过 LIGHTAUTH_DATA_DIR 环境变量指定其他目录（基准测试等场景）
+CONFIG_DIR = os.environ.get("LIGHTAUTH_DATA_DIR") or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
 DATA_FILE = os.path.join(CONFIG_DIR, "accounts.dat")
 
@@ -20,7 +23,12 @@ DEFAULT_CONFIG = {
     "auto_copy": False,
     "show_seconds": True,
     "encryption_enabled": False,
-    "encryption_password_hash": ""  # 存储密码的哈希值
+    "encryption_password_hash": "",  # 存储密码的哈希值
+    "stall_detector_enabled": False,  # 记录界面卡顿（诊断用）
+    "stall_threshold_ms": 500,  # 卡顿判定阈值（毫秒）
+    "screen_scan_region": None,  # 上次屏幕扫描选定的区域 [x, y, w, h]（全局逻辑坐标）
+    "camera_modes": {},  # 每个相机的采集模式（相机名称 -> 预设名）
+    "camera_grayscale": True  # 相机扫描只取亮度识别
 }
 
 def init_config():
@@ -52,6 +60,13 @@ def save_config(config):
     with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
         json.dump(config, f, indent=4)
 
+def update_config(values):
+    """只更新指定的配置项（读取-修改-写回），返回更新后的配置"""
+    config = dict(load_config())
+    config.update(values)
+    save_config(config)
+    return config
+
 def hash_password(password):
     """创建密码的安全哈希值
     
@@ -89,14 +104,18 @@ def get_encryption_key(password=""):
         salt=salt,
         iterations=100000,
     )
-    key = base64.urlsafe_b64encode(kdf.derive(b'LightAuth'))
+    with metrics.timed("crypto.kdf_ms"), trace_span("crypto.kdf", "crypto"):
+        key = base64.urlsafe_b64encode(kdf.derive(b'LightAuth'))
     return key
 
 def encrypt_data(data, password=""):
     """加密数据"""
     key = get_encryption_key(password)
     fernet = Fernet(key)
-    return fernet.encrypt(json.dumps(data).encode())
+    with trace_span("json.serialize", "vault"):
+        payload = json.dumps(data).encode()
+    with trace_span("crypto.encrypt", "crypto"):
+        return fernet.encrypt(payload)
 
 def decrypt_data(encrypted_data, password=""):
     """解密数据"""
@@ -106,22 +125,33 @@ def decrypt_data(encrypted_data, password=""):
     key = get_encryption_key(password)
     fernet = Fernet(key)
     try:
-        decrypted_data = fernet.decrypt(encrypted_data)
-        return json.loads(decrypted_data.decode())
+        with trace_span("crypto.decrypt", "crypto"):
+            decrypted_data = fernet.decrypt(encrypted_data)
+        with trace_span("json.parse", "vault"):
+            return json.loads(decrypted_data.decode())
     except Exception:
         return []
 
 def load_accounts(password=""):
     """加载账户数据"""
     try:
-        with open(DATA_FILE, 'rb') as f:
-            encrypted_data = f.read()
-        return decrypt_data(encrypted_data, password)
+        with metrics.timed("vault.load_ms"), trace_span("vault.load", "vault"):
+            with trace_span("vault.read", "io"):
+                with open(DATA_FILE, 'rb') as f:
+                    encrypted_data = f.read()
+            metrics.observe("vault.load_bytes", len(encrypted_data), unit="bytes")
+            return decrypt_data(encrypted_data, password)
     except Exception:
         return []
 
 def save_accounts(accounts, password=""):
     """保存账户数据"""
-    encrypted_data = encrypt_data(accounts, password)
-    with open(DATA_FILE, 'wb') as f:
-        f.write(encrypted_data) 
\ No newline at end of file
+    with metrics.timed("vault.save_ms"), trace_span("vault.save", "vault"):
+        encrypted_data = encrypt_data(accounts, password)
+        with trace_span("vault.write", "io"):
+            # 先写临时文件再替换，写入失败时原账户库保持完整
+            tmp_file = DATA_FILE + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(encrypted_data)
+            os.replace(tmp_file, DATA_FILE)
+    metrics.observe("vault.save_bytes", len(encrypted_data), unit="bytes") 
\ No newline at end of file
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+进程内指标注册表：计数器、数值与延迟直方图
+
+热路径只做属性自增与列表下标自增，不加锁（依赖 GIL，极端并发下可能丢失个别计数，
+对诊断用途可以接受）。未启用时 timed() 返回共享的空上下文，开销仅为一次布尔判断。
+"""
+
+import json
+import time
+import bisect
+import platform
+from contextlib import contextmanager, nullcontext
+
+# 直方图桶上界（毫秒或字节等任意单位，按数量级划分）
+DEFAULT_BUCKETS = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 100000, 1000000, 10000000,
+)
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Counter:
+    """单调递增计数器"""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def snapshot(self):
+        return {"type": "counter", "value": self.value}
+
+
+class Gauge:
+    """可任意设置的数值"""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return {"type": "gauge", "value": self.value}
+
+
+class Histogram:
+    """固定分桶直方图，记录次数、总和、极值与近似分位数"""
+
+    def __init__(self, name, unit="ms", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.unit = unit
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """按分桶估算分位数（返回所在桶的上界，最后一个桶返回最大值）"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                bound = self.buckets[idx] if idx < len(self.buckets) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "type": "histogram",
+            "unit": self.unit,
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+def environment_info():
+    """运行环境信息，便于跨机器/版本比较"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._metrics = {}
+
+    def _get(self, name, factory):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics.setdefault(name, factory())
+        return metric
+
+    def counter(self, name):
+        return self._get(name, lambda: Counter(name))
+
+    def gauge(self, name):
+        return self._get(name, lambda: Gauge(name))
+
+    def histogram(self, name, unit="ms"):
+        return self._get(name, lambda: Histogram(name, unit))
+
+    def count(self, name, amount=1):
+        """计数器自增（未启用时忽略）"""
+        if self.enabled:
+            self.counter(name).inc(amount)
+
+    def set_gauge(self, name, value):
+        """设置数值（未启用时忽略）"""
+        if self.enabled:
+            self.gauge(name).set(value)
+
+    def observe(self, name, value, unit="ms"):
+        """记录一次直方图观测值（未启用时忽略）"""
+        if self.enabled:
+            self.histogram(name, unit).observe(value)
+
+    def timed(self, name):
+        """计时上下文，以毫秒记录到直方图；未启用时返回空上下文"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).observe((time.perf_counter() - start) * 1000)
+
+    def reset(self):
+        """清空所有指标"""
+        self._metrics.clear()
+
+    def snapshot(self):
+        """获取所有指标的当前值"""
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+    def to_json(self, extra=None):
+        """导出为 JSON，附带运行环境信息，便于跨机器/版本比较"""
+        payload = {
+            "timestamp": time.time(),
+            "environment": environment_info(),
+            "metrics": self.snapshot(),
+        }
+        if extra:
+            payload["environment"].update(extra)
+        return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+# 全局指标注册表，默认关闭
+metrics = MetricsRegistry()
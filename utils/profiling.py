@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+启动阶段计时工具，用于 --profile-startup 诊断启动耗时
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """轻量级阶段计时器
+
+    未启用时 phase() 只做一次布尔判断，可以常驻在启动路径中。
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.phases = []  # (名称, 开始偏移秒, 耗时秒, 嵌套深度)
+        self._depth = 0
+        self._finished = False
+        self._finish_callback = None
+
+    def enable(self, origin=None):
+        """启用计时，origin 为计时零点（默认当前时刻）"""
+        self.enabled = True
+        self.origin = origin if origin is not None else time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """记录一个阶段的耗时，可嵌套"""
+        if not self.enabled or self._finished:
+            yield
+            return
+        start = time.perf_counter()
+        depth = self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.record(name, start, depth=depth)
+
+    def record(self, name, start, end=None, depth=None):
+        """记录从 start 到 end（默认当前时刻）的阶段，启动完成后不再记录"""
+        if not self.enabled or self._finished:
+            return
+        end = time.perf_counter() if end is None else end
+        self.phases.append((name, start - self.origin, end - start, self._depth if depth is None else depth))
+
+    def set_finish_callback(self, callback):
+        """设置启动完成（首次绘制）后的回调"""
+        self._finish_callback = callback
+
+    def finish(self):
+        """标记启动完成，仅第一次调用生效"""
+        if not self.enabled or self._finished:
+            return
+        self._finished = True
+        if self._finish_callback:
+            self._finish_callback()
+
+    def total(self):
+        """从零点到最后一个阶段结束的总耗时（秒）"""
+        if not self.phases:
+            return 0.0
+        return max(offset + duration for _, offset, duration, _ in self.phases)
+
+    def report(self):
+        """生成按开始时间排序的阶段耗时报告"""
+        lines = ["启动阶段耗时:"]
+        for name, offset, duration, depth in sorted(self.phases, key=lambda p: (p[1], p[3])):
+            label = "  " * depth + name
+            lines.append(f"  {label:<32} {duration * 1000:9.1f} ms  (@{offset * 1000:8.1f} ms)")
+        lines.append(f"  {'合计':<32} {self.total() * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+# 全局启动计时器，由 LightAuth.py 根据命令行参数启用
+startup_timer = PhaseTimer()
@@ -1,34 +1,451 @@
+import time
+import threading
+from abc import ABC, abstractmethod
 from PIL import Image
 from urllib.parse import urlparse, parse_qs, unquote
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, NamedTuple, Union
 
-# 直接使用 pyzbar 作为唯一二维码解析库
-from pyzbar.pyzbar import decode as _zbar_decode  # type: ignore
+import numpy as np
 
-def decode_qr_from_image(image: Image.Image) -> List[Tuple[str, Tuple[int, int, int, int]]]:
-    """从PIL图像中解码所有二维码。
+from utils.metrics import metrics
+from utils.tracing import trace_span
+
+# 每像素字节数与通道顺序；cv2 帧为 BGR，Qt 的 Format_RGB32/ARGB32 在小端机器上内存布局为 BGRA
+PIXEL_FORMATS = {
+    "gray": 1,
+    "rgb": 3,
+    "bgr": 3,
+    "rgba": 4,
+    "bgra": 4,
+}
+
+
+class RawImage(NamedTuple):
+    """原始像素缓冲区（如 QImage.bits()、cv2 Mat 的内存），按行存储，stride 为每行字节数"""
+
+    data: object
+    width: int
+    height: int
+    stride: int
+    pixel_format: str = "gray"
+
+
+ImageInput = Union[Image.Image, np.ndarray, RawImage]
+
+
+def _raw_to_array(raw: RawImage) -> np.ndarray:
+    """将原始缓冲区包装为 ndarray 视图（不复制），去掉每行末尾的填充字节"""
+    channels = PIXEL_FORMATS[raw.pixel_format]
+    buffer = np.frombuffer(raw.data, dtype=np.uint8, count=raw.stride * raw.height)
+    rows = buffer.reshape(raw.height, raw.stride)[:, :raw.width * channels]
+    return rows if channels == 1 else rows.reshape(raw.height, raw.width, channels)
+
+
+_cv2 = None
+
+
+def _get_cv2():
+    """延迟导入 cv2，不可用时返回 None（只尝试一次）"""
+    global _cv2
+    if _cv2 is None:
+        try:
+            import cv2
+            _cv2 = cv2
+        except ImportError:
+            _cv2 = False
+    return _cv2 or None
+
+
+def _color_to_gray(array: np.ndarray, pixel_format: str) -> np.ndarray:
+    """彩色数组转为 8 位亮度，优先使用 cv2，不可用时用整数加权近似（BT.601）"""
+    cv2 = _get_cv2()
+    if cv2 is not None:
+        codes = {
+            "rgb": cv2.COLOR_RGB2GRAY,
+            "bgr": cv2.COLOR_BGR2GRAY,
+            "rgba": cv2.COLOR_RGBA2GRAY,
+            "bgra": cv2.COLOR_BGRA2GRAY,
+        }
+        return cv2.cvtColor(array, codes[pixel_format])
+    r_idx, b_idx = (0, 2) if pixel_format.startswith("rgb") else (2, 0)
+    gray = array[:, :, r_idx].astype(np.uint16) * 77
+    gray += array[:, :, 1].astype(np.uint16) * 150
+    gray += array[:, :, b_idx].astype(np.uint16) * 29
+    gray >>= 8
+    return gray.astype(np.uint8)
+
+
+def to_luminance(image: ImageInput, pixel_format: Optional[str] = None) -> np.ndarray:
+    """将输入统一转换为二维 8 位亮度数组，只转换一次，不创建中间 PIL 图像
 
     Args:
-        image: PIL图像对象。
+        image: PIL 图像、ndarray（二维灰度或三维彩色）或 RawImage。
+        pixel_format: ndarray 的通道顺序；未指定时三通道按 cv2 约定视为 "bgr"，四通道视为 "bgra"。
     Returns:
-        包含元组(data, rect) 的列表，其中 data 为二维码中的原始字符串，rect 为 (x, y, w, h)。
+        形状为 (height, width) 的 uint8 数组；已是灰度时直接返回视图。
     """
-    results = _zbar_decode(image)
-    if not results:
-        # 若未识别到二维码，尝试反色后再次识别（将黑底白码转换为白底黑码）
-        from PIL import ImageOps
-        inverted = ImageOps.invert(image.convert("RGB"))
-        results = _zbar_decode(inverted)
-
-    decoded: List[Tuple[str, Tuple[int, int, int, int]]] = []
-    for r in results:
-        data = r.data.decode("utf-8", errors="ignore")  # type: ignore[attr-defined]
-        rect_obj = r.rect  # type: ignore[attr-defined]
-        rect = (rect_obj.left, rect_obj.top, rect_obj.width, rect_obj.height)
-        decoded.append((data, rect))
+    if isinstance(image, RawImage):
+        pixel_format = image.pixel_format
+        image = _raw_to_array(image)
+    elif isinstance(image, Image.Image):
+        if image.mode != "L":
+            image = image.convert("L")
+        return np.asarray(image)
+
+    if image.ndim == 2:
+        return image if image.dtype == np.uint8 else image.astype(np.uint8)
+    if pixel_format is None:
+        pixel_format = "bgr" if image.shape[2] == 3 else "bgra"
+    return _color_to_gray(image, pixel_format)
+
+
+# ----------------------- 识别后端 -----------------------
+# 后端接收二维 uint8 灰度数组，返回 (data, rect) 列表。自动选择时在本机上对各可用后端做一次小基准，
+# 最快且能正确识别的排在前面，其余作为未命中时的后备。
+
+class QRBackend(ABC):
+    """二维码识别后端接口，子类必须实现全部抽象方法才能实例化"""
+
+    name = ""
+
+    @abstractmethod
+    def available(self) -> bool:
+        """依赖是否可用"""
+
+    @abstractmethod
+    def decode(self, gray: np.ndarray) -> List[Tuple[str, Tuple[int, int, int, int]]]:
+        """识别灰度图中的二维码，返回 (data, (x, y, w, h)) 列表"""
+
+
+class ZbarBackend(QRBackend):
+    """pyzbar（zbar）后端"""
+
+    name = "pyzbar"
+
+    def __init__(self):
+        self._decode = None
+
+    def available(self):
+        if self._decode is None:
+            try:
+                from pyzbar.pyzbar import decode  # type: ignore
+                self._decode = decode
+            except ImportError:
+                # pyzbar 未安装或找不到 zbar 动态库
+                self._decode = False
+        return bool(self._decode)
+
+    def decode(self, gray):
+        if not self.available():
+            return []
+        # pyzbar 接受 (像素字节, 宽, 高)，需要连续的 8 位数据
+        height, width = gray.shape
+        decoded = []
+        for r in self._decode((np.ascontiguousarray(gray).tobytes(), width, height)):
+            data = r.data.decode("utf-8", errors="ignore")
+            decoded.append((data, (r.rect.left, r.rect.top, r.rect.width, r.rect.height)))
+        return decoded
+
+
+class OpenCVBackend(QRBackend):
+    """cv2.QRCodeDetector 后端，支持一次识别多个二维码"""
+
+    name = "opencv"
+
+    def __init__(self):
+        # QRCodeDetector 不是线程安全的，每个线程各用一个
+        self._local = threading.local()
+
+    def available(self):
+        cv2 = _get_cv2()
+        return cv2 is not None and hasattr(cv2, "QRCodeDetector") and hasattr(cv2.QRCodeDetector, "detectAndDecodeMulti")
+
+    def _detector(self):
+        detector = getattr(self._local, "detector", None)
+        if detector is None:
+            detector = self._local.detector = _get_cv2().QRCodeDetector()
+        return detector
+
+    def decode(self, gray):
+        if not self.available():
+            return []
+        try:
+            ok, texts, points, _ = self._detector().detectAndDecodeMulti(gray)
+        except Exception:
+            # 个别 OpenCV 版本在特殊输入上会抛出 cv2.error
+            return []
+        if not ok or points is None:
+            return []
+        decoded = []
+        for text, quad in zip(texts, points):
+            if not text:
+                continue
+            xs, ys = quad[:, 0], quad[:, 1]
+            x, y = int(xs.min()), int(ys.min())
+            decoded.append((text, (x, y, int(xs.max()) - x, int(ys.max()) - y)))
+        return decoded
+
+
+BACKENDS: Dict[str, QRBackend] = {backend.name: backend for backend in (ZbarBackend(), OpenCVBackend())}
+DEFAULT_BACKEND_ORDER = ("pyzbar", "opencv")
+
+_backend_order: Optional[Tuple[str, ...]] = None
+_backend_lock = threading.Lock()
+
+
+def _benchmark_image():
+    """生成一幅包含已知内容二维码的灰度图，用于后端基准"""
+    import qrcode
+
+    data = "otpauth://totp/LightAuth:benchmark?secret=JBSWY3DPEHPK3PXP&issuer=LightAuth"
+    qr = qrcode.QRCode(border=4, box_size=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    code = np.asarray(qr.make_image().get_image().convert("L"))
+    # 放在较大的背景中，接近实际截图/相机画面
+    canvas = np.full((720, 1280), 255, dtype=np.uint8)
+    canvas[100:100 + code.shape[0], 200:200 + code.shape[1]] = code
+    return canvas, data
+
+
+def benchmark_backends(repeat=3) -> Dict[str, Optional[float]]:
+    """在本机上测量各后端识别一幅测试图的耗时（毫秒）；不可用或识别错误的后端为 None"""
+    try:
+        image, expected = _benchmark_image()
+    except ImportError:
+        return {name: None for name in BACKENDS}
+    timings: Dict[str, Optional[float]] = {}
+    for name, backend in BACKENDS.items():
+        if not backend.available():
+            timings[name] = None
+            continue
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = backend.decode(image)
+            elapsed = (time.perf_counter() - start) * 1000
+            if [data for data, _rect in result] != [expected]:
+                best = None
+                break
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    return timings
+
+
+def _select_backend_locked(preferred, timings):
+    """select_backend 的实现，调用方需持有 _backend_lock"""
+    global _backend_order
+    if preferred in BACKENDS:
+        order = [preferred] + [name for name in DEFAULT_BACKEND_ORDER if name != preferred]
+    else:
+        if timings is None:
+            timings = benchmark_backends()
+        working = sorted((t, name) for name, t in timings.items() if t is not None)
+        order = [name for _t, name in working]
+        # 基准中未能正确识别的后端仍作为最后的后备
+        order += [name for name in DEFAULT_BACKEND_ORDER if name not in order]
+    _backend_order = tuple(name for name in order if BACKENDS[name].available())
+    return _backend_order
+
+
+def select_backend(preferred: Optional[str] = None,
+                   timings: Optional[Dict[str, Optional[float]]] = None) -> Tuple[str, ...]:
+    """确定后端顺序：指定 preferred 时优先使用它，否则按基准结果从快到慢排列；返回新的顺序
+
+    timings 为 benchmark_backends() 的结果，未提供时重新测量。
+    """
+    with _backend_lock:
+        return _select_backend_locked(preferred, timings)
+
+
+def set_backend_order(order) -> None:
+    """直接指定后端顺序（如工作进程沿用主进程的选择结果），忽略不可用的后端"""
+    global _backend_order
+    with _backend_lock:
+        _backend_order = tuple(name for name in order if name in BACKENDS and BACKENDS[name].available())
+
+
+def backend_order() -> Tuple[str, ...]:
+    """当前后端顺序，首次调用时自动选择（多个线程同时首次调用时只测量一次）"""
+    order = _backend_order
+    if order is None:
+        with _backend_lock:
+            order = _backend_order
+            if order is None:
+                order = _select_backend_locked(None, None)
+    return order
+
+
+def _decode_candidate(gray: np.ndarray) -> List[Tuple[str, Tuple[int, int, int, int]]]:
+    """按后端顺序识别一幅灰度图，首选后端未命中时依次尝试其他后端"""
+    for name in backend_order():
+        decoded = BACKENDS[name].decode(gray)
+        if decoded:
+            return decoded
+    return []
+
+
+# ----------------------- 预处理策略 -----------------------
+# 每个策略根据灰度图生成若干候选图像 (图像, 缩放比例)，缩放比例用于把识别到的矩形换算回原图坐标。
+# 策略按从便宜到昂贵排列，第一个识别成功的策略即返回。
+
+# 下采样金字塔最短边不小于该值，二维码过小时 zbar 无法识别
+MIN_PYRAMID_SIDE = 320
+# 单次识别的默认时间预算（毫秒），超出后不再尝试后续策略
+DEFAULT_BUDGET_MS = 200
+
+
+def _stage_gray(gray):
+    yield gray, 1.0
+
+
+def _stage_downscale(gray):
+    """下采样金字塔：大截图中的二维码往往在缩小后更容易识别，且识别更快"""
+    cv2 = _get_cv2()
+    scale = 1.0
+    current = gray
+    while min(current.shape) // 2 >= MIN_PYRAMID_SIDE:
+        if cv2 is not None:
+            current = cv2.resize(current, (current.shape[1] // 2, current.shape[0] // 2), interpolation=cv2.INTER_AREA)
+        else:
+            current = current[::2, ::2]
+        scale /= 2
+        yield current, scale
+
+
+def _stage_invert(gray):
+    """反色：黑底白码"""
+    yield np.invert(gray), 1.0
+
+
+def _stage_threshold(gray):
+    """自适应阈值：低对比度、光照不均"""
+    cv2 = _get_cv2()
+    if cv2 is not None:
+        yield cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 5), 1.0
+
+
+def _stage_sharpen(gray):
+    """反锐化掩模：轻微模糊"""
+    cv2 = _get_cv2()
+    if cv2 is not None:
+        blurred = cv2.GaussianBlur(gray, (0, 0), 3)
+        yield cv2.addWeighted(gray, 1.5, blurred, -0.5, 0), 1.0
+
+
+DECODE_STAGES = {
+    "gray": _stage_gray,
+    "downscale": _stage_downscale,
+    "invert": _stage_invert,
+    "threshold": _stage_threshold,
+    "sharpen": _stage_sharpen,
+}
+DEFAULT_STAGE_ORDER = ("gray", "downscale", "invert", "threshold", "sharpen")
+
+
+class DecodeStats:
+    """各策略的尝试次数、命中次数与耗时，用于调整默认策略顺序
+
+    计数不加锁（依赖 GIL），与指标注册表一致，偶尔丢失一次计数不影响排序。
+    """
+
+    # 调用次数达到该值后才按统计重新排序
+    MIN_CALLS = 20
+
+    def __init__(self):
+        self.calls = 0
+        self.attempts = dict.fromkeys(DECODE_STAGES, 0)
+        self.hits = dict.fromkeys(DECODE_STAGES, 0)
+        self.seconds = dict.fromkeys(DECODE_STAGES, 0.0)
+
+    def record(self, stage, seconds, hit):
+        self.attempts[stage] += 1
+        self.seconds[stage] += seconds
+        if hit:
+            self.hits[stage] += 1
+            metrics.count(f"qr.stage.{stage}.hits")
+
+    def order(self):
+        """按“每毫秒命中数”从高到低排序；统计不足时使用默认顺序，未命中过的策略保持默认相对顺序"""
+        if self.calls < self.MIN_CALLS:
+            return DEFAULT_STAGE_ORDER
+
+        def efficiency(stage):
+            if not self.hits[stage]:
+                return 0.0
+            return self.hits[stage] / max(self.seconds[stage] * 1000, 1e-3)
+
+        return tuple(sorted(DEFAULT_STAGE_ORDER, key=lambda stage: -efficiency(stage)))
+
+    def snapshot(self):
+        return {
+            stage: {
+                "attempts": self.attempts[stage],
+                "hits": self.hits[stage],
+                "mean_ms": self.seconds[stage] * 1000 / self.attempts[stage] if self.attempts[stage] else None,
+            }
+            for stage in DEFAULT_STAGE_ORDER
+        }
+
+    def reset(self):
+        self.__init__()
+
+
+# 全局策略统计
+decode_stats = DecodeStats()
+
+
+def decode_qr_from_image(
+    image: ImageInput,
+    pixel_format: Optional[str] = None,
+    budget_ms: Optional[float] = DEFAULT_BUDGET_MS,
+    stages: Optional[Tuple[str, ...]] = None,
+) -> List[Tuple[str, Tuple[int, int, int, int]]]:
+    """从图像中解码所有二维码。
+
+    依次尝试预处理策略（默认顺序由 decode_stats 根据历史命中情况决定），第一个识别成功的策略即返回；
+    超出时间预算后不再尝试后续策略（第一个策略总会执行）。
+
+    Args:
+        image: PIL 图像、灰度/彩色 ndarray（如 cv2 帧）或 RawImage（如 QImage 像素缓冲区）。
+        pixel_format: ndarray 的通道顺序，见 to_luminance。
+        budget_ms: 时间预算（毫秒），None 表示不限制。
+        stages: 要尝试的策略名称及顺序，默认使用 decode_stats.order()。
+    Returns:
+        包含元组(data, rect) 的列表，其中 data 为二维码中的原始字符串，rect 为原图坐标 (x, y, w, h)。
+    """
+    with metrics.timed("qr.decode_ms"), trace_span("qr.decode", "qr"):
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000 if budget_ms is not None else None
+        gray = to_luminance(image, pixel_format)
+        decode_stats.calls += 1
+
+        decoded: List[Tuple[str, Tuple[int, int, int, int]]] = []
+        scale = 1.0
+        for index, stage in enumerate(stages or decode_stats.order()):
+            if index and deadline is not None and time.perf_counter() >= deadline:
+                metrics.count("qr.budget_exhausted")
+                break
+            stage_start = time.perf_counter()
+            with trace_span(f"qr.stage.{stage}", "qr"):
+                for candidate, scale in DECODE_STAGES[stage](gray):
+                    decoded = _decode_candidate(candidate)
+                    if decoded or (deadline is not None and time.perf_counter() >= deadline):
+                        break
+            decode_stats.record(stage, time.perf_counter() - stage_start, bool(decoded))
+            if decoded:
+                break
+    metrics.count("qr.decode_hits" if decoded else "qr.decode_misses")
+
+    if scale != 1.0:
+        decoded = [
+            (data, tuple(int(round(v / scale)) for v in rect))
+            for data, rect in decoded
+        ]
     return decoded
 
 
+@trace_span("qr.parse_uri", "qr")
 def parse_otp_uri(uri: str) -> Optional[Dict[str, str]]:
     """解析 otpauth URI，提取名称、发行方和密钥等信息。
 
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+读写锁：允许多个读者并发，写者互斥且优先
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """写者优先的读写锁
+
+    - 多个线程可同时持有读锁；
+    - 写锁互斥，且同一线程可重入；持有写锁的线程也可以再获取读锁；
+    - 已持有读锁的线程可重入读锁，但不支持读锁升级为写锁。
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # 持有写锁的线程标识
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def is_write_owner(self):
+        """当前线程是否持有写锁"""
+        return self._writer == threading.get_ident()
+
+    def _read_depth(self):
+        return getattr(self._local, "depth", 0)
+
+    def acquire_read(self):
+        """获取读锁"""
+        me = threading.get_ident()
+        depth = self._read_depth()
+        with self._cond:
+            # 写者自身或已持有读锁的线程直接重入，避免与等待中的写者互相死锁
+            if self._writer != me and depth == 0:
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+            self._readers += 1
+        self._local.depth = depth + 1
+
+    def release_read(self):
+        """释放读锁"""
+        self._local.depth = self._read_depth() - 1
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        """获取写锁"""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if self._read_depth():
+                raise RuntimeError("不支持将读锁升级为写锁")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        """释放写锁"""
+        with self._cond:
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """读锁上下文"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """写锁上下文"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
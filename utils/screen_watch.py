@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+屏幕监视的变化检测
+
+把每次截图的灰度图缩成缩略图并按网格分块计算哈希，与上一次截图比较，
+只返回发生变化的区域（向外扩展一定边距），未变化的截图不再解码。
+缩略图会量化亮度，忽略抗锯齿、视频压缩等带来的细微抖动。
+"""
+
+import zlib
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils.qr_utils import _get_cv2
+
+Rect = Tuple[int, int, int, int]
+
+# 网格列数/行数与每格缩略图边长
+GRID_SIZE = (16, 16)
+CELL_THUMB = 4
+# 变化区域向外扩展的边距（像素），应不小于二维码边长，避免只解码到二维码后加载的一部分
+CHANGE_MARGIN = 320
+# 亮度量化位数，低位的变化视为噪声
+QUANT_SHIFT = 4
+
+
+def thumbnail(gray, grid=GRID_SIZE, cell=CELL_THUMB):
+    """将灰度图缩小为 (rows * cell, cols * cell) 的量化缩略图"""
+    cols, rows = grid
+    size = (cols * cell, rows * cell)
+    # 先按步长抽样再平滑缩小，4K 截图上比直接缩小快数倍，对检测整块内容的出现/消失已经足够
+    step = max(min(gray.shape[0] // size[1], gray.shape[1] // size[0]) // 4, 1)
+    gray = gray[::step, ::step]
+    cv2 = _get_cv2()
+    if cv2 is not None:
+        small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    else:
+        ys = np.linspace(0, gray.shape[0] - 1, size[1]).astype(np.intp)
+        xs = np.linspace(0, gray.shape[1] - 1, size[0]).astype(np.intp)
+        small = gray[ys][:, xs]
+    return small >> QUANT_SHIFT
+
+
+class ChangeDetector:
+    """比较同一屏幕的连续截图，返回需要重新解码的区域"""
+
+    def __init__(self, grid=GRID_SIZE, margin=CHANGE_MARGIN):
+        self.grid = grid
+        self.margin = margin
+        self._shape = None
+        self._hashes = None
+
+    def reset(self):
+        self._shape = None
+        self._hashes = None
+
+    def _cell_hashes(self, gray):
+        cols, rows = self.grid
+        thumb = thumbnail(gray, self.grid)
+        return [
+            zlib.crc32(np.ascontiguousarray(thumb[r * CELL_THUMB:(r + 1) * CELL_THUMB, c * CELL_THUMB:(c + 1) * CELL_THUMB]))
+            for r in range(rows)
+            for c in range(cols)
+        ]
+
+    def update(self, gray) -> Optional[Rect]:
+        """记录新截图，返回变化区域 (x, y, w, h)；首次或尺寸变化时返回整幅图，未变化时返回 None"""
+        height, width = gray.shape
+        hashes = self._cell_hashes(gray)
+        previous, self._hashes = self._hashes, hashes
+        if previous is None or self._shape != gray.shape:
+            self._shape = gray.shape
+            return 0, 0, width, height
+
+        cols, rows = self.grid
+        changed = [idx for idx, (old, new) in enumerate(zip(previous, hashes)) if old != new]
+        if not changed:
+            return None
+
+        cell_w, cell_h = width / cols, height / rows
+        left = min(idx % cols for idx in changed) * cell_w - self.margin
+        right = (max(idx % cols for idx in changed) + 1) * cell_w + self.margin
+        top = min(idx // cols for idx in changed) * cell_h - self.margin
+        bottom = (max(idx // cols for idx in changed) + 1) * cell_h + self.margin
+        x, y = max(int(left), 0), max(int(top), 0)
+        return x, y, min(int(right), width) - x, min(int(bottom), height) - y
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分块多进程二维码扫描
+
+把多张大截图（如所有屏幕）切成相互重叠的图块，放入共享内存后交给进程池并行识别，
+再把各图块的结果换算为屏幕坐标并合并去重。重叠宽度应大于可能出现的最大二维码边长，
+保证每个二维码至少完整地落在一个图块中。
+单个屏幕、选定区域等较小的截图用 decode_captures 在当前进程内完整识别，
+不值得承担共享内存与进程间调度的开销。
+
+本模块不依赖 Qt，工作进程只导入 utils.qr_utils。
+"""
+
+import os
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils import qr_utils
+from utils.tracing import trace_span
+
+TILE_SIZE = 1024
+TILE_OVERLAP = 320
+# 图块只尝试便宜的策略；超过重叠宽度的大二维码由整图下采样的概览任务负责
+TILE_STAGES = ("gray", "invert")
+OVERVIEW_STAGES = ("downscale",)
+TILE_BUDGET_MS = 100
+
+Rect = Tuple[int, int, int, int]
+
+
+class Capture(NamedTuple):
+    """一张截图：灰度像素、屏幕左上角的逻辑坐标与设备像素比"""
+
+    gray: np.ndarray
+    origin: Tuple[int, int] = (0, 0)
+    device_pixel_ratio: float = 1.0
+
+
+def needs_tiling(captures, tile=TILE_SIZE):
+    """截图数量多于一张且其中有超过一个图块大小的截图时，才值得交给进程池"""
+    return len(captures) > 1 and any(
+        c.gray.shape[0] > tile or c.gray.shape[1] > tile for c in captures
+    )
+
+
+def to_screen_rect(capture, rect) -> Rect:
+    """把截图像素坐标换算为屏幕逻辑坐标（按设备像素比缩放并加上屏幕原点）"""
+    x, y, w, h = rect
+    ox, oy = capture.origin
+    ratio = capture.device_pixel_ratio or 1.0
+    return (
+        ox + int(round(x / ratio)), oy + int(round(y / ratio)),
+        int(round(w / ratio)), int(round(h / ratio)),
+    )
+
+
+def make_tiles(width, height, tile=TILE_SIZE, overlap=TILE_OVERLAP) -> List[Rect]:
+    """将 width x height 的区域切分为相互重叠的图块 (x, y, w, h)"""
+    def starts(length):
+        if length <= tile:
+            return [0]
+        step = tile - overlap
+        positions = list(range(0, length - tile, step))
+        positions.append(length - tile)
+        return positions
+
+    return [
+        (x, y, min(tile, width - x), min(tile, height - y))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+
+def _attach(name):
+    """在工作进程中打开共享内存（不参与资源跟踪，由主进程负责释放）"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.13 之前没有 track 参数；spawn 方式下资源跟踪进程与主进程共享，不会被提前释放
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(backend_order):
+    """工作进程初始化：沿用主进程已选定的识别后端，避免每个进程重复测量"""
+    qr_utils.set_backend_order(backend_order)
+
+
+def _decode_tile(shm_name, shape, tile, stages, budget_ms=TILE_BUDGET_MS):
+    """工作进程：识别共享内存中一幅截图的一个区域，返回换算为整图坐标的 (data, rect) 列表"""
+    shm = _attach(shm_name)
+    try:
+        image = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        x, y, w, h = tile
+        region = np.ascontiguousarray(image[y:y + h, x:x + w])
+        del image  # 关闭共享内存前必须释放所有引用其缓冲区的数组
+        decoded = qr_utils.decode_qr_from_image(region, budget_ms=budget_ms, stages=stages)
+    finally:
+        shm.close()
+    return [(data, (rx + x, ry + y, rw, rh)) for data, (rx, ry, rw, rh) in decoded]
+
+
+def _overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def merge_results(results):
+    """合并去重：内容相同且区域重叠的结果（来自相邻图块）只保留一个，取外接矩形"""
+    merged: List[Tuple[str, Rect]] = []
+    for data, rect in results:
+        for idx, (other_data, other_rect) in enumerate(merged):
+            if data == other_data and _overlaps(rect, other_rect):
+                x = min(rect[0], other_rect[0])
+                y = min(rect[1], other_rect[1])
+                right = max(rect[0] + rect[2], other_rect[0] + other_rect[2])
+                bottom = max(rect[1] + rect[3], other_rect[1] + other_rect[3])
+                merged[idx] = (data, (x, y, right - x, bottom - y))
+                break
+        else:
+            merged.append((data, rect))
+    return merged
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def executor() -> ProcessPoolExecutor:
+    """进程池（首次使用时创建，每个 CPU 核心一个进程，程序退出时关闭）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # 使用 spawn，避免在带有 Qt 线程的进程中 fork
+            _executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(qr_utils.backend_order(),),
+            )
+            atexit.register(shutdown)
+        return _executor
+
+
+def shutdown():
+    """关闭进程池"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def scan_captures(captures, tile=TILE_SIZE, overlap=TILE_OVERLAP, pool=None):
+    """并行识别多张截图
+
+    Args:
+        captures: Capture 列表。
+        pool: 进程池，默认使用共享进程池。
+    Returns:
+        (data, rect) 列表，rect 为屏幕逻辑坐标（已按设备像素比换算并加上屏幕原点）。
+    """
+    pool = pool or executor()
+    blocks = []
+    try:
+        futures = []
+        with trace_span("scan.share", "qr"):
+            for capture in captures:
+                gray = capture.gray
+                shm = shared_memory.SharedMemory(create=True, size=max(gray.nbytes, 1))
+                blocks.append(shm)
+                np.ndarray(gray.shape, dtype=np.uint8, buffer=shm.buf)[:] = gray
+                height, width = gray.shape
+                tiles = make_tiles(width, height, tile, overlap)
+                for tile_rect in tiles:
+                    futures.append((capture, pool.submit(_decode_tile, shm.name, gray.shape, tile_rect, TILE_STAGES)))
+                if len(tiles) > 1:
+                    # 整图下采样概览，识别跨越多个图块的大二维码
+                    futures.append((capture, pool.submit(
+                        _decode_tile, shm.name, gray.shape, (0, 0, width, height), OVERVIEW_STAGES, None
+                    )))
+
+        results = []
+        with trace_span("scan.tiles", "qr", tiles=len(futures)):
+            for capture, future in futures:
+                for data, rect in future.result():
+                    results.append((data, to_screen_rect(capture, rect)))
+        return merge_results(results)
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+
+def decode_captures(captures):
+    """在当前进程中逐张完整识别截图（所有预处理策略，按 decode_stats 排序），返回值同 scan_captures"""
+    results = []
+    for capture in captures:
+        for data, rect in qr_utils.decode_qr_from_image(capture.gray):
+            results.append((data, to_screen_rect(capture, rect)))
+    return results
+
+
+def scan(captures):
+    """大截图较多时分块并行识别，否则在当前进程内识别"""
+    if needs_tiling(captures):
+        return scan_captures(captures)
+    return decode_captures(captures)
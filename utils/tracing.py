@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+区间追踪：记录带线程 ID 的嵌套耗时区间，导出为 Chrome trace 格式
+
+导出的 JSON 可在 chrome://tracing 或 https://ui.perfetto.dev 中查看，
+用于分析一次导入或解锁在密钥派生、解密、解析、模型构建与控件创建之间的耗时分布。
+
+用法:
+    with trace_span("vault.load"):
+        ...
+
+    @trace_span("model.from_list")
+    def from_list(...):
+        ...
+"""
+
+import os
+import json
+import time
+import functools
+import threading
+from collections import deque
+
+DEFAULT_CAPACITY = 50000
+
+
+class Tracer:
+    """区间记录器，事件保存在定长环形缓冲区中，旧事件自动丢弃"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, enabled=False):
+        self.enabled = enabled
+        self._events = deque(maxlen=capacity)
+        self._thread_names = {}
+        self._pid = os.getpid()
+
+    def record(self, name, start, end, category="app", args=None):
+        """记录一个已完成的区间（时间为 perf_counter 秒）"""
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self._thread_names:
+            self._thread_names[tid] = thread.name
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": self._pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        # deque.append 是原子操作，多线程记录无需加锁
+        self._events.append(event)
+
+    def clear(self):
+        """清空已记录的事件"""
+        self._events.clear()
+
+    def event_count(self):
+        """当前缓冲区中的事件数量"""
+        return len(self._events)
+
+    def to_chrome_trace(self):
+        """生成 Chrome trace 格式的字典"""
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        events.extend(list(self._events))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path):
+        """将缓冲区写入 Chrome trace JSON 文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+
+# 全局追踪器，默认关闭
+tracer = Tracer()
+
+
+class trace_span:
+    """追踪区间，可作为上下文管理器或装饰器使用；追踪关闭时几乎没有开销"""
+
+    __slots__ = ("name", "category", "args", "_start")
+
+    def __init__(self, name, category="app", **args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self._start = None
+
+    def __enter__(self):
+        if tracer.enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start is not None:
+            args = dict(self.args, error=exc_type.__name__) if exc_type else self.args
+            tracer.record(self.name, self._start, time.perf_counter(), self.category, args)
+            self._start = None
+        return False
+
+    def __call__(self, fn):
+        name, category, args = self.name, self.category, self.args
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not tracer.enabled:
+                return fn(*a, **kw)
+            # 每次调用使用独立的区间对象，支持递归与多线程
+            with trace_span(name, category, **args):
+                return fn(*a, **kw)
+        return wrapper